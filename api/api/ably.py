@@ -1,6 +1,30 @@
+import functools
 import os
 
 from ably.sync import AblyRestSync
 
 ABLY_API_KEY = os.getenv("ABLY_API_KEY")
-ably_client = AblyRestSync(key=ABLY_API_KEY)
+# A local stand-in of the REST API can be used instead of Ably, eg. `ABLY_REST_HOST=localhost
+# ABLY_PORT=8080 ABLY_TLS=false`. The client refuses to send its key without TLS, so requests to a
+# stand-in without TLS are not authenticated.
+ABLY_REST_HOST = os.getenv("ABLY_REST_HOST")
+ABLY_PORT = int(os.getenv("ABLY_PORT", 0))
+ABLY_TLS = os.getenv("ABLY_TLS", "true").lower() == "true"
+
+
+@functools.cache
+def get_ably_client():
+    """
+    Build the Ably client on first use, so processes that never publish or issue tokens start without
+    `ABLY_API_KEY`, eg. `manage.py check`.
+
+    Returns:
+        - AblyRestSync: The client shared by the process.
+    """
+    return AblyRestSync(
+        key=ABLY_API_KEY,
+        rest_host=ABLY_REST_HOST,
+        tls=ABLY_TLS,
+        port=ABLY_PORT if not ABLY_TLS else 0,
+        tls_port=ABLY_PORT if ABLY_TLS else 0,
+    )
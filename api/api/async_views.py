@@ -0,0 +1,216 @@
+import functools
+import itertools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse
+from rest_framework.response import Response
+
+from authentication.authentication import aget_cached_credentials
+from organizations.memberships import aget_workspace_ids, get_workspace_ids
+
+from .etags import ConditionalGetMixin
+from .versions import aget_versions
+
+
+class Fallback(Exception):
+    """
+    Raised by async handlers for requests they cannot serve, which are passed to the sync view instead.
+    """
+
+
+def render_response(response):
+    """
+    Render a DRF response into a plain `HttpResponse`. Django renders responses that still have a
+    `render()` method in its sync thread, which would cost async handlers one more hop to it.
+
+    Parameters:
+        - response (Response): The finalized response.
+
+    Returns:
+        - HttpResponse: The rendered response.
+    """
+    response.render()
+    rendered = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        rendered[header] = value
+
+    return rendered
+
+
+def call_sync_view(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    if isinstance(response, Response):
+        return render_response(response)
+
+    return response
+
+
+def stream_content(request, lines, chunk_size=100):
+    """
+    Get the content of a `StreamingHttpResponse` streaming the lines of a sync iterator.
+
+    Under ASGI, Django 5.0 consumes sync iterators with `sync_to_async(list)`, building the whole content
+    before its first byte is sent. ASGI requests get an async iterator instead, pulling `chunk_size`
+    lines at a time through the sync thread, where the iterator keeps its database connection.
+
+    Parameters:
+        - request (HttpRequest): The request streamed to.
+        - lines (Iterable[str]): The lines of the content.
+        - chunk_size (int): The number of lines sent at a time under ASGI.
+
+    Returns:
+        - Iterator[str] | AsyncIterator[str]: The content.
+    """
+    if not isinstance(request, ASGIRequest):
+        return lines
+
+    return _aiter_chunks(iter(lines), chunk_size)
+
+
+async def _aiter_chunks(lines, chunk_size):
+    next_chunk = sync_to_async(lambda: "".join(itertools.islice(lines, chunk_size)))
+    while True:
+        chunk = await next_chunk()
+        if chunk == "":
+            return
+
+        yield chunk
+
+
+class AsyncReadMixin:
+    """
+    Serve the GET actions of a viewset listed in `async_actions` from the `a<action>` handlers of the
+    viewset on the event loop, so a request does not hold the sync thread of the ASGI server while it
+    is authenticated from the token cache, checked against its ETag, serialized and rendered.
+
+    Queries go through Django's async ORM, which in Django 5.0 still runs them one at a time on the
+    thread shared with sync views, so handlers keep their queries few and reuse the querysets of the
+    sync actions. Requests the handlers cannot serve without blocking, eg. tokens that are not cached
+    yet, are passed to the sync view, as are all requests while `ASYNC_READ_VIEWS` is disabled.
+
+    Serializers reading more than the fetched objects, eg. related managers, run in the sync thread
+    unless `async_serialization` is set.
+    """
+
+    async_actions = ["list", "retrieve"]
+    async_serialization = False
+    workspace_ids = None
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        sync_view = super().as_view(actions, **initkwargs)
+        if actions.get("get") not in cls.async_actions:
+            return sync_view
+
+        async def view(request, *args, **kwargs):
+            if settings.ASYNC_READ_VIEWS and request.method in ("GET", "HEAD"):
+                self = cls(**initkwargs)
+                self.action_map = actions
+                self.action = actions["get"]
+                try:
+                    return await self.adispatch(request, *args, **kwargs)
+                except Fallback:
+                    pass
+
+            return await sync_to_async(call_sync_view)(sync_view, request, *args, **kwargs)
+
+        # Keeps the attributes routers and the schema generator read, eg. `cls` and `actions`.
+        functools.update_wrapper(view, sync_view)
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Fallback:
+            raise
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return render_response(self.response)
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Async version of `initial`, authenticating from the token cache only. The shared cache is only
+        read with its async methods, so Redis round trips do not block the event loop.
+        """
+        # Throttles keep their history in the cache with blocking calls.
+        if len(self.get_throttles()) > 0:
+            raise Fallback()
+
+        credentials = await aget_cached_credentials(request)
+        if credentials is None:
+            raise Fallback()
+
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        request.user, request.auth = credentials
+
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+        self.workspace_ids = await aget_workspace_ids(request.user)
+        if isinstance(self, ConditionalGetMixin):
+            versions = await aget_versions(self.get_etag_version_keys(self.workspace_ids))
+            self.etag = self.build_etag(request, self.workspace_ids, versions)
+            self.check_etag(request)
+
+    def get_workspace_ids(self):
+        # Resolved once per request, and ahead of the handler by async requests so building their
+        # querysets does not touch the database.
+        if self.workspace_ids is None:
+            self.workspace_ids = get_workspace_ids(self.request.user)
+
+        return self.workspace_ids
+
+    async def afilter_queryset(self, queryset):
+        # Filter sets validate some parameters against the database, eg. model choices.
+        if len(self.request.query_params) == 0:
+            return self.filter_queryset(queryset)
+
+        return await sync_to_async(self.filter_queryset)(queryset)
+
+    async def aget_object(self):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        except (TypeError, ValueError, ValidationError):
+            raise Http404()
+
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    async def aserialize(self, instance, many=False):
+        serializer = self.get_serializer(instance, many=many)
+        if self.async_serialization:
+            return serializer.data
+
+        return await sync_to_async(lambda: serializer.data)()
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await self.aserialize(instance))
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        if self.paginator is None:
+            return Response(await self.aserialize([instance async for instance in queryset], many=True))
+
+        # The paginator slices and reads the queryset itself, in a single hop to the sync thread.
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        return self.get_paginated_response(await self.aserialize(page, many=True))
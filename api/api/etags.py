@@ -0,0 +1,89 @@
+import hashlib
+
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from organizations.memberships import get_workspace_ids
+
+from .versions import bump_versions, get_versions
+
+
+def get_workspace_version_key(workspace_id):
+    return f"api:workspace_version:{workspace_id}"
+
+
+def bump_workspace_versions(workspace_ids):
+    bump_versions([get_workspace_version_key(workspace_id) for workspace_id in workspace_ids if workspace_id])
+
+
+def strip_weak(etag):
+    return etag.removeprefix("W/")
+
+
+class NotModified(Exception):
+    pass
+
+
+class ConditionalGetMixin:
+    """
+    Answer `GET` requests with a weak ETag, and with `304 Not Modified` before the handler runs when
+    the `If-None-Match` header of the request still matches.
+
+    The ETag covers the requested URL and media type, the user, and the workspaces of the user with
+    their change counters. Every write to a workspace bumps its counter, including writes to related
+    objects and deletions, so checking a request costs a single cache lookup and no query. Endpoints
+    serving objects outside the workspaces of the user add the keys of their counters with
+    `get_etag_version_keys`.
+    """
+
+    etag = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.etag = None
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        self.etag = self.get_etag(request)
+        self.check_etag(request)
+
+    def check_etag(self, request):
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in if_none_match or strip_weak(self.etag) in {strip_weak(etag) for etag in if_none_match}:
+            raise NotModified()
+
+    def get_etag(self, request):
+        workspace_ids = get_workspace_ids(request.user)
+        return self.build_etag(request, workspace_ids, get_versions(self.get_etag_version_keys(workspace_ids)))
+
+    def get_etag_version_keys(self, workspace_ids):
+        """
+        Returns:
+            - list[str]: The keys of the change counters the responses of the endpoint depend on.
+        """
+        return [get_workspace_version_key(workspace_id) for workspace_id in workspace_ids]
+
+    def build_etag(self, request, workspace_ids, versions):
+        parts = [
+            request.get_full_path(),
+            request.accepted_media_type,
+            request.user.pk,
+            *workspace_ids,
+            *versions,
+        ]
+        return f'W/"{hashlib.sha256(repr(parts).encode()).hexdigest()[:32]}"'
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = self.etag
+
+        return response
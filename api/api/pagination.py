@@ -0,0 +1,20 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over `(created_at, id)`, newest first, with opaque cursors.
+
+    Each page is fetched with `WHERE created_at < <cursor position> ORDER BY created_at DESC, id DESC
+    LIMIT <page size>`, served by the `(created_at, id)` index of the model, so deep pages cost the
+    same as the first one and rows inserted while paginating do not shift the following pages.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class DateJoinedCursorPagination(CreatedAtCursorPagination):
+    ordering = ("-date_joined", "-id")
@@ -59,6 +59,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # 3rd party apps
     "oauth2_provider",
     "social_django",
@@ -72,6 +73,7 @@ INSTALLED_APPS = [
     "docs",
     "core",
     "organizations",
+    "jobs",
 ]
 
 
@@ -222,13 +224,19 @@ if DEBUG:
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_RENDERER_CLASSES": DEFAULT_RENDERER_CLASSES,
+    # Cheapest first: cached tokens skip the token tables and the provider, passwords are hashed last.
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "authentication.authentication.CachedOAuth2Authentication",
+        "authentication.authentication.CachedSocialAuthentication",
         "rest_framework.authentication.BasicAuthentication",
-        "oauth2_provider.contrib.rest_framework.OAuth2Authentication",
-        "drf_social_oauth2.authentication.SocialAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", 100)),
 }
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 1000))
+# Serve the read endpoints of viewsets with `AsyncReadMixin` from their async handlers under ASGI.
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS", "true").lower() == "true"
 
 
 # ============================================================================ #
@@ -250,6 +258,54 @@ DATABASES = {
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# ============================================================================ #
+#                                                                              #
+#   CACHE SETTINGS
+#   https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+#                                                                              #
+# ============================================================================ #
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "docbase",
+        },
+        "local": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "local",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "local": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "local",
+        },
+    }
+
+
+# ============================================================================ #
+#                                                                              #
+#   BACKGROUND JOBS
+#
+#                                                                              #
+# ============================================================================ #
+JOB_WORKER_PROCESSES = int(os.environ.get("JOB_WORKER_PROCESSES", 2))
+# Maximum number of jobs of a queue running at once across every worker, queues not listed are only
+# limited by the number of worker processes.
+JOB_QUEUE_CONCURRENCY = {
+    "imports": int(os.environ.get("JOB_IMPORTS_CONCURRENCY", 1)),
+    "indexes": int(os.environ.get("JOB_INDEXES_CONCURRENCY", 1)),
+}
+
+
 # ============================================================================ #
 #                                                                              #
 #   INTERNATIONALIZATION
@@ -301,6 +357,7 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_PATCH": True,
     "COMPONENT_SPLIT_REQUEST": True,
     "COMPONENT_NO_READ_ONLY_REQUIRED": True,
+    "GET_LIB_DOC_EXCLUDES": "docs.hooks.get_lib_doc_excludes",
     "ENUM_NAME_OVERRIDES": {
         "BooleanFieldConfigDisplayFormatEnum": "core.models.BooleanFieldConfig.DisplayFormat",
         "BooleanFieldConfigDisplayIconEnum": "core.models.BooleanFieldConfig.DisplayIcon",
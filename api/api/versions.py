@@ -0,0 +1,46 @@
+import uuid
+
+from django.core.cache import cache
+
+
+def get_versions(keys):
+    """
+    Get the change counters stored under some keys, starting the missing ones.
+
+    Counters are random tokens rather than numbers, so a counter evicted from the cache starts again
+    from a new value and never repeats a previous one.
+
+    Parameters:
+        - keys (list[str]): The keys of the counters.
+
+    Returns:
+        - list[str]: The version of every key.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(keys):
+    """
+    Async version of `get_versions`.
+    """
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = await cache.aget(key)
+
+    return [versions[key] for key in keys]
+
+
+def get_version(key):
+    return get_versions([key])[0]
+
+
+def bump_versions(keys):
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
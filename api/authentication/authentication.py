@@ -0,0 +1,232 @@
+import datetime
+import hashlib
+import time
+
+from django.core.cache import cache, caches
+from drf_social_oauth2.authentication import SocialAuthentication
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+from oauth2_provider.models import get_access_token_model
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework.authentication import get_authorization_header
+
+# Revoked tokens and updated users are dropped from the shared cache right away, but other processes
+# may keep using their local copy until it expires.
+LOCAL_CACHE_TIMEOUT = 10
+TOKEN_CACHE_TIMEOUT = 60 * 5
+USER_CACHE_TIMEOUT = 60 * 60
+
+
+def get_token_key(token):
+    return f"authentication:token:v2:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def get_user_key(user_id):
+    return f"authentication:user:{user_id}"
+
+
+def _get(key):
+    value = caches["local"].get(key)
+    if value is None:
+        value = cache.get(key)
+        if value is not None:
+            caches["local"].set(key, value, timeout=LOCAL_CACHE_TIMEOUT)
+
+    return value
+
+
+async def _aget(key):
+    # The local cache lives in the process, reading it does not block the event loop.
+    value = caches["local"].get(key)
+    if value is None:
+        value = await cache.aget(key)
+        if value is not None:
+            caches["local"].set(key, value, timeout=LOCAL_CACHE_TIMEOUT)
+
+    return value
+
+
+def _set(key, value, timeout):
+    cache.set(key, value, timeout=timeout)
+    caches["local"].set(key, value, timeout=min(timeout, LOCAL_CACHE_TIMEOUT))
+
+
+def _delete(keys):
+    cache.delete_many(keys)
+    caches["local"].delete_many(keys)
+
+
+def get_cached_token(token):
+    """
+    Get the user an access token was last authenticated as, from the local then the shared cache.
+
+    Token entries are only trusted while the user they point to is cached, so invalidating a user
+    also makes every cached token of the user authenticate from scratch again.
+
+    Parameters:
+        - token (str): The access token, only its hash is used as a cache key.
+
+    Returns:
+        - tuple[User, AccessToken | None] | None: The user and, for OAuth2 tokens, their `AccessToken`
+          rebuilt from the cached attributes, or None when the token has to be authenticated.
+    """
+    entry = _get(get_token_key(token))
+    if entry is None:
+        return None
+
+    user_id, expires_at, _ = entry
+    if expires_at is not None and expires_at <= time.time():
+        return None
+
+    return _build_cached_token(token, entry, _get(get_user_key(user_id)))
+
+
+async def aget_cached_token(token):
+    """
+    Async version of `get_cached_token`.
+    """
+    entry = await _aget(get_token_key(token))
+    if entry is None:
+        return None
+
+    user_id, expires_at, _ = entry
+    if expires_at is not None and expires_at <= time.time():
+        return None
+
+    return _build_cached_token(token, entry, await _aget(get_user_key(user_id)))
+
+
+def _build_cached_token(token, entry, user):
+    if user is None:
+        return None
+
+    _, expires_at, access_token = entry
+    if access_token is not None:
+        access_token = get_access_token_model()(
+            token=token,
+            user=user,
+            expires=datetime.datetime.fromtimestamp(expires_at, tz=datetime.timezone.utc),
+            **access_token,
+        )
+
+    return user, access_token
+
+
+def get_cached_token_user(token):
+    cached = get_cached_token(token)
+    return cached[0] if cached is not None else None
+
+
+def cache_token_user(token, user, expires_at=None, access_token=None):
+    """
+    Parameters:
+        - token (str): The access token.
+        - user (User): The user the token authenticated as.
+        - expires_at (float | None): The timestamp the token expires at.
+        - access_token (AccessToken | None): The OAuth2 access token, its attributes are cached so cache
+          hits authenticate with the same `request.auth` as misses.
+    """
+    timeout = TOKEN_CACHE_TIMEOUT
+    if expires_at is not None:
+        timeout = min(timeout, int(expires_at - time.time()))
+        if timeout <= 0:
+            return
+
+    if access_token is not None:
+        access_token = {
+            "pk": access_token.pk,
+            "scope": access_token.scope,
+            "application_id": access_token.application_id,
+        }
+
+    _set(get_token_key(token), (user.pk, expires_at, access_token), timeout)
+    _set(get_user_key(user.pk), user, USER_CACHE_TIMEOUT)
+
+
+def invalidate_tokens(tokens):
+    _delete([get_token_key(token) for token in tokens])
+
+
+def invalidate_user(user_id):
+    _delete([get_user_key(user_id)])
+
+
+def get_bearer_credentials(request):
+    return get_authorization_header(request).decode(HTTP_HEADER_ENCODING).split()
+
+
+async def aget_cached_credentials(request):
+    """
+    Authenticate a request from the token cache alone, like the cached authentication classes do for
+    known OAuth2 and provider tokens, without falling back to the token tables or the provider.
+
+    Parameters:
+        - request (Request): The request.
+
+    Returns:
+        - tuple[User, AccessToken | str] | None: The user and the auth of the request, the `AccessToken`
+          of OAuth2 tokens and the token of provider tokens, or None when the token has to be authenticated.
+    """
+    credentials = get_bearer_credentials(request)
+    if len(credentials) == 2 and credentials[0].lower() == "bearer":
+        cached = await aget_cached_token(credentials[1])
+        if cached is None or cached[1] is None:
+            return None
+
+        return cached
+
+    if len(credentials) == 3 and credentials[0].lower() == "bearer":
+        cached = await aget_cached_token(f"{credentials[1]}:{credentials[2]}")
+        if cached is None:
+            return None
+
+        return cached[0], credentials[2]
+
+    return None
+
+
+class CachedOAuth2Authentication(OAuth2Authentication):
+    """
+    `OAuth2Authentication` that remembers the user of valid access tokens, so requests with a known
+    token authenticate without querying the token and user tables. Cache hits authenticate with an
+    `AccessToken` rebuilt from its cached attributes, so `request.auth` is the same on both paths.
+    """
+
+    def authenticate(self, request):
+        credentials = get_bearer_credentials(request)
+        if len(credentials) != 2 or credentials[0].lower() != "bearer":
+            return None
+
+        token = credentials[1]
+        cached = get_cached_token(token)
+        if cached is not None and cached[1] is not None:
+            return cached
+
+        result = super().authenticate(request)
+        if result is not None:
+            user, access_token = result
+            cache_token_user(token, user, access_token.expires.timestamp(), access_token)
+
+        return result
+
+
+class CachedSocialAuthentication(SocialAuthentication):
+    """
+    `SocialAuthentication` that remembers the user of valid provider tokens, so requests with a known
+    token are not checked against the provider again until the entry expires.
+    """
+
+    def authenticate(self, request):
+        credentials = get_bearer_credentials(request)
+        if len(credentials) != 3 or credentials[0].lower() != "bearer":
+            return super().authenticate(request)
+
+        backend, token = credentials[1], credentials[2]
+        user = get_cached_token_user(f"{backend}:{token}")
+        if user is not None:
+            return user, token
+
+        result = super().authenticate(request)
+        if result is not None:
+            cache_token_user(f"{backend}:{token}", result[0])
+
+        return result
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0003_user_default_workspace'),
+        ('organizations', '0003_created_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['date_joined', 'id'], name='user_date_joined_idx'),
+        ),
+    ]
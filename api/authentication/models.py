@@ -15,6 +15,11 @@ class User(AbstractUser):
     USERNAME_FIELD = "username"
     EMAIL_FIELD = "email"
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["date_joined", "id"], name="user_date_joined_idx"),
+        ]
+
     @property
     def display_name(self) -> str:
         email_first_part = self.email.split("@")[0]
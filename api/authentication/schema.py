@@ -4,6 +4,7 @@ from drf_social_oauth2.serializers import (
     InvalidateSessionsSerializer,
     RevokeTokenSerializer,
 )
+from drf_spectacular.contrib.django_oauth_toolkit import DjangoOAuthToolkitScheme
 from drf_spectacular.extensions import (
     OpenApiAuthenticationExtension,
     OpenApiViewExtension,
@@ -14,6 +15,7 @@ from rest_framework import serializers
 
 class DRFSocialAuthenticationSchema(OpenApiAuthenticationExtension):
     target_class = "drf_social_oauth2.authentication.SocialAuthentication"
+    match_subclasses = True
     name = "SocialAuthentication"
 
     def get_security_definition(self, auto_schema):
@@ -23,6 +25,10 @@ class DRFSocialAuthenticationSchema(OpenApiAuthenticationExtension):
         }
 
 
+class CachedOAuth2AuthenticationSchema(DjangoOAuthToolkitScheme):
+    target_class = "authentication.authentication.CachedOAuth2Authentication"
+
+
 class InvalidateRefreshTokensSchemaFix(OpenApiViewExtension):
     target_class = "drf_social_oauth2.views.InvalidateRefreshTokens"
 
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from oauth2_provider.models import get_access_token_model
+from social_django.models import UserSocialAuth
+
+from .authentication import invalidate_tokens, invalidate_user
+from .models import User
+
+AccessToken = get_access_token_model()
+
+
+@receiver(pre_save, sender=AccessToken)
+def track_access_token_change(sender, instance, **kwargs):
+    # Refreshing a token can rewrite it in place, the previous value must not stay cached.
+    instance._previous_token = None
+    if not instance._state.adding:
+        instance._previous_token = AccessToken.objects.filter(pk=instance.pk).values_list("token", flat=True).first()
+
+
+@receiver(post_save, sender=AccessToken)
+@receiver(post_delete, sender=AccessToken)
+def invalidate_access_token(sender, instance, **kwargs):
+    tokens = {instance.token, getattr(instance, "_previous_token", None)} - {None}
+    transaction.on_commit(lambda: invalidate_tokens(tokens))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_user(instance.pk))
+
+
+@receiver(post_delete, sender=UserSocialAuth)
+def invalidate_social_auth_user(sender, instance, **kwargs):
+    # Cached provider tokens are only trusted while their user is cached.
+    transaction.on_commit(lambda: invalidate_user(instance.user_id))
@@ -1,3 +1,88 @@
-from django.test import TestCase  # noqa: F401
+import datetime
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+
+from django.core.cache import cache, caches
+from django.test import TestCase
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .authentication import CachedOAuth2Authentication, aget_cached_credentials, get_cached_token_user
+from .models import User
+
+AccessToken = get_access_token_model()
+
+
+class CachedOAuth2AuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["local"].clear()
+        self.user = User.objects.create_user(username="ada@example.com", email="ada@example.com", password="password")
+        self.access_token = AccessToken.objects.create(
+            user=self.user,
+            token="token",
+            scope="read write",
+            expires=timezone.now() + datetime.timedelta(hours=1),
+        )
+
+    def get_request(self, token="token"):
+        return Request(APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}"))
+
+    def authenticate(self, token="token"):
+        return CachedOAuth2Authentication().authenticate(self.get_request(token))
+
+    def test_miss_authenticates_from_the_token_table_and_caches_the_user(self):
+        user, auth = self.authenticate()
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(auth, self.access_token)
+        self.assertEqual(get_cached_token_user("token"), self.user)
+
+    def test_hit_authenticates_without_queries_with_the_same_auth_as_a_miss(self):
+        _, missed_auth = self.authenticate()
+
+        with self.assertNumQueries(0):
+            user, auth = self.authenticate()
+
+        self.assertEqual(user, self.user)
+        self.assertIsInstance(auth, AccessToken)
+        self.assertEqual(auth.pk, missed_auth.pk)
+        self.assertEqual(auth.scope, missed_auth.scope)
+        self.assertEqual(auth.application_id, missed_auth.application_id)
+        self.assertTrue(auth.is_valid(["read"]))
+        self.assertFalse(auth.is_valid(["admin"]))
+
+    def test_cached_credentials_of_async_requests_match_the_authentication(self):
+        self.assertIsNone(async_to_sync(aget_cached_credentials)(self.get_request()))
+
+        self.authenticate()
+        user, auth = async_to_sync(aget_cached_credentials)(self.get_request())
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(auth.pk, self.access_token.pk)
+
+    def test_unknown_tokens_are_not_authenticated(self):
+        self.assertIsNone(self.authenticate("unknown"))
+        self.assertIsNone(get_cached_token_user("unknown"))
+
+    def test_saving_the_token_drops_its_cache_entry(self):
+        self.authenticate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.access_token.scope = "read"
+            self.access_token.save()
+
+        self.assertIsNone(get_cached_token_user("token"))
+        self.assertEqual(self.authenticate()[1].scope, "read")
+
+    def test_updating_the_user_drops_its_cached_tokens(self):
+        self.authenticate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Ada"
+            self.user.save()
+
+        self.assertIsNone(get_cached_token_user("token"))
+        self.assertEqual(self.authenticate()[0].first_name, "Ada")
@@ -4,11 +4,14 @@ from rest_framework import mixins, permissions, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 
-from api.ably import ably_client
+from api.ably import get_ably_client
+from api.async_views import AsyncReadMixin
+from api.pagination import DateJoinedCursorPagination
 from authentication.filters import UserFilter
 from authentication.models import User
 from authentication.serializers import MyUserSerializer, UserSerializer
 from docs.tags import SchemaTags
+from organizations.models import WorkspaceMembership
 
 
 @extend_schema(tags=[SchemaTags.AUTHENTICATION__USERS.value])
@@ -32,6 +35,7 @@ from docs.tags import SchemaTags
     ),
 )
 class UserViewSet(
+    AsyncReadMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet,
@@ -42,6 +46,8 @@ class UserViewSet(
 
     filter_backends = [DjangoFilterBackend]
     filterset_class = UserFilter
+    pagination_class = DateJoinedCursorPagination
+    async_actions = ["get_me"]
 
     def is_me(self):
         return self.kwargs.get("pk") == self.request.user.id or self.kwargs.get("pk") == "me"
@@ -55,7 +61,8 @@ class UserViewSet(
         if self.is_me():
             return User.objects.filter(id=self.request.user.id)
 
-        return User.objects.filter(workspaces__in=self.request.user.workspaces.all()).distinct()
+        memberships = WorkspaceMembership.objects.filter(workspace_id__in=self.get_workspace_ids())
+        return User.objects.filter(pk__in=memberships.values("user_id"))
 
     def get_serializer_class(self):
         if self.is_me():
@@ -67,6 +74,10 @@ class UserViewSet(
         self.kwargs["pk"] = request.user.id
         return self.retrieve(request, *args, **kwargs)
 
+    async def aget_me(self, request, *args, **kwargs):
+        self.kwargs["pk"] = request.user.id
+        return Response(await self.aserialize(request.user))
+
     @action(detail=False, methods=["put"], url_path="me")
     def update_me(self, request, *args, **kwargs):
         kwargs["pk"] = request.user.id
@@ -99,5 +110,5 @@ def get_ably_token(request):
         "client_id": str(request.user.id),
         "ttl": 24 * 60 * 60,
     }
-    token_details = ably_client.auth.request_token(token_params=token_params)
+    token_details = get_ably_client().auth.request_token(token_params=token_params)
     return Response(token_details.to_dict())
@@ -0,0 +1,47 @@
+import datetime
+import math
+from json.encoder import encode_basestring_ascii
+
+from dateutil import parser
+
+# Encoders producing the same JSON as `json.dumps` for a single kind of value, without going through
+# the generic encoder, so batches of values of a known type can be serialized cheaply.
+
+
+def encode_string(value):
+    return encode_basestring_ascii(value)
+
+
+def encode_number(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return "NaN" if math.isnan(value) else ("Infinity" if value > 0 else "-Infinity")
+
+    return repr(value)
+
+
+def encode_bool(value):
+    return "true" if value else "false"
+
+
+def encode_id_list(ids):
+    return "[" + ", ".join(f'"{pk}"' for pk in ids) + "]"
+
+
+def parse_datetime(value):
+    """
+    Parse a date and time, trying `datetime.fromisoformat` before the general purpose and much slower
+    dateutil parser, so ISO 8601 values (including the ones written by the API) take the fast path.
+
+    Parameters:
+        - value (str): The value to parse.
+
+    Returns:
+        - datetime.datetime: The parsed value.
+    """
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            pass
+
+    return parser.parse(value)
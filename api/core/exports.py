@@ -0,0 +1,199 @@
+import csv
+import json
+import re
+import uuid
+from collections import Counter
+
+from .models import Page
+from .schema import get_database_schema
+from .validation import ResponseValidationContext
+
+
+PAGE_COLUMNS = ("id", "title", "created_at", "updated_at")
+
+# Columns of fields named by their ID as well, eg. `Status (4a1e…)`, see `get_field_columns`.
+QUALIFIED_COLUMN_PATTERN = re.compile(r"^.* \((?P<field_id>[0-9a-fA-F-]{36})\)$")
+
+
+def get_qualified_column(field):
+    return f"{field.label} ({field.pk})"
+
+
+def parse_qualified_column(column):
+    """
+    Returns:
+        - UUID | None: The field ID of a column written by `get_qualified_column`, None for other columns.
+    """
+    match = QUALIFIED_COLUMN_PATTERN.match(column)
+    if match is None:
+        return None
+
+    try:
+        return uuid.UUID(match["field_id"])
+    except ValueError:
+        return None
+
+
+def get_field_columns(fields, database_fields):
+    """
+    Name the columns of fields by their label, unless the label is shared with another field of the
+    database or a page column, in which case the field ID is added to it, so every column is unique and
+    can be imported back into its field.
+
+    Parameters:
+        - fields (list[Field]): The fields to name the columns of.
+        - database_fields (Iterable[Field]): All the fields of the database.
+
+    Returns:
+        - list[str]: The column of every field.
+    """
+    label_counts = Counter(field.label for field in database_fields)
+    return [
+        field.label
+        if label_counts[field.label] <= 1 and field.label not in PAGE_COLUMNS
+        else get_qualified_column(field)
+        for field in fields
+    ]
+
+
+class Echo:
+    """
+    A file-like object that returns what is written to it, so `csv.writer` can produce lines for a
+    streaming response without buffering them.
+    """
+
+    def write(self, value):
+        return value
+
+
+class DatabaseExport:
+    """
+    Stream the pages of a database with one column per field of its META_PAGE view, in view order.
+
+    Pages and their responses are read with a single `LEFT JOIN` over a server-side cursor, and rows
+    are serialized in batches of pages, one column at a time with the `serialize_many` of the field
+    config, which resolves the references of the column (choice options, attachments and related
+    pages) with one query. Memory use depends on the batch size,
+    not on the size of the database.
+
+    Fields are exported under the columns named by `get_field_columns`.
+
+    Parameters:
+        - database (Database): The database to export.
+        - chunk_size (int): The number of joined rows fetched from the cursor at a time.
+        - batch_size (int): The number of pages serialized together.
+    """
+
+    PAGE_COLUMNS = list(PAGE_COLUMNS)
+
+    def __init__(self, database, chunk_size=2000, batch_size=500):
+        self.database = database
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        schema = get_database_schema(database.pk)
+        self.fields = schema.get_page_fields()
+        self.field_columns = get_field_columns(self.fields, schema.fields.values())
+
+    def get_header(self):
+        return self.PAGE_COLUMNS + self.field_columns
+
+    def iter_csv(self):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.get_header())
+
+        for page, values in self.iter_rows():
+            cells = [self._to_csv_cell(value) for value in values]
+            yield writer.writerow([page[column] for column in self.PAGE_COLUMNS] + cells)
+
+    def iter_ndjson(self):
+        for page, values in self.iter_rows():
+            # Values are already JSON encoded by their config, so they are embedded as is.
+            members = [f"{json.dumps(column)}: {json.dumps(page[column])}" for column in self.PAGE_COLUMNS]
+            members += [
+                f"{json.dumps(column)}: {'null' if value is None else value}"
+                for column, value in zip(self.field_columns, values)
+            ]
+            yield "{" + ", ".join(members) + "}\n"
+
+    def iter_rows(self):
+        """
+        Yields:
+            - tuple[dict, list[str | None]]: The page attributes, and the JSON encoded value of every
+              field, None for fields without a (valid) response.
+        """
+        batch = []
+        for page in self.iter_pages():
+            batch.append(page)
+            if len(batch) >= self.batch_size:
+                yield from self._serialize_batch(batch)
+                batch = []
+
+        yield from self._serialize_batch(batch)
+
+    def iter_pages(self):
+        rows = (
+            Page.objects.filter(database=self.database)
+            .order_by("created_at", "id")
+            .values_list("id", "title", "created_at", "updated_at", "fieldresponse__field_id", "fieldresponse__data")
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+        page = None
+        for page_id, title, created_at, updated_at, field_id, data in rows:
+            if page is None or page["id"] != str(page_id):
+                if page is not None:
+                    yield page
+
+                page = {
+                    "id": str(page_id),
+                    "title": title,
+                    "created_at": created_at.isoformat(),
+                    "updated_at": updated_at.isoformat(),
+                    "responses": {},
+                }
+
+            if field_id is not None and isinstance(data, dict) and "value" in data:
+                page["responses"][field_id] = data["value"]
+
+        if page is not None:
+            yield page
+
+    def _serialize_batch(self, pages):
+        context = ResponseValidationContext()
+        columns = [self._serialize_column(field, pages, context) for field in self.fields]
+
+        for index, page in enumerate(pages):
+            yield page, [column[index] for column in columns]
+
+    def _serialize_column(self, field, pages, context):
+        column = [None] * len(pages)
+        if field.config is None:
+            return column
+
+        indexes = [index for index, page in enumerate(pages) if field.pk in page["responses"]]
+        values = [pages[index]["responses"][field.pk] for index in indexes]
+        try:
+            serialized = field.config.serialize_many(values, context)
+        except (TypeError, ValueError, OverflowError):
+            # A single invalid value fails the whole batch, so only that column is serialized again one
+            # value at a time, leaving out the invalid ones.
+            serialized = [self._serialize_value(field, value, context) for value in values]
+
+        for index, value in zip(indexes, serialized):
+            column[index] = value
+
+        return column
+
+    def _serialize_value(self, field, value, context):
+        try:
+            return field.config.serialize_response_data(value, context)
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    def _to_csv_cell(self, value):
+        if value is None:
+            return ""
+
+        # Plain strings are written unquoted, other values keep their JSON representation.
+        decoded = json.loads(value)
+        return decoded if isinstance(decoded, str) else value
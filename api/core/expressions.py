@@ -0,0 +1,15 @@
+def get_response_field_path(response_path, field_name):
+    """
+    Get the lookup path of a `FieldResponse` column.
+
+    Parameters:
+        - response_path (str | None): The relation to the response, or None when querying `FieldResponse` itself.
+        - field_name (str): The column on `FieldResponse`.
+
+    Returns:
+        - str: The lookup path.
+    """
+    if response_path is None:
+        return field_name
+
+    return f"{response_path}__{field_name}"
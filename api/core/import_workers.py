@@ -0,0 +1,25 @@
+"""
+Entry points of the worker processes of `DatabaseImporter`.
+
+Workers are spawned rather than forked, so they never share the database connection of the parent.
+This module is imported by them before Django is set up, so it must not import models at the top.
+"""
+
+import pickle
+
+_columns = None
+
+
+def init_worker(columns_pickle):
+    import django
+
+    django.setup()
+
+    global _columns
+    _columns = pickle.loads(columns_pickle)
+
+
+def coerce_rows(rows):
+    from .imports import coerce_rows
+
+    return coerce_rows(_columns, rows)
@@ -0,0 +1,601 @@
+import csv
+import io
+import json
+import logging
+import math
+import multiprocessing
+import pickle
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.etags import bump_workspace_versions
+from jobs.decorators import job
+
+from . import import_workers
+from .exports import PAGE_COLUMNS, get_qualified_column, parse_qualified_column
+from .models import DatabaseImport, Field, FieldResponse, Page
+from .realtime import record_page_changes
+from .results import bump_pages_version
+from .schema import get_database_schema
+from .validation import ResponseValidationContext
+
+logger = logging.getLogger(__name__)
+
+# Fields referencing attachments and pages, their values are validated in bulk by the importer.
+REFERENCE_FIELD_TYPES = (Field.FieldType.FILE, Field.FieldType.RELATION)
+
+PAGE_COPY_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "created_by_id",
+    "updated_by_id",
+    "database_id",
+    "title",
+    "content",
+)
+RESPONSE_COPY_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "created_by_id",
+    "updated_by_id",
+    "page_id",
+    "field_id",
+    "data",
+    *FieldResponse.TYPED_VALUE_COLUMNS,
+)
+
+TITLE_MAX_LENGTH = Page._meta.get_field("title").max_length
+
+
+def decode_list_cell(raw):
+    """
+    Parameters:
+        - raw (any): A list cell, either decoded from JSON, the JSON text of a list or a single item.
+
+    Returns:
+        - list: The items of the cell.
+    """
+    if isinstance(raw, str) and raw.lstrip().startswith("["):
+        raw = json.loads(raw)
+
+    return raw if isinstance(raw, list) else [raw]
+
+
+def _coerce_values(field, raws):
+    config = field.config
+    if config is None:
+        raise ValidationError("Field is not configured")
+
+    if field.field_type == Field.FieldType.CHOICE:
+        option_ids = {option.label: str(option.pk) for option in config.options.all()}
+        values = [[str(option_ids.get(item, item)) for item in decode_list_cell(raw)] for raw in raws]
+    elif field.field_type in REFERENCE_FIELD_TYPES:
+        values = [[str(item) for item in decode_list_cell(raw)] for raw in raws]
+    elif field.field_type == Field.FieldType.CHECKLIST:
+        values = config.deserialize_many([decode_list_cell(raw) for raw in raws])
+    elif field.field_type == Field.FieldType.DATE:
+        values = [obj.isoformat() for obj in config.deserialize_many(raws)]
+    else:
+        values = config.deserialize_many(raws)
+
+    coerced = []
+    for value in values:
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError("Value must be finite")
+
+        # Choice options are loaded with the field, so only files and pages are left to the importer.
+        if field.field_type not in REFERENCE_FIELD_TYPES:
+            config.validate_response_data(value)
+
+        coerced.append((value, config.get_typed_response_value(value)))
+
+    return coerced
+
+
+def coerce_cell(field, raw):
+    """
+    Convert a raw CSV or NDJSON cell to the value stored in `FieldResponse.data`, using the
+    `deserialize_many` of the field config.
+
+    Choice cells may hold option IDs or labels. File and relation cells are only normalized to lists
+    of IDs, resolving them needs the database, so they are validated by the importer in bulk.
+
+    Parameters:
+        - field (Field): The field of the cell, with its config loaded.
+        - raw (any): The cell, a string for CSV and any JSON value for NDJSON.
+
+    Returns:
+        - tuple[any, any]: The response value, and its typed value for the `response_value_column` of the
+          config.
+
+    Raises:
+        - ValidationError: If the cell cannot be converted to a valid value of the field.
+    """
+    try:
+        return _coerce_values(field, [raw])[0]
+    except (TypeError, ValueError, OverflowError):
+        raise ValidationError(f"Invalid {field.get_field_type_display().lower()} value: {raw}")
+
+
+def coerce_cells(field, raws):
+    """
+    Coerce the cells of a column at once, see `coerce_cell`.
+
+    Returns:
+        - list[tuple[any, any] | ValidationError]: The value and typed value of every cell, or its error.
+    """
+    try:
+        return _coerce_values(field, raws)
+    except (TypeError, ValueError, OverflowError, ValidationError):
+        pass
+
+    # A single invalid cell fails the whole column, so the cells are coerced again one at a time to
+    # report the invalid ones.
+    results = []
+    for raw in raws:
+        try:
+            results.append(coerce_cell(field, raw))
+        except ValidationError as e:
+            results.append(e)
+
+    return results
+
+
+def get_column_field(columns, column):
+    """
+    Parameters:
+        - columns (dict[str, Field]): The fields of the database by column name, their label or ID.
+        - column (str): A column of the file, either a name of `columns` or a column qualified with the
+          field ID by the export, eg. `Status (4a1e…)`.
+
+    Returns:
+        - Field | None: The field of the column, None for unknown columns.
+    """
+    field = columns.get(column)
+    if field is None and isinstance(column, str):
+        field_id = parse_qualified_column(column)
+        if field_id is not None:
+            field = columns.get(str(field_id))
+
+    return field
+
+
+def coerce_rows(columns, rows):
+    """
+    Parameters:
+        - columns (dict[str, Field]): The fields of the database by column name, their label or ID.
+        - rows (list[tuple[int, dict | str]]): The row numbers and records, or NDJSON lines.
+
+    Returns:
+        - tuple[list, list, set]: The valid rows as `(row, title, [(field_id, value, typed_value)])`, the
+          rejected rows as `{"row": int, "errors": dict}`, and the columns of the records.
+    """
+    parsed = []
+    rejected = []
+    record_columns = set()
+    for row, record in rows:
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            if not isinstance(record, dict):
+                raise ValueError("Row must be an object")
+            if None in record:
+                raise ValueError("Row has more cells than the header")
+        except ValueError as e:
+            rejected.append({"row": row, "errors": {"row": [str(e)]}})
+            continue
+
+        errors = {}
+        title = record.get("title")
+        title = "" if title is None else str(title)
+        if title.strip() == "":
+            errors["title"] = ["Title cannot be blank"]
+        elif len(title) > TITLE_MAX_LENGTH:
+            errors["title"] = [f"Title cannot be longer than {TITLE_MAX_LENGTH} characters"]
+
+        parsed.append((row, title, record, errors, []))
+
+    # Cells are grouped by field, so each column of the chunk is coerced with one codec call. When a
+    # field appears under both its label and its ID, the last cell of the record wins.
+    columns_cells = {}
+    for index, (_, _, record, _, _) in enumerate(parsed):
+        cells = {}
+        record_columns.update(record.keys())
+        for column, raw in record.items():
+            field = get_column_field(columns, column)
+            if field is not None and raw is not None and raw != "":
+                cells[field.pk] = (field, raw)
+
+        for field, raw in cells.values():
+            indexes, raws = columns_cells.setdefault(field, ([], []))
+            indexes.append(index)
+            raws.append(raw)
+
+    for field, (indexes, raws) in columns_cells.items():
+        for index, result in zip(indexes, coerce_cells(field, raws)):
+            _, _, _, errors, cells = parsed[index]
+            if isinstance(result, ValidationError):
+                errors[field.label] = result.messages
+            else:
+                cells.append((field.pk, *result))
+
+    records = []
+    for row, title, _, errors, cells in parsed:
+        if len(errors) > 0:
+            rejected.append({"row": row, "errors": errors})
+        else:
+            records.append((row, title, cells))
+
+    return records, rejected, record_columns
+
+
+def to_copy_value(value):
+    if value is None:
+        return ""
+
+    if isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, list):
+        value = "{" + ",".join(str(item) for item in value) + "}"
+    elif not isinstance(value, str):
+        value = value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+    # Every non NULL value is quoted, so empty strings are not read as NULL.
+    return '"' + value.replace('"', '""') + '"'
+
+
+def write_copy_row(buffer, values):
+    buffer.write(",".join(to_copy_value(value) for value in values))
+    buffer.write("\n")
+
+
+class DatabaseImporter:
+    """
+    Create the pages of a database, with their field responses, from a CSV or NDJSON file.
+
+    Columns are matched to the fields of the database by label, ID or the label qualified with the ID
+    written by `DatabaseExport` for fields sharing their label, the `title` column names the
+    pages, and the other columns written by `DatabaseExport` (`id`, `created_at` and `updated_at`) as
+    well as unknown columns are ignored. Labels shared by several fields, or equal to a page column,
+    do not match any field, they are reported with the qualified columns to use instead unless the
+    file has a column for each of their fields.
+
+    Rows are read in chunks, and every cell is coerced and validated with the config of its field in a
+    pool of worker processes. The references of each chunk (choice options, attachments and related
+    pages) are then resolved in bulk, and the pages and responses of the chunk are loaded with
+    PostgreSQL `COPY`, all inside a single transaction. Rows with an invalid cell are rejected as a
+    whole and reported, the rest of the file is still imported.
+
+    Parameters:
+        - database (Database): The database to import the pages into.
+        - user (User): The user creating the pages.
+        - workers (int): The number of worker processes, rows are coerced in-process when 1 or less.
+        - chunk_size (int): The number of rows coerced and copied at a time.
+    """
+
+    def __init__(self, database, user, workers=None, chunk_size=5000):
+        self.database = database
+        self.user = user
+        self.workers = workers if workers is not None else min(multiprocessing.cpu_count(), 8)
+        self.chunk_size = chunk_size
+        self.fields = get_database_schema(database.pk).fields
+        self.columns, self.ambiguous_columns = self.get_columns()
+
+    def get_columns(self):
+        """
+        Returns:
+            - tuple[dict[str, Field], dict[str, list[Field]]]: The fields by column name, their label or
+              ID, and the fields of the labels that cannot name a column, as they are shared by several
+              fields or equal to a page column.
+        """
+        fields_by_label = {}
+        for field in self.fields.values():
+            fields_by_label.setdefault(field.label, []).append(field)
+
+        columns = {str(field.pk): field for field in self.fields.values()}
+        ambiguous_columns = {}
+        for label, fields in fields_by_label.items():
+            if len(fields) > 1 or label in PAGE_COLUMNS:
+                ambiguous_columns[label] = fields
+            else:
+                columns.setdefault(label, fields[0])
+
+        return columns, ambiguous_columns
+
+    def get_ignored_column(self, column):
+        """
+        Parameters:
+            - column (str): A column of the file matching no field.
+
+        Returns:
+            - dict: The column as `{"column": str, "reason": str}`.
+        """
+        fields = self.ambiguous_columns.get(column)
+        if fields is None:
+            return {"column": column, "reason": "No field has this label or ID"}
+
+        headers = ", ".join(f"'{get_qualified_column(field)}'" for field in fields)
+        if column in PAGE_COLUMNS:
+            reason = f"'{column}' is a column of the pages, use the column {headers} for the field"
+        else:
+            reason = f"Several fields have this label, use the columns {headers}"
+
+        return {"column": column, "reason": reason}
+
+    def run(self, file, file_format):
+        """
+        Parameters:
+            - file (TextIO): The file to import.
+            - file_format (str): The format of the file, `csv` or `ndjson`.
+
+        Returns:
+            - dict: The number of created pages and responses, the ignored columns as
+              `{"column": str, "reason": str}`, and the rejected rows as `{"row": int, "errors": dict}`,
+              numbered from 1 without the CSV header.
+        """
+        result = {"pages_created": 0, "responses_created": 0, "ignored_columns": [], "rejected_rows": []}
+        file_columns = {}
+
+        if file_format == DatabaseImport.Format.CSV:
+            rows = self.read_csv(file, file_columns)
+        else:
+            rows = self.read_ndjson(file)
+
+        with transaction.atomic():
+            for records, rejected, record_columns in self.coerce_chunks(self.iter_chunks(rows)):
+                file_columns.update(dict.fromkeys(sorted(record_columns - file_columns.keys())))
+                records, reference_rejected = self.validate_references(records)
+                rejected.extend(reference_rejected)
+
+                result["rejected_rows"].extend(sorted(rejected, key=lambda item: item["row"]))
+                pages_created, responses_created = self.copy_records(records)
+                result["pages_created"] += pages_created
+                result["responses_created"] += responses_created
+
+            # COPY sends no signals, the results of every view of the database and the ETags of its
+            # workspace are invalidated once the imported pages are committed.
+            transaction.on_commit(lambda: bump_pages_version(self.database.pk))
+            transaction.on_commit(lambda: bump_workspace_versions([self.database.workspace_id]))
+
+        result["ignored_columns"] = self.get_ignored_columns(file_columns)
+        return result
+
+    def get_ignored_columns(self, file_columns):
+        """
+        Parameters:
+            - file_columns (Iterable[str]): The columns of the file.
+
+        Returns:
+            - list[dict]: The columns matching no field, see `get_ignored_column`, but page columns and
+              ambiguous labels whose fields all have another column in the file.
+        """
+        matched_field_ids = set()
+        unmatched_columns = []
+        for column in file_columns:
+            if column is None:
+                continue
+
+            field = get_column_field(self.columns, column)
+            if field is None:
+                unmatched_columns.append(column)
+            else:
+                matched_field_ids.add(field.pk)
+
+        ignored_columns = []
+        for column in unmatched_columns:
+            fields = self.ambiguous_columns.get(column)
+            if fields is None:
+                is_ignored = column not in PAGE_COLUMNS
+            else:
+                is_ignored = any(field.pk not in matched_field_ids for field in fields)
+
+            if is_ignored:
+                ignored_columns.append(self.get_ignored_column(column))
+
+        return ignored_columns
+
+    def read_csv(self, file, file_columns):
+        # Cells beyond the header are collected under the `None` key, and rejected by `coerce_rows`.
+        reader = csv.DictReader(file)
+        file_columns.update(dict.fromkeys(reader.fieldnames or []))
+        yield from enumerate(reader, start=1)
+
+    def read_ndjson(self, file):
+        for row, line in enumerate(file, start=1):
+            if line.strip() != "":
+                yield row, line
+
+    def iter_chunks(self, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
+        if len(chunk) > 0:
+            yield chunk
+
+    def coerce_chunks(self, chunks):
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield coerce_rows(self.columns, chunk)
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=import_workers.init_worker,
+            initargs=(pickle.dumps(self.columns),),
+        )
+        with executor:
+            # Only a couple of chunks per worker are in flight, so the file is never read into memory
+            # as a whole, and chunks are yielded in file order.
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(import_workers.coerce_rows, chunk))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+
+            while len(pending) > 0:
+                yield pending.popleft().result()
+
+    def validate_references(self, records):
+        values_by_field = {}
+        for _, _, cells in records:
+            for field_id, value, _ in cells:
+                if self.fields[field_id].field_type in REFERENCE_FIELD_TYPES:
+                    values_by_field.setdefault(field_id, []).append(value)
+
+        if len(values_by_field) == 0:
+            return records, []
+
+        context = ResponseValidationContext()
+        for field_id, values in values_by_field.items():
+            context.prefetch(self.fields[field_id].config, values)
+
+        valid_records = []
+        rejected = []
+        for row, title, cells in records:
+            errors = {}
+            for field_id, value, _ in cells:
+                field = self.fields[field_id]
+                if field_id not in values_by_field:
+                    continue
+
+                try:
+                    field.config.validate_response_data(value, context)
+                except ValidationError as e:
+                    errors[field.label] = e.messages
+
+            if len(errors) > 0:
+                rejected.append({"row": row, "errors": errors})
+            else:
+                valid_records.append((row, title, cells))
+
+        return valid_records, rejected
+
+    def copy_records(self, records):
+        if len(records) == 0:
+            return 0, 0
+
+        now = timezone.now()
+        user_id = self.user.pk if self.user is not None else None
+
+        pages = io.StringIO()
+        responses = io.StringIO()
+        response_count = 0
+        page_ids = []
+        relation_page_ids = []
+        for _, title, cells in records:
+            page_id = uuid.uuid4()
+            page_ids.append(page_id)
+            write_copy_row(pages, (page_id, now, now, user_id, user_id, self.database.pk, title, ""))
+
+            for field_id, value, typed_value in cells:
+                field = self.fields[field_id]
+                typed_values = {column: None for column in FieldResponse.TYPED_VALUE_COLUMNS}
+                typed_values[field.config.response_value_column] = typed_value
+                write_copy_row(
+                    responses,
+                    (
+                        uuid.uuid4(),
+                        now,
+                        now,
+                        user_id,
+                        user_id,
+                        page_id,
+                        field_id,
+                        json.dumps({"value": value}),
+                        *typed_values.values(),
+                    ),
+                )
+                response_count += 1
+
+                if field.field_type == Field.FieldType.RELATION and len(value) > 0:
+                    relation_page_ids.append(page_id)
+
+        pages.seek(0)
+        responses.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(self.get_copy_sql(Page, PAGE_COPY_COLUMNS), pages)
+            cursor.copy_expert(self.get_copy_sql(FieldResponse, RESPONSE_COPY_COLUMNS), responses)
+
+            # COPY does not send signals, so the edges of relation responses are inserted from their
+            # typed values directly, and the search vectors of the pages are computed below.
+            if len(relation_page_ids) > 0:
+                cursor.execute(
+                    """
+                    INSERT INTO core_pagerelation (source_page_id, target_page_id, field_id)
+                    SELECT response.page_id, target_page_id, response.field_id
+                    FROM core_fieldresponse response
+                    CROSS JOIN LATERAL unnest(response.value_ids) AS target_page_id
+                    JOIN core_field field ON field.id = response.field_id
+                    WHERE response.page_id = ANY(%s::uuid[]) AND field.field_type = %s
+                    ON CONFLICT DO NOTHING
+                    """,
+                    [relation_page_ids, Field.FieldType.RELATION],
+                )
+
+        Page.objects.filter(pk__in=page_ids).update_search_vectors()
+        record_page_changes(page_ids, self.database.pk)
+
+        return len(records), response_count
+
+    def get_copy_sql(self, model, columns):
+        return f"COPY {model._meta.db_table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+
+@job(queue="imports", timeout=60 * 60 * 6)
+def run_database_import(database_import_id, workers=None):
+    """
+    Run a pending import, recording its status and result on the `DatabaseImport`.
+
+    Parameters:
+        - database_import_id (UUID): The import to run.
+        - workers (int): The number of worker processes, see `DatabaseImporter`.
+
+    Returns:
+        - DatabaseImport: The finished import.
+    """
+    database_import = DatabaseImport.objects.select_related("database", "created_by").get(pk=database_import_id)
+    database_import.status = DatabaseImport.Status.RUNNING
+    database_import.started_at = timezone.now()
+    database_import.save(update_fields=["status", "started_at", "updated_at"])
+
+    try:
+        importer = DatabaseImporter(database_import.database, database_import.created_by, workers=workers)
+        with database_import.file.open("rb") as file:
+            result = importer.run(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""), database_import.format)
+    except Exception as e:
+        logger.exception("Import %s of database %s failed", database_import.pk, database_import.database_id)
+        database_import.status = DatabaseImport.Status.FAILED
+        database_import.error = str(e)
+    else:
+        database_import.status = DatabaseImport.Status.COMPLETED
+        database_import.pages_created = result["pages_created"]
+        database_import.responses_created = result["responses_created"]
+        database_import.ignored_columns = result["ignored_columns"]
+        database_import.rejected_row_count = len(result["rejected_rows"])
+        database_import.rejected_rows = result["rejected_rows"][: DatabaseImport.MAX_REPORTED_REJECTED_ROWS]
+
+    database_import.finished_at = timezone.now()
+    database_import.save()
+    return database_import
+
+
+def start_database_import(database_import):
+    """
+    Queue a pending import, to run in a worker once the transaction that created it is committed.
+
+    Parameters:
+        - database_import (DatabaseImport): The pending import.
+    """
+    run_database_import.enqueue(database_import.pk)
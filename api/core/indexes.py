@@ -0,0 +1,134 @@
+import hashlib
+import uuid
+
+from django.contrib.postgres.indexes import GinIndex
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.db.models import Q
+
+from jobs.decorators import job
+
+from .models import Field, FieldResponse, View
+
+INDEX_PREFIX = "core_fr_"
+
+
+def build_field_index(field):
+    """
+    Build the partial expression index on `FieldResponse` that serves filtering and sorting on a field.
+
+    The indexed expression is the field config's expression over its typed value column, so it is
+    exactly the expression `ViewQuery` compares and sorts on. Scalar values get a btree index on their
+    sort expression (the first characters of texts, dates in UTC), lists of IDs a GIN index on their
+    value expression.
+
+    Parameters:
+        - field (Field): The field to index.
+
+    Returns:
+        - Index | None: The index, or None if the field type is not worth indexing.
+    """
+    config = field.config
+    if config is None or config.response_index_type is None:
+        return None
+
+    condition = Q(field_id=field.pk)
+
+    if config.response_index_type == "gin":
+        index = GinIndex(config.get_value_expression(None), name=INDEX_PREFIX, condition=condition)
+    else:
+        index = models.Index(config.get_sort_expression(None), name=INDEX_PREFIX, condition=condition)
+
+    # The name carries a digest of the definition, so a changed config (eg. a new date display
+    # format) produces a new index and the outdated one gets dropped.
+    with connection.schema_editor(collect_sql=True) as schema_editor:
+        definition = str(index.create_sql(FieldResponse, schema_editor))
+
+    digest = hashlib.sha1(definition.encode()).hexdigest()[:8]
+    index.name = f"{INDEX_PREFIX}{field.pk.hex}_{digest}"
+    return index
+
+
+def get_index_field_hex(index_name):
+    return index_name[len(INDEX_PREFIX) :].split("_")[0]
+
+
+def get_existing_indexes():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT index_class.relname, pg_index.indisvalid
+            FROM pg_index
+            JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+            JOIN pg_class table_class ON table_class.oid = pg_index.indrelid
+            WHERE table_class.relname = %s AND index_class.relname LIKE %s
+            """,
+            [FieldResponse._meta.db_table, f"{INDEX_PREFIX}%"],
+        )
+        return dict(cursor.fetchall())
+
+
+def get_required_field_ids(database_id):
+    views = View.objects.filter(database_id=database_id).exclude(view_type=View.ViewType.META_PAGE)
+
+    field_ids = set()
+    for view in views:
+        try:
+            field_ids.update(view.get_referenced_field_ids())
+        except ValidationError:
+            continue
+
+    return field_ids
+
+
+@job(queue="indexes", max_attempts=3, unique=True)
+def sync_field_indexes(database_id):
+    """
+    Create the indexes needed by the views of a database and drop the ones no view needs anymore.
+
+    Indexes are created and dropped concurrently, so this must not run inside a transaction. Writes
+    queue it as a job, run outside of their request.
+
+    Parameters:
+        - database_id (UUID): The database to sync.
+
+    Returns:
+        - tuple[list[str], list[str]]: The names of the created and dropped indexes.
+    """
+    fields = Field.objects.filter(database_id=database_id).with_configs()
+    field_hexes = {field.pk.hex for field in fields}
+    required_field_ids = get_required_field_ids(database_id)
+
+    required_indexes = {}
+    for field in fields:
+        if str(field.pk) not in required_field_ids:
+            continue
+
+        index = build_field_index(field)
+        if index is not None:
+            required_indexes[index.name] = index
+
+    existing_indexes = get_existing_indexes()
+    indexed_field_ids = {uuid.UUID(get_index_field_hex(name)) for name in existing_indexes}
+    live_field_hexes = {pk.hex for pk in Field.objects.filter(pk__in=indexed_field_ids).values_list("pk", flat=True)}
+
+    created = []
+    dropped = []
+    with connection.schema_editor(atomic=False) as schema_editor:
+        for name, is_valid in existing_indexes.items():
+            field_hex = get_index_field_hex(name)
+            belongs_to_database = field_hex in field_hexes or field_hex not in live_field_hexes
+            is_required = name in required_indexes and is_valid
+
+            if belongs_to_database and not is_required:
+                schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}")
+                dropped.append(name)
+
+        for name, index in required_indexes.items():
+            if existing_indexes.get(name):
+                continue
+
+            schema_editor.add_index(FieldResponse, index, concurrently=True)
+            created.append(name)
+
+    return created, dropped
@@ -0,0 +1,41 @@
+from .models import Field, FieldResponse
+from .schema import get_database_schema
+
+
+class PageFieldsLoader:
+    """
+    Load everything needed to render the fields of a set of pages in a fixed number of queries.
+
+    The fields of the META_PAGE view of every database referenced by the pages come from the cached
+    database schema, and every field response for the whole page set is loaded in a single query.
+
+    Parameters:
+        - pages (list[Page]): The pages that are going to be rendered.
+    """
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self._fields_by_database = self._load_fields()
+        self._responses = self._load_responses()
+
+    def _load_fields(self):
+        database_ids = {page.database_id for page in self.pages}
+        return {database_id: get_database_schema(database_id).get_page_fields() for database_id in database_ids}
+
+    def _load_responses(self):
+        field_ids = [field.id for fields in self._fields_by_database.values() for field in fields]
+        if len(field_ids) == 0:
+            return {}
+
+        responses = FieldResponse.objects.filter(page__in=self.pages, field_id__in=field_ids)
+        return {(response.page_id, response.field_id): response for response in responses}
+
+    def has_pages(self, pages) -> bool:
+        page_ids = {page.pk for page in self.pages}
+        return all(page.pk in page_ids for page in pages)
+
+    def get_fields(self, page) -> list[Field]:
+        return self._fields_by_database.get(page.database_id, [])
+
+    def get_response(self, page, field) -> FieldResponse | None:
+        return self._responses.get((page.pk, field.pk))
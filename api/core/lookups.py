@@ -0,0 +1,144 @@
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.db.models import DateTimeField, Q
+
+# Attributes of the pages themselves, filtered and sorted on like fields.
+PAGE_ATTRIBUTES = ["title", "created_at", "updated_at"]
+# Lookups comparing with nothing, every other lookup requires a value.
+VALUELESS_LOOKUPS = ["is_empty", "is_not_empty"]
+
+COMPARISON_LOOKUPS = {
+    "eq": "exact",
+    "gt": "gt",
+    "gte": "gte",
+    "lt": "lt",
+    "lte": "lte",
+}
+TEXT_LOOKUPS = {
+    "eq": "iexact",
+    "contains": "icontains",
+    "starts_with": "istartswith",
+    "ends_with": "iendswith",
+}
+NEGATED_LOOKUPS = {
+    "neq": "eq",
+    "not_contains": "contains",
+}
+
+
+def unsupported_lookup(lookup):
+    return ValidationError({"filter_by": f"Unsupported filter lookup '{lookup}'"})
+
+
+def iter_filter_conditions(definition):
+    """
+    Parameters:
+        - definition (dict | list | None): A filter definition, see `ViewQuery`.
+
+    Returns:
+        - Iterator[dict]: The conditions of the definition and of its nested groups.
+    """
+    if isinstance(definition, list):
+        for item in definition:
+            yield from iter_filter_conditions(item)
+    elif isinstance(definition, dict):
+        if "conditions" in definition:
+            yield from iter_filter_conditions(definition["conditions"])
+        else:
+            yield definition
+
+
+def clean_condition_value(condition):
+    """
+    Check that a condition has the value its lookup compares with, parsing the values of the
+    `created_at` and `updated_at` page attributes.
+
+    Parameters:
+        - condition (dict): A condition with a `field` and a `lookup`.
+
+    Returns:
+        - any: The value of the condition.
+
+    Raises:
+        - ValidationError: If the value is missing or invalid.
+    """
+    attribute, lookup, value = condition["field"], condition["lookup"], condition.get("value")
+    if lookup in VALUELESS_LOOKUPS:
+        return value
+
+    if value is None:
+        raise ValidationError({"filter_by": f"Lookup '{lookup}' on '{attribute}' requires a value"})
+
+    if attribute in PAGE_ATTRIBUTES and attribute != "title":
+        try:
+            value = DateTimeField().to_python(value)
+        except (TypeError, ValidationError):
+            value = None
+
+        if value is None:
+            raise ValidationError({"filter_by": f"Invalid value for '{attribute}'"})
+
+    return value
+
+
+def build_comparison_filter(path, lookup, value, lookups=COMPARISON_LOOKUPS):
+    """
+    Build a filter for a scalar (nullable) value expression.
+
+    Parameters:
+        - path (str): The annotation holding the value to compare against.
+        - lookup (str): The filter lookup, eg. `eq`, `neq`, `gt` or `is_empty`.
+        - value (any): The already deserialized value to compare with.
+        - lookups (dict): Map of the supported filter lookups to Django lookups.
+
+    Returns:
+        - Q: The filter condition. Negated lookups also match pages without a response.
+    """
+    if lookup == "is_empty":
+        return Q(**{f"{path}__isnull": True})
+
+    if lookup == "is_not_empty":
+        return Q(**{f"{path}__isnull": False})
+
+    if lookup in NEGATED_LOOKUPS and NEGATED_LOOKUPS[lookup] in lookups:
+        condition = build_comparison_filter(path, NEGATED_LOOKUPS[lookup], value, lookups)
+        return ~condition | Q(**{f"{path}__isnull": True})
+
+    if lookup not in lookups:
+        raise unsupported_lookup(lookup)
+
+    return Q(**{f"{path}__{lookups[lookup]}": value})
+
+
+def build_list_filter(path, lookup, value):
+    """
+    Build a filter for a list of IDs (choices, files and relations).
+
+    Parameters:
+        - path (str): The annotation holding the `uuid[]` value, NULL for pages without a response.
+        - lookup (str): One of `contains`, `not_contains`, `any_of`, `is_empty` or `is_not_empty`.
+        - value (any): An item ID, or a list of item IDs for `any_of`.
+
+    Returns:
+        - Q: The filter condition.
+    """
+    if lookup == "is_empty":
+        return Q(**{f"{path}__isnull": True}) | Q(**{path: []})
+
+    if lookup == "is_not_empty":
+        return Q(**{f"{path}__isnull": False}) & ~Q(**{path: []})
+
+    if lookup == "contains":
+        return Q(**{f"{path}__contains": [uuid.UUID(str(value))]})
+
+    if lookup == "not_contains":
+        return ~Q(**{f"{path}__contains": [uuid.UUID(str(value))]}) | Q(**{f"{path}__isnull": True})
+
+    if lookup == "any_of":
+        if not isinstance(value, list):
+            raise ValidationError({"filter_by": "Value must be a list for 'any_of'"})
+
+        return Q(**{f"{path}__overlap": [uuid.UUID(str(item)) for item in value]})
+
+    raise unsupported_lookup(lookup)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.models import FieldResponse
+
+
+class Command(BaseCommand):
+    help = "Fill the typed value columns of field responses from their JSON data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", action="append", help="Only backfill the given database ID(s).")
+        parser.add_argument("--field", action="append", help="Only backfill the given field ID(s).")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Responses updated per transaction.")
+
+    def handle(self, *args, **options):
+        responses = FieldResponse.objects.all()
+        if options["database"]:
+            responses = responses.filter(field__database_id__in=options["database"])
+        if options["field"]:
+            responses = responses.filter(field_id__in=options["field"])
+
+        updated = responses.refresh_typed_values(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} field responses"))
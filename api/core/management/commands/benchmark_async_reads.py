@@ -0,0 +1,85 @@
+import asyncio
+import datetime
+import secrets
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.utils import timezone
+from oauth2_provider.models import AccessToken
+
+from authentication.authentication import cache_token_user, invalidate_tokens
+from authentication.models import User
+from core.models import Database
+from organizations.memberships import get_workspace_ids
+
+
+class Command(BaseCommand):
+    help = "Time concurrent requests to the read endpoints through the ASGI handler, with and without async views."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="The user to send the requests as.")
+        parser.add_argument("--requests", type=int, default=500, help="The number of requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=50, help="The number of requests in flight at once.")
+        parser.add_argument("--path", action="append", dest="paths", help="An endpoint to time, can be repeated.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError(f"User {options['username']} does not exist.")
+
+        database = Database.objects.filter(workspace_id__in=get_workspace_ids(user)).order_by("created_at").first()
+        if database is None:
+            raise CommandError(f"User {options['username']} has no database.")
+
+        paths = options["paths"] or [
+            "/api/users/me/",
+            "/api/databases/",
+            f"/api/databases/{database.pk}/",
+            "/api/fields/",
+            "/api/views/",
+            "/api/pages/",
+        ]
+
+        access_token = AccessToken.objects.create(
+            user=user,
+            token=secrets.token_urlsafe(),
+            expires=timezone.now() + datetime.timedelta(hours=1),
+            scope="read write",
+        )
+        token = access_token.token
+        # Cached ahead, so requests authenticate like the ones of clients that already made a request.
+        cache_token_user(token, user, access_token.expires.timestamp(), access_token)
+        try:
+            self.stdout.write(f"{'endpoint':<52} {'mode':>5} {'req/s':>8} {'p50':>7} {'p95':>7}  (ms)")
+            for path in paths:
+                for mode in ("sync", "async"):
+                    with override_settings(ASYNC_READ_VIEWS=mode == "async"):
+                        rate, latencies = asyncio.run(self.measure(path, token, options))
+
+                    p50 = statistics.median(latencies)
+                    p95 = statistics.quantiles(latencies, n=20)[-1]
+                    self.stdout.write(f"{path:<52} {mode:>5} {rate:>8.0f} {p50:>7.1f} {p95:>7.1f}")
+        finally:
+            invalidate_tokens([token])
+            access_token.delete()
+
+    async def measure(self, path, token, options):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def send():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+                if response.status_code != 200:
+                    raise CommandError(f"GET {path} answered {response.status_code}.")
+                return (time.perf_counter() - start) * 1000
+
+        # Warms up the caches of the endpoint, eg. the schema and the workspace versions.
+        await send()
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*[send() for _ in range(options["requests"])])
+        return options["requests"] / (time.perf_counter() - start), latencies
@@ -0,0 +1,93 @@
+import datetime
+import time
+
+from dateutil import parser as dateutil_parser
+from django.core.management.base import BaseCommand
+
+from core.models import (
+    BooleanFieldConfig,
+    ChecklistFieldConfig,
+    DateFieldConfig,
+    FieldResponse,
+    NumberFieldConfig,
+    TextFieldConfig,
+)
+from core.schema import get_database_schema
+
+
+def build_synthetic_values(count):
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        ("boolean", BooleanFieldConfig(), [index % 2 == 0 for index in range(count)]),
+        (
+            "checklist",
+            ChecklistFieldConfig(),
+            [
+                [{"value": f"item {index}", "is_checked": index % 3 == 0}, {"value": "other", "is_checked": False}]
+                for index in range(count)
+            ],
+        ),
+        ("date", DateFieldConfig(), [(start + datetime.timedelta(hours=index)).isoformat() for index in range(count)]),
+        ("number", NumberFieldConfig(), [index * 1.5 for index in range(count)]),
+        ("text", TextFieldConfig(), [f'text "{index}" é' for index in range(count)]),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Time the per value and batch codecs of field configs, on synthetic values or stored responses."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=10000, help="The number of values per field type.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per measure, the fastest is reported.")
+        parser.add_argument("--database", help="Benchmark the fields of a database on their stored responses.")
+
+    def handle(self, *args, **options):
+        if options["database"]:
+            cases = self.get_database_cases(options["database"], options["count"])
+        else:
+            cases = build_synthetic_values(options["count"])
+
+        self.stdout.write(
+            f"{'field':<24} {'values':>8} {'deserialize':>12} {'many':>9} {'serialize':>11} {'many':>9}  (ms)"
+        )
+        for name, config, values in cases:
+            timings = [
+                self.measure(lambda: [config.deserialize_response_data(value) for value in values], options),
+                self.measure(lambda: config.deserialize_many(values), options),
+                self.measure(lambda: [config.serialize_response_data(value) for value in values], options),
+                self.measure(lambda: config.serialize_many(values), options),
+            ]
+            self.stdout.write(
+                f"{name:<24} {len(values):>8} {timings[0]:>12.1f} {timings[1]:>9.1f} {timings[2]:>11.1f} {timings[3]:>9.1f}"
+            )
+
+        dates = [
+            value for name, _, values in build_synthetic_values(options["count"]) if name == "date" for value in values
+        ]
+        self.stdout.write(
+            f"date parsing of {len(dates)} ISO values: "
+            f"dateutil {self.measure(lambda: [dateutil_parser.parse(value) for value in dates], options):.1f}ms, "
+            f"fast path {self.measure(lambda: DateFieldConfig().deserialize_many(dates), options):.1f}ms"
+        )
+
+    def get_database_cases(self, database_id, count):
+        cases = []
+        for field in get_database_schema(database_id).fields.values():
+            if field.config is None:
+                continue
+
+            data = FieldResponse.objects.filter(field=field).values_list("data", flat=True)[:count]
+            values = [item["value"] for item in data if isinstance(item, dict) and "value" in item]
+            cases.append((f"{field.label[:16]} ({field.field_type})", field.config, values))
+
+        return cases
+
+    def measure(self, fn, options):
+        best = None
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+
+        return best
@@ -0,0 +1,59 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.models import User
+from core.imports import DatabaseImporter
+from core.models import Database, DatabaseImport
+
+
+class Command(BaseCommand):
+    help = "Import pages into a database from a CSV or NDJSON file, with one column per field label or ID."
+
+    def add_arguments(self, parser):
+        parser.add_argument("database", help="The ID of the database to import into.")
+        parser.add_argument("path", help="The file to import.")
+        parser.add_argument(
+            "--format",
+            choices=DatabaseImport.Format.values,
+            help="The format of the file, guessed from its extension by default.",
+        )
+        parser.add_argument("--user", help="The email of the user the pages are created by.")
+        parser.add_argument("--workers", type=int, help="Worker processes parsing the file, 1 to parse in-process.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows parsed and copied at a time.")
+
+    def handle(self, *args, **options):
+        try:
+            database = Database.objects.get(pk=options["database"])
+        except (Database.DoesNotExist, ValueError):
+            raise CommandError(f"Database {options['database']} does not exist")
+
+        user = None
+        if options["user"]:
+            user = User.objects.filter(email=options["user"]).first()
+            if user is None:
+                raise CommandError(f"User {options['user']} does not exist")
+
+        file_format = options["format"]
+        if file_format is None:
+            is_ndjson = options["path"].lower().endswith((".ndjson", ".jsonl"))
+            file_format = DatabaseImport.Format.NDJSON if is_ndjson else DatabaseImport.Format.CSV
+
+        importer = DatabaseImporter(database, user, workers=options["workers"], chunk_size=options["chunk_size"])
+        started = time.monotonic()
+        with open(options["path"], encoding="utf-8-sig", newline="") as file:
+            result = importer.run(file, file_format)
+        elapsed = time.monotonic() - started
+
+        for rejected_row in result["rejected_rows"]:
+            self.stderr.write(f"Rejected row {rejected_row['row']}: {json.dumps(rejected_row['errors'])}")
+        for ignored_column in result["ignored_columns"]:
+            self.stderr.write(f"Ignored column {ignored_column['column']}: {ignored_column['reason']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['pages_created']} pages and {result['responses_created']} field responses "
+                f"in {elapsed:.1f}s, rejected {len(result['rejected_rows'])} rows"
+            )
+        )
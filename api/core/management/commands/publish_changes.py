@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.realtime import ChangePublisher
+
+
+class Command(BaseCommand):
+    help = "Publish the recorded page, response, field and view changes to the realtime channels of their databases."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.1,
+            help="Seconds to wait for changes to accumulate, bursts within it are published as one message.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Maximum number of changes per batch.")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Publishing realtime changes")
+        ChangePublisher(interval=options["interval"], batch_size=options["batch_size"]).run()
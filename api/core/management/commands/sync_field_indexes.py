@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core.indexes import sync_field_indexes
+from core.models import Database
+
+
+class Command(BaseCommand):
+    help = "Create the field response indexes needed by views, and drop the ones no view needs anymore."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", action="append", help="Only sync the given database ID(s).")
+
+    def handle(self, *args, **options):
+        databases = Database.objects.all()
+        if options["database"]:
+            databases = databases.filter(pk__in=options["database"])
+
+        for database_id in databases.values_list("pk", flat=True):
+            created, dropped = sync_field_indexes(database_id)
+            for name in created:
+                self.stdout.write(f"Created {name}")
+            for name in dropped:
+                self.stdout.write(f"Dropped {name}")
+
+        self.stdout.write(self.style.SUCCESS("Field indexes are in sync"))
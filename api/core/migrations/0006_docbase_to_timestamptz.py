@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:12
+
+from django.db import migrations
+
+# Casting text to timestamptz is only STABLE (it depends on the session time zone), so it cannot be
+# used in index expressions. Django always runs its connections in UTC, which makes the cast safe to
+# declare IMMUTABLE here. Unparseable values return NULL instead of failing the whole query.
+CREATE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION docbase_to_timestamptz(value text) RETURNS timestamptz AS $$
+BEGIN
+    RETURN value::timestamptz;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+"""
+
+DROP_FUNCTION_SQL = "DROP FUNCTION IF EXISTS docbase_to_timestamptz(text);"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_delete_folder"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FUNCTION_SQL, reverse_sql=DROP_FUNCTION_SQL),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:14
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+# Date values are now parsed once into `value_datetime`, so the JSON parsing helper from 0006 is no
+# longer used by queries. CASCADE also drops the managed date indexes built on it; run
+# `backfill_response_values` and then `sync_field_indexes` to rebuild them on the typed columns.
+DROP_FUNCTION_SQL = "DROP FUNCTION IF EXISTS docbase_to_timestamptz(text) CASCADE;"
+
+CREATE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION docbase_to_timestamptz(value text) RETURNS timestamptz AS $$
+BEGIN
+    RETURN value::timestamptz;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_docbase_to_timestamptz"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fieldresponse",
+            name="value_bool",
+            field=models.BooleanField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="fieldresponse",
+            name="value_datetime",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="fieldresponse",
+            name="value_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.UUIDField(), blank=True, editable=False, null=True, size=None
+            ),
+        ),
+        migrations.AddField(
+            model_name="fieldresponse",
+            name="value_number",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="fieldresponse",
+            name="value_text",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(DROP_FUNCTION_SQL, reverse_sql=CREATE_FUNCTION_SQL),
+    ]
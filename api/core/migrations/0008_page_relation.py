@@ -0,0 +1,67 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Build the edges of the existing relation responses from their JSON values, skipping IDs of pages
+# that no longer exist.
+BACKFILL_SQL = """
+INSERT INTO core_pagerelation (source_page_id, target_page_id, field_id)
+SELECT response.page_id, target_page.id, response.field_id
+FROM core_fieldresponse response
+JOIN core_field field ON field.id = response.field_id AND field.field_type = 'relation'
+CROSS JOIN LATERAL jsonb_array_elements_text(
+    CASE WHEN jsonb_typeof(response.data -> 'value') = 'array' THEN response.data -> 'value' ELSE '[]' END
+) AS item(value)
+JOIN core_page target_page ON target_page.id::text = item.value
+ON CONFLICT DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_fieldresponse_typed_values"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageRelation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "field",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="page_relations", to="core.field"
+                    ),
+                ),
+                (
+                    "source_page",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="outgoing_relations",
+                        to="core.page",
+                    ),
+                ),
+                (
+                    "target_page",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="incoming_relations",
+                        to="core.page",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["target_page", "field"], name="core_pagerelation_target_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pagerelation",
+            constraint=models.UniqueConstraint(
+                fields=("source_page", "field", "target_page"), name="unique_page_relation"
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_page_relation'),
+        ('organizations', '0003_created_at_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='database',
+            index=models.Index(fields=['created_at', 'id'], name='core_database_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='field',
+            index=models.Index(fields=['created_at', 'id'], name='core_field_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(fields=['created_at', 'id'], name='core_page_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='view',
+            index=models.Index(fields=['created_at', 'id'], name='core_view_created_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:34
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_created_at_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatabaseImport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('file', models.FileField(upload_to='imports')),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('ndjson', 'NDJSON')], default='csv', max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=255)),
+                ('pages_created', models.PositiveIntegerField(default=0)),
+                ('responses_created', models.PositiveIntegerField(default=0)),
+                ('ignored_columns', models.JSONField(blank=True, default=list)),
+                ('rejected_row_count', models.PositiveIntegerField(default=0)),
+                ('rejected_rows', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('database', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imports', to='core.database')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at', 'id'], name='core_import_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:43
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Same vector as `PageQuerySet.update_search_vectors`, filled before the index is built.
+BACKFILL_SQL = """
+UPDATE core_page
+SET search_vector =
+    setweight(to_tsvector('english'::regconfig, COALESCE(title, '')), 'A')
+    || setweight(to_tsvector('english'::regconfig, COALESCE(content, '')), 'B')
+    || setweight(
+        to_tsvector(
+            'english'::regconfig,
+            COALESCE(
+                (
+                    SELECT string_agg(response.value_text, ' ')
+                    FROM core_fieldresponse response
+                    WHERE response.page_id = core_page.id AND response.value_text IS NOT NULL
+                ),
+                ''
+            )
+        ),
+        'C'
+    )
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_database_import'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='page',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_page_search_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:20
+
+from django.db import migrations
+
+# Each typed column is only filled for the fields of its type, which the planner cannot know from
+# per-column statistics: filters on the values of a field were estimated at a fraction of their real
+# size, turning the joins of view queries and aggregations into per-page nested loops.
+CREATE_STATISTICS_SQL = """
+CREATE STATISTICS IF NOT EXISTS core_fieldresponse_number_stats (mcv)
+    ON field_id, value_number FROM core_fieldresponse;
+CREATE STATISTICS IF NOT EXISTS core_fieldresponse_datetime_stats (mcv)
+    ON field_id, value_datetime FROM core_fieldresponse;
+ANALYZE core_fieldresponse;
+"""
+
+DROP_STATISTICS_SQL = """
+DROP STATISTICS IF EXISTS core_fieldresponse_number_stats;
+DROP STATISTICS IF EXISTS core_fieldresponse_datetime_stats;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_STATISTICS_SQL, reverse_sql=DROP_STATISTICS_SQL),
+    ]
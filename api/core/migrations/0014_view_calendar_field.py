@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_fieldresponse_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='view',
+            name='calendar_field',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='calendar_views', to='core.field'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_view_calendar_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RealtimeChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('database_id', models.UUIDField()),
+                ('object_type', models.CharField(choices=[('page', 'Page'), ('field_response', 'Field Response'), ('field', 'Field'), ('view', 'View')], max_length=255)),
+                ('object_id', models.UUIDField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=255)),
+                ('page_id', models.UUIDField(blank=True, null=True)),
+                ('field_id', models.UUIDField(blank=True, null=True)),
+            ],
+        ),
+    ]
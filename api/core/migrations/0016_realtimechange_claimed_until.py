@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_realtimechange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='realtimechange',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,12 +1,31 @@
+import datetime
 import json
+import uuid
 
-from dateutil import parser
+from django.contrib.postgres.aggregates import StringAgg
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Func, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Left, TruncDate, TruncTime, Upper
+from django.utils import timezone
 
 from api.models import BaseModel
 
+from .codecs import encode_bool, encode_id_list, encode_number, encode_string, parse_datetime
+from .expressions import get_response_field_path
+from .lookups import (
+    TEXT_LOOKUPS,
+    build_comparison_filter,
+    build_list_filter,
+    clean_condition_value,
+    iter_filter_conditions,
+    unsupported_lookup,
+)
+from .validation import ResponseValidationContext, get_reference_ids, to_reference_id
+
 
 class Database(BaseModel):
     workspace = models.ForeignKey("organizations.Workspace", on_delete=models.CASCADE, related_name="databases")
@@ -15,6 +34,12 @@ class Database(BaseModel):
     description = models.TextField(blank=True)
     page_format_string = models.CharField(max_length=255, default="{name}")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="core_database_created_idx"),
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="core_database_name_trgm_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -52,11 +77,71 @@ class View(BaseModel):
     fields_order = ArrayField(models.UUIDField(), blank=True, default=list)
     sort_by = ArrayField(ArrayField(models.CharField(max_length=255), size=2), blank=True, default=list)
     filter_by = models.TextField(blank=True)
+    calendar_field = models.ForeignKey(
+        "core.Field", on_delete=models.SET_NULL, blank=True, null=True, related_name="calendar_views"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="core_view_created_idx"),
+            GinIndex(OpClass(Upper("label"), name="gin_trgm_ops"), name="core_view_label_trgm_idx"),
+        ]
+
+    def get_ordered_fields(self, fields):
+        if len(self.fields_order) == 0:
+            return list(fields)
+
+        positions = {field_id: index for index, field_id in enumerate(self.fields_order)}
+        return sorted(fields, key=lambda field: positions.get(field.pk, len(positions)))
+
+    def get_filter_definition(self):
+        if not self.filter_by.strip():
+            return None
+
+        try:
+            return json.loads(self.filter_by)
+        except json.JSONDecodeError:
+            raise ValidationError({"filter_by": "Filter must be valid JSON"})
+
+    def get_referenced_field_ids(self):
+        field_ids = set()
+
+        def collect(definition):
+            if isinstance(definition, list):
+                for condition in definition:
+                    collect(condition)
+            elif isinstance(definition, dict):
+                if "field" in definition:
+                    field_ids.add(str(definition["field"]))
+                collect(definition.get("conditions", []))
+
+        collect(self.get_filter_definition())
+        field_ids.update(str(sort[0]) for sort in self.sort_by if len(sort) > 0)
+        if self.calendar_field_id is not None:
+            field_ids.add(str(self.calendar_field_id))
+
+        return field_ids
 
     def __str__(self):
         return self.label
 
     def clean(self):
+        for condition in iter_filter_conditions(self.get_filter_definition()):
+            if "field" not in condition or "lookup" not in condition:
+                raise ValidationError({"filter_by": "Condition must have a 'field' and a 'lookup'"})
+
+            clean_condition_value(condition)
+
+        for sort in self.sort_by:
+            if len(sort) != 2 or sort[1] not in ["asc", "desc"]:
+                raise ValidationError({"sort_by": "Sort must be a [field, 'asc' | 'desc'] pair"})
+
+        if self.calendar_field_id is not None and (
+            self.calendar_field.database_id != self.database_id
+            or self.calendar_field.field_type != Field.FieldType.DATE
+        ):
+            raise ValidationError({"calendar_field": "Calendar field must be a date field of the view's database"})
+
         super().clean()
 
     def save(self, *args, **kwargs):
@@ -64,6 +149,41 @@ class View(BaseModel):
         super().save(*args, **kwargs)
 
 
+PAGE_SEARCH_CONFIG = "english"
+
+
+def get_page_text_values():
+    """
+    Returns:
+        - Subquery: The text field response values of the outer page, separated by spaces.
+    """
+    # Only text field configs fill `value_text`, so the field type does not need to be joined.
+    text_values = (
+        FieldResponse.objects.filter(page=OuterRef("pk"), value_text__isnull=False)
+        .order_by()
+        .values("page")
+        .annotate(text=StringAgg("value_text", " "))
+        .values("text")
+    )
+    return Coalesce(Subquery(text_values), models.Value(""), output_field=models.TextField())
+
+
+class PageQuerySet(models.QuerySet):
+    def update_search_vectors(self):
+        """
+        Recompute the full-text search vector of the pages, weighting their title, content and text
+        field responses from the most to the least relevant, with a single `UPDATE`.
+
+        Returns:
+            - int: The number of updated pages.
+        """
+        return self.update(
+            search_vector=SearchVector("title", weight="A", config=PAGE_SEARCH_CONFIG)
+            + SearchVector("content", weight="B", config=PAGE_SEARCH_CONFIG)
+            + SearchVector(get_page_text_values(), weight="C", config=PAGE_SEARCH_CONFIG)
+        )
+
+
 class Page(BaseModel):
     database = models.ForeignKey("core.Database", on_delete=models.CASCADE)
 
@@ -71,6 +191,18 @@ class Page(BaseModel):
     content = models.TextField(blank=True)
     attachments = models.ManyToManyField("core.Attachment", blank=True, related_name="pages")
 
+    # Maintained by `PageQuerySet.update_search_vectors` whenever the page or its text responses change.
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+
+    objects = PageQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="core_page_created_idx"),
+            GinIndex(fields=["search_vector"], name="core_page_search_idx"),
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="core_page_title_trgm_idx"),
+        ]
+
     @property
     def view(self):
         return View.objects.filter(database=self.database, view_type=View.ViewType.META_PAGE).first()
@@ -93,6 +225,18 @@ class Attachment(BaseModel):
         return self.file.name
 
 
+class FieldQuerySet(models.QuerySet):
+    def with_configs(self):
+        """
+        Load the config of every field in the same query, and the options of choice configs in one
+        extra query, so reading `Field.config` does not query per field.
+        """
+        return self.select_related(
+            *Field._config_field_map.values(),
+            "relation_config__related_field",
+        ).prefetch_related("choice_config__options")
+
+
 class Field(BaseModel):
     class FieldType(models.TextChoices):
         BOOLEAN = "boolean", "Boolean"
@@ -132,6 +276,13 @@ class Field(BaseModel):
     )
     text_config = models.OneToOneField("core.TextFieldConfig", on_delete=models.SET_NULL, blank=True, null=True)
 
+    objects = FieldQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="core_field_created_idx"),
+        ]
+
     @property
     def config_field_name(self):
         field_type_enum = Field.FieldType(self.field_type)
@@ -192,23 +343,44 @@ class BooleanFieldConfig(BaseModel):
     display_format = models.CharField(max_length=255, choices=DisplayFormat.choices, default=DisplayFormat.CHECKBOX)
     display_icon = models.CharField(max_length=255, choices=DisplayIcon.choices, default=None, blank=True, null=True)
 
+    response_value_column = "value_bool"
+    response_index_type = None
+
     @classmethod
     def create_default(cls, field):
         return BooleanFieldConfig.objects.create()
 
-    def validate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, bool):
             raise ValidationError({"data": "Value must be a boolean"})
 
-    def deserialize_response_data(self, data):
+    def deserialize_response_data(self, data, context=None):
         if isinstance(data, str):
             return data.lower().strip() in ["true", "1", "yes"]
 
         return bool(data)
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
-        return json.dumps(obj)
+    def deserialize_many(self, values, context=None):
+        return [self.deserialize_response_data(value) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        return [encode_bool(obj) for obj in self.deserialize_many(values)]
+
+    def get_typed_response_value(self, data):
+        return self.deserialize_response_data(data)
+
+    def get_value_expression(self, response_path):
+        return Coalesce(F(get_response_field_path(response_path, self.response_value_column)), False)
+
+    def get_sort_expression(self, response_path):
+        return self.get_value_expression(response_path)
+
+    def get_filter(self, value_path, lookup, value):
+        value = self.deserialize_response_data(value)
+        return build_comparison_filter(value_path, lookup, value, lookups={"eq": "exact"})
 
     def clean(self):
         if self.display_format == BooleanFieldConfig.DisplayFormat.ICON and self.display_icon is None:
@@ -236,11 +408,14 @@ class ChecklistFieldConfig(BaseModel):
     display_format = models.CharField(max_length=255, choices=DisplayFormat.choices, default=DisplayFormat.CHECKBOX)
     status_format = models.CharField(max_length=255, choices=StatusFormat.choices, default=StatusFormat.PROGRESS_BAR)
 
+    response_value_column = "value_number"
+    response_index_type = "btree"
+
     @classmethod
     def create_default(cls, field):
         return ChecklistFieldConfig.objects.create()
 
-    def validate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, list):
             raise ValidationError({"data": "Value must be a list"})
 
@@ -257,31 +432,64 @@ class ChecklistFieldConfig(BaseModel):
             if "is_checked" in item and not isinstance(item["is_checked"], bool):
                 raise ValidationError({"data": "Item is_checked must be a boolean"})
 
-    def deserialize_response_data(self, data):
+    def deserialize_response_data(self, data, context=None):
         if not isinstance(data, list):
             data = [data]
 
+        items = []
         for item in data:
             if not isinstance(item, dict):
                 item = {"value": item, "is_checked": False}
 
-            if "value" not in item:
-                item["value"] = ""
+            items.append({**item, "value": str(item.get("value", "")), "is_checked": bool(item.get("is_checked"))})
 
-            if "is_checked" not in item:
-                item["is_checked"] = False
+        return items
+
+    def deserialize_many(self, values, context=None):
+        return [self.deserialize_response_data(value) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        serialized = []
+        for items in self.deserialize_many(values):
+            if all(len(item) == 2 for item in items):
+                encoded_items = [
+                    f'{{"value": {encode_string(item["value"])}, "is_checked": {encode_bool(item["is_checked"])}}}'
+                    for item in items
+                ]
+                serialized.append("[" + ", ".join(encoded_items) + "]")
+            else:
+                serialized.append(json.dumps(items))
+
+        return serialized
+
+    def get_typed_response_value(self, data):
+        items = self.deserialize_response_data(data)
+        if len(items) == 0:
+            return None
+
+        checked_items = [item for item in items if item["is_checked"]]
+        return len(checked_items) / len(items)
+
+    def get_value_expression(self, response_path):
+        return F(get_response_field_path(response_path, self.response_value_column))
 
-            if not isinstance(item["value"], str):
-                item["value"] = str(item["value"])
+    def get_sort_expression(self, response_path):
+        return self.get_value_expression(response_path)
 
-            if not isinstance(item["is_checked"], bool):
-                item["is_checked"] = bool(item["is_checked"])
+    def get_filter(self, value_path, lookup, value):
+        if lookup == "is_complete":
+            return Q(**{value_path: 1})
 
-        return data
+        if lookup == "is_incomplete":
+            return Q(**{f"{value_path}__lt": 1})
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
-        return json.dumps(obj)
+        if lookup in ["is_empty", "is_not_empty"]:
+            return build_comparison_filter(value_path, lookup, value)
+
+        raise unsupported_lookup(lookup)
 
     def clean(self):
         super().clean()
@@ -300,11 +508,14 @@ class ChoiceFieldConfig(BaseModel):
     display_format = models.CharField(max_length=255, choices=DisplayFormat.choices, default=DisplayFormat.DROPDOWN)
     is_multi_select = models.BooleanField(default=False)
 
+    response_value_column = "value_ids"
+    response_index_type = "gin"
+
     @classmethod
     def create_default(cls, field):
         return ChoiceFieldConfig.objects.create()
 
-    def validate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, list):
             raise ValidationError({"data": "Value must be a list"})
 
@@ -315,38 +526,55 @@ class ChoiceFieldConfig(BaseModel):
             if not isinstance(item, str):
                 raise ValidationError({"data": "Item must be a list of strings"})
 
-            choice = ChoiceFieldOption.objects.filter(field_config=self, pk=item)
-            if not choice.exists():
-                raise ValidationError({"data": "Item must be a list of choice IDs"})
+        options = self.resolve_response_references(get_reference_ids(data), context or ResponseValidationContext())
+        invalid_items = [item for item in data if to_reference_id(item) not in options]
+        if len(invalid_items) > 0:
+            raise ValidationError(
+                {"data": f"Items must be choice IDs of the field config: {', '.join(invalid_items)}"}
+            )
 
-            found_choice = choice.first()
-            if found_choice and found_choice.field_config != self:
-                raise ValidationError({"data": "Choice must belong to the field config"})
+    def resolve_response_references(self, ids, context):
+        options = context.get_choice_options(self)
+        return {pk: options[pk] for pk in ids if pk in options}
 
-    def deserialize_response_data(self, data):
+    def deserialize_response_data(self, data, context=None):
         if not isinstance(data, list):
             data = [data]
 
-        for item in data:
-            if not isinstance(item, str):
-                item = str(item)
+        options = self.resolve_response_references(get_reference_ids(data), context or ResponseValidationContext())
+        return [options.get(to_reference_id(item)) for item in data]
 
-            item_model = ChoiceFieldOption.objects.filter(field_config=self, pk=item)
-            if item_model.exists():
-                item = item_model.first()
-            else:
-                item = None
+    def deserialize_many(self, values, context=None):
+        context = context or ResponseValidationContext()
+        values = [value if isinstance(value, list) else [value] for value in values]
+        context.prefetch(self, values)
+        return [self.deserialize_response_data(value, context) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        return [
+            encode_id_list(item.pk for item in obj if item is not None)
+            for obj in self.deserialize_many(values, context)
+        ]
+
+    def get_typed_response_value(self, data):
+        if not isinstance(data, list):
+            data = [data]
 
-        return data
+        return [uuid.UUID(str(item)) for item in data if item is not None]
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
+    def get_value_expression(self, response_path):
+        return F(get_response_field_path(response_path, self.response_value_column))
 
-        for item in obj:
-            if item is not None:
-                item = item.pk
+    def get_sort_expression(self, response_path):
+        first_option = OuterRef(f"{get_response_field_path(response_path, self.response_value_column)}__0")
+        options = ChoiceFieldOption.objects.filter(field_config=self, pk=first_option)
+        return Subquery(options.values("label")[:1])
 
-        return json.dumps(obj)
+    def get_filter(self, value_path, lookup, value):
+        return build_list_filter(value_path, lookup, value)
 
     def clean(self):
         if self.is_multi_select and self.display_format == ChoiceFieldConfig.DisplayFormat.RADIO:
@@ -376,21 +604,62 @@ class DateFieldConfig(BaseModel):
 
     display_format = models.CharField(max_length=255, choices=DisplayFormat.choices, default=DisplayFormat.DATE)
 
+    response_value_column = "value_datetime"
+    response_index_type = "btree"
+
     @classmethod
     def create_default(cls, field):
         return DateFieldConfig.objects.create()
 
-    def validate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, str):
             raise ValidationError({"data": "Value must be a string"})
 
-    def deserialize_response_data(self, data):
-        return parser.parse(data)
+    def deserialize_response_data(self, data, context=None):
+        return parse_datetime(data)
+
+    def deserialize_many(self, values, context=None):
+        return [parse_datetime(value) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        return [f'"{obj.isoformat()}"' for obj in self.deserialize_many(values)]
+
+    def get_typed_response_value(self, data):
+        value = self.deserialize_response_data(data)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, datetime.timezone.utc)
+
+        return value
+
+    def get_value_expression(self, response_path):
+        value = F(get_response_field_path(response_path, self.response_value_column))
+
+        # Dates and times are taken in UTC rather than in the active timezone, so the expression stays
+        # the one of the field's index and pages do not move between days with the request.
+        if self.display_format == DateFieldConfig.DisplayFormat.DATE:
+            return TruncDate(value, tzinfo=datetime.timezone.utc)
+
+        if self.display_format == DateFieldConfig.DisplayFormat.TIME:
+            return TruncTime(value, tzinfo=datetime.timezone.utc)
+
+        return value
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
-        iso_date = obj.isoformat()
-        return json.dumps(iso_date)
+    def get_sort_expression(self, response_path):
+        return self.get_value_expression(response_path)
+
+    def get_filter(self, value_path, lookup, value):
+        if value is not None:
+            value = self.get_typed_response_value(value).astimezone(datetime.timezone.utc)
+
+            if self.display_format == DateFieldConfig.DisplayFormat.DATE:
+                value = value.date()
+            elif self.display_format == DateFieldConfig.DisplayFormat.TIME:
+                value = value.time()
+
+        return build_comparison_filter(value_path, lookup, value)
 
 
 class FileFieldConfig(BaseModel):
@@ -404,13 +673,16 @@ class FileFieldConfig(BaseModel):
     supported_file_types = ArrayField(models.CharField(max_length=255), blank=True, default=list)
     allow_multiple = models.BooleanField(default=False)
 
+    response_value_column = "value_ids"
+    response_index_type = "gin"
+
     @classmethod
     def create_default(cls, field):
         return FileFieldConfig.objects.create(
             supported_file_types=[FileFieldConfig.FileType.ALL],
         )
 
-    def valiate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, list):
             raise ValidationError({"data": "Value must be a list"})
 
@@ -418,34 +690,51 @@ class FileFieldConfig(BaseModel):
             if not isinstance(item, str):
                 raise ValidationError({"data": "Item must be a string"})
 
-            attachment = Attachment.objects.filter(pk=item)
-            if not attachment.exists():
-                raise ValidationError({"data": "Item must be a valid attachment ID"})
+        attachments = self.resolve_response_references(get_reference_ids(data), context or ResponseValidationContext())
+        invalid_items = [item for item in data if to_reference_id(item) not in attachments]
+        if len(invalid_items) > 0:
+            raise ValidationError({"data": f"Items must be valid attachment IDs: {', '.join(invalid_items)}"})
+
+    def resolve_response_references(self, ids, context):
+        return context.get_objects("attachment", Attachment.objects.all(), ids)
 
-    def deserialize_response_data(self, data):
+    def deserialize_response_data(self, data, context=None):
         if not isinstance(data, list):
             data = [data]
 
-        for item in data:
-            if not isinstance(item, str):
-                item = str(item)
+        attachments = self.resolve_response_references(get_reference_ids(data), context or ResponseValidationContext())
+        return [attachments.get(to_reference_id(item)) for item in data]
 
-            attachment = Attachment.objects.filter(pk=item)
-            if attachment.exists():
-                item = attachment.first()
-            else:
-                item = None
+    def deserialize_many(self, values, context=None):
+        context = context or ResponseValidationContext()
+        values = [value if isinstance(value, list) else [value] for value in values]
+        context.prefetch(self, values)
+        return [self.deserialize_response_data(value, context) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        return [
+            encode_id_list(item.pk for item in obj if item is not None)
+            for obj in self.deserialize_many(values, context)
+        ]
 
-        return data
+    def get_typed_response_value(self, data):
+        if not isinstance(data, list):
+            data = [data]
+
+        return [uuid.UUID(str(item)) for item in data if item is not None]
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
+    def get_value_expression(self, response_path):
+        return F(get_response_field_path(response_path, self.response_value_column))
 
-        for item in obj:
-            if item is not None:
-                item = item.pk
+    def get_sort_expression(self, response_path):
+        value = self.get_value_expression(response_path)
+        return Func(value, function="cardinality", output_field=models.IntegerField())
 
-        return json.dumps(obj)
+    def get_filter(self, value_path, lookup, value):
+        return build_list_filter(value_path, lookup, value)
 
     def clean(self):
         if len(self.supported_file_types) == 0:
@@ -473,15 +762,18 @@ class NumberFieldConfig(BaseModel):
 
     display_format = models.CharField(max_length=255, choices=DisplayFormat.choices, default=DisplayFormat.DECIMAL)
 
+    response_value_column = "value_number"
+    response_index_type = "btree"
+
     @classmethod
     def create_default(cls, field):
         return NumberFieldConfig.objects.create()
 
-    def validate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, (int, float)):
             raise ValidationError({"data": "Value must be a number"})
 
-    def deserialize_response_data(self, data):
+    def deserialize_response_data(self, data, context=None):
         if self.display_format == NumberFieldConfig.DisplayFormat.INTEGER:
             return int(data)
 
@@ -490,20 +782,43 @@ class NumberFieldConfig(BaseModel):
 
         return float(data)
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
-        return json.dumps(obj)
+    def deserialize_many(self, values, context=None):
+        return [self.deserialize_response_data(value) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        return [encode_number(obj) for obj in self.deserialize_many(values)]
+
+    def get_typed_response_value(self, data):
+        return self.deserialize_response_data(data)
+
+    def get_value_expression(self, response_path):
+        return F(get_response_field_path(response_path, self.response_value_column))
+
+    def get_sort_expression(self, response_path):
+        return self.get_value_expression(response_path)
+
+    def get_filter(self, value_path, lookup, value):
+        if value is not None:
+            value = self.deserialize_response_data(value)
+
+        return build_comparison_filter(value_path, lookup, value)
 
 
 class RelationFieldConfig(BaseModel):
     source_field = models.ForeignKey("core.Field", on_delete=models.CASCADE, related_name="source_relations")
     related_field = models.ForeignKey("core.Field", on_delete=models.CASCADE, related_name="related_relations")
 
+    response_value_column = "value_ids"
+    response_index_type = "gin"
+
     @classmethod
     def create_default(cls, field):
         return None
 
-    def validate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, list):
             raise ValidationError({"data": "Value must be a list"})
 
@@ -511,38 +826,54 @@ class RelationFieldConfig(BaseModel):
             if not isinstance(item, str):
                 raise ValidationError({"data": "Item must be a Page ID"})
 
-            page = Page.objects.filter(pk=item)
-            if not page.exists():
-                raise ValidationError({"data": "Item must be a Page ID"})
+        pages = self.resolve_response_references(get_reference_ids(data), context or ResponseValidationContext())
+        invalid_items = [item for item in data if to_reference_id(item) not in pages]
+        if len(invalid_items) > 0:
+            raise ValidationError(
+                {"data": f"Items must be Page IDs of the related database: {', '.join(invalid_items)}"}
+            )
 
-            found_page = page.first()
-            if found_page and found_page.database != self.related_field.database:
-                raise ValidationError({"data": "Page ID must belong to the related database"})
+    def resolve_response_references(self, ids, context):
+        database_id = self.related_field.database_id
+        return context.get_objects(("page", database_id), Page.objects.filter(database_id=database_id), ids)
 
-    def deserialize_response_data(self, data):
+    def deserialize_response_data(self, data, context=None):
         if not isinstance(data, list):
             data = [data]
 
-        for item in data:
-            if not isinstance(item, str):
-                item = str(item)
+        pages = self.resolve_response_references(get_reference_ids(data), context or ResponseValidationContext())
+        return [pages.get(to_reference_id(item)) for item in data]
 
-            page = Page.objects.filter(pk=item)
-            if page.exists():
-                item = page.first()
-            else:
-                item = None
+    def deserialize_many(self, values, context=None):
+        context = context or ResponseValidationContext()
+        values = [value if isinstance(value, list) else [value] for value in values]
+        context.prefetch(self, values)
+        return [self.deserialize_response_data(value, context) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        return [
+            encode_id_list(item.pk for item in obj if item is not None)
+            for obj in self.deserialize_many(values, context)
+        ]
+
+    def get_typed_response_value(self, data):
+        if not isinstance(data, list):
+            data = [data]
 
-        return data
+        return [uuid.UUID(str(item)) for item in data if item is not None]
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
+    def get_value_expression(self, response_path):
+        return F(get_response_field_path(response_path, self.response_value_column))
 
-        for item in obj:
-            if item is not None:
-                item = item.pk
+    def get_sort_expression(self, response_path):
+        value = self.get_value_expression(response_path)
+        return Func(value, function="cardinality", output_field=models.IntegerField())
 
-        return json.dumps(obj)
+    def get_filter(self, value_path, lookup, value):
+        return build_list_filter(value_path, lookup, value)
 
     def clean(self):
         super().clean()
@@ -562,27 +893,101 @@ class TextFieldConfig(BaseModel):
 
     display_format = models.CharField(max_length=255, choices=DisplayFormat.choices, default=DisplayFormat.SINGLE_LINE)
 
+    response_value_column = "value_text"
+    response_index_type = "btree"
+    # Texts are sorted, and indexed, by their first characters only, a btree cannot hold rows over ~2.7KB.
+    sort_prefix_length = 255
+
     @classmethod
     def create_default(cls, field):
         return TextFieldConfig.objects.create()
 
-    def validate_response_data(self, data):
+    def validate_response_data(self, data, context=None):
         if not isinstance(data, str):
             raise ValidationError({"data": "Value must be a string"})
 
-    def deserialize_response_data(self, data):
+    def deserialize_response_data(self, data, context=None):
         return str(data)
 
-    def serialize_response_data(self, data):
-        obj = self.deserialize_response_data(data)
-        return json.dumps(obj)
+    def deserialize_many(self, values, context=None):
+        return [str(value) for value in values]
+
+    def serialize_response_data(self, data, context=None):
+        return self.serialize_many([data], context)[0]
+
+    def serialize_many(self, values, context=None):
+        return [encode_string(obj) for obj in self.deserialize_many(values)]
+
+    def get_typed_response_value(self, data):
+        return self.deserialize_response_data(data)
+
+    def get_value_expression(self, response_path):
+        return F(get_response_field_path(response_path, self.response_value_column))
+
+    def get_sort_expression(self, response_path):
+        return Left(self.get_value_expression(response_path), self.sort_prefix_length)
+
+    def get_filter(self, value_path, lookup, value):
+        if lookup == "is_empty":
+            return Q(**{f"{value_path}__isnull": True}) | Q(**{value_path: ""})
+
+        if lookup == "is_not_empty":
+            return Q(**{f"{value_path}__isnull": False}) & ~Q(**{value_path: ""})
+
+        return build_comparison_filter(value_path, lookup, self.deserialize_response_data(value), lookups=TEXT_LOOKUPS)
+
+
+class FieldResponseQuerySet(models.QuerySet):
+    def refresh_typed_values(self, chunk_size=1000):
+        """
+        Recompute the typed value columns of the responses from their JSON data, in chunks.
+
+        Parameters:
+            - chunk_size (int): The number of responses loaded and updated per transaction.
+
+        Returns:
+            - int: The number of updated responses.
+        """
+        config_paths = [f"field__{config_field_name}" for config_field_name in Field._config_field_map.values()]
+        responses = self.select_related(*config_paths).order_by("pk")
+
+        updated = 0
+        last_pk = None
+        while True:
+            chunk = responses if last_pk is None else responses.filter(pk__gt=last_pk)
+            chunk = list(chunk[:chunk_size])
+            if len(chunk) == 0:
+                return updated
+
+            for response in chunk:
+                response.update_typed_values()
+
+            with transaction.atomic():
+                FieldResponse.objects.bulk_update(chunk, FieldResponse.TYPED_VALUE_COLUMNS)
+                PageRelation.objects.sync_responses(chunk)
+                Page.objects.filter(pk__in={response.page_id for response in chunk}).update_search_vectors()
+
+            updated += len(chunk)
+            last_pk = chunk[-1].pk
 
 
 class FieldResponse(BaseModel):
+    TYPED_VALUE_COLUMNS = ["value_number", "value_datetime", "value_text", "value_bool", "value_ids"]
+
     page = models.ForeignKey("core.Page", on_delete=models.CASCADE)
     field = models.ForeignKey("core.Field", on_delete=models.CASCADE)
     data = models.JSONField(default=dict)
 
+    # Typed copies of `data["value"]`, filled from the field config on save, so filters, sorts and
+    # aggregations can use plain sargable columns instead of extracting and casting JSON.
+    value_number = models.FloatField(blank=True, null=True, editable=False)
+    value_datetime = models.DateTimeField(blank=True, null=True, editable=False)
+    value_text = models.TextField(blank=True, null=True, editable=False)
+    value_bool = models.BooleanField(blank=True, null=True, editable=False)
+    value_ids = ArrayField(models.UUIDField(), blank=True, null=True, editable=False)
+
+    objects = FieldResponseQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["page", "field"], name="unique_field_response"),
@@ -604,6 +1009,170 @@ class FieldResponse(BaseModel):
 
         super().clean()
 
+    def update_typed_values(self):
+        for column in FieldResponse.TYPED_VALUE_COLUMNS:
+            setattr(self, column, None)
+
+        config = self.field.config
+        if config is None or not isinstance(self.data, dict) or "value" not in self.data:
+            return
+
+        try:
+            value = config.get_typed_response_value(self.data["value"])
+        except (TypeError, ValueError, OverflowError):
+            return
+
+        setattr(self, config.response_value_column, value)
+
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.update_typed_values()
         super().save(*args, **kwargs)
+
+
+class PageRelationQuerySet(models.QuerySet):
+    def sync_responses(self, responses):
+        """
+        Replace the edges of the given responses with the pages their relation values point to.
+
+        Responses of other field types only get their edges removed, eg. after a field type change.
+
+        Parameters:
+            - responses (list[FieldResponse]): The saved responses, with their typed values filled.
+        """
+        if len(responses) == 0:
+            return
+
+        source_page_ids_by_field = {}
+        for response in responses:
+            source_page_ids_by_field.setdefault(response.field_id, set()).add(response.page_id)
+
+        sources = Q()
+        for field_id, source_page_ids in source_page_ids_by_field.items():
+            sources |= Q(field_id=field_id, source_page_id__in=source_page_ids)
+
+        edges = [
+            (response.page_id, target_page_id, response.field_id)
+            for response in responses
+            if response.field.field_type == Field.FieldType.RELATION
+            for target_page_id in response.value_ids or []
+        ]
+        target_page_ids = {target_page_id for _, target_page_id, _ in edges}
+        existing_page_ids = set(Page.objects.filter(pk__in=target_page_ids).values_list("pk", flat=True))
+
+        with transaction.atomic():
+            self.filter(sources).delete()
+            self.bulk_create(
+                [
+                    PageRelation(source_page_id=source_page_id, target_page_id=target_page_id, field_id=field_id)
+                    for source_page_id, target_page_id, field_id in edges
+                    if target_page_id in existing_page_ids
+                ],
+                ignore_conflicts=True,
+            )
+
+
+class PageRelation(models.Model):
+    """
+    An edge from a page to a page referenced by one of its relation field responses, maintained from
+    `FieldResponse` writes so links can be followed in both directions without reading JSON values.
+    """
+
+    # Both page columns are covered by the composite indexes below.
+    source_page = models.ForeignKey(
+        "core.Page", on_delete=models.CASCADE, related_name="outgoing_relations", db_index=False
+    )
+    target_page = models.ForeignKey(
+        "core.Page", on_delete=models.CASCADE, related_name="incoming_relations", db_index=False
+    )
+    field = models.ForeignKey("core.Field", on_delete=models.CASCADE, related_name="page_relations")
+
+    objects = PageRelationQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source_page", "field", "target_page"], name="unique_page_relation"),
+        ]
+        indexes = [
+            models.Index(fields=["target_page", "field"], name="core_pagerelation_target_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.source_page} -> {self.target_page}"
+
+
+class DatabaseImport(BaseModel):
+    """
+    A file of pages imported into a database in the background, with the outcome of the import.
+    """
+
+    MAX_REPORTED_REJECTED_ROWS = 1000
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        NDJSON = "ndjson", "NDJSON"
+
+    database = models.ForeignKey("core.Database", on_delete=models.CASCADE, related_name="imports")
+
+    file = models.FileField(upload_to="imports")
+    format = models.CharField(max_length=255, choices=Format.choices, default=Format.CSV)
+    status = models.CharField(max_length=255, choices=Status.choices, default=Status.PENDING)
+
+    pages_created = models.PositiveIntegerField(default=0)
+    responses_created = models.PositiveIntegerField(default=0)
+    ignored_columns = models.JSONField(default=list, blank=True)
+    rejected_row_count = models.PositiveIntegerField(default=0)
+    rejected_rows = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="core_import_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.database} - {self.file.name}"
+
+
+class RealtimeChange(models.Model):
+    """
+    A write to a page, response, field or view of a database, recorded in the transaction of the write
+    and published to the realtime channel of the database by the `publish_changes` worker.
+
+    Changes are claimed by a publisher until `claimed_until` while they are published, and deleted
+    once published. The database is not a foreign key, so the changes of a database deleted in the
+    meantime do not block its deletion.
+    """
+
+    class ObjectType(models.TextChoices):
+        PAGE = "page", "Page"
+        FIELD_RESPONSE = "field_response", "Field Response"
+        FIELD = "field", "Field"
+        VIEW = "view", "View"
+
+    class Action(models.TextChoices):
+        CREATED = "created", "Created"
+        UPDATED = "updated", "Updated"
+        DELETED = "deleted", "Deleted"
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    database_id = models.UUIDField()
+    object_type = models.CharField(max_length=255, choices=ObjectType.choices)
+    object_id = models.UUIDField()
+    action = models.CharField(max_length=255, choices=Action.choices)
+    # The page and field of responses, which clients locate cells by.
+    page_id = models.UUIDField(blank=True, null=True)
+    field_id = models.UUIDField(blank=True, null=True)
+    claimed_until = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.object_type} {self.object_id} {self.action}"
@@ -0,0 +1,65 @@
+import json
+import uuid
+from base64 import b64decode, b64encode
+
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
+
+from .queries import ViewBoardQuery
+
+
+class ViewPagesPagination(LimitOffsetPagination):
+    default_limit = 100
+    max_limit = 1000
+
+
+class PageSearchPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class BoardColumnPagination:
+    """
+    Cursors to load the following pages of a single column of a board.
+
+    A cursor holds the key of its column and the number of pages of the column already loaded. Pages
+    are sorted by the arbitrary `sort_by` of the view, so positions are offsets, like the pages of a
+    view, rather than keys.
+    """
+
+    cursor_query_param = "cursor"
+
+    def encode_cursor(self, column, offset):
+        return b64encode(json.dumps([str(column), offset]).encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """
+        Returns:
+            - tuple[UUID | str, int]: The column, a choice option ID or `ViewBoardQuery.EMPTY_COLUMN`,
+              and the number of pages to skip.
+
+        Raises:
+            - ValueError: When the cursor is invalid.
+        """
+        try:
+            column, offset = json.loads(b64decode(cursor.encode(), validate=True))
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("Invalid cursor")
+
+        if column == ViewBoardQuery.EMPTY_COLUMN:
+            return column, offset
+
+        return uuid.UUID(str(column)), offset
+
+    def get_next_link(self, request, column):
+        loaded = column["offset"] + len(column["pages"])
+        if loaded >= column["count"]:
+            return None
+
+        key = ViewBoardQuery.EMPTY_COLUMN if column["value"] is None else column["value"]
+        return replace_query_param(
+            request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(key, loaded)
+        )
@@ -0,0 +1,508 @@
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Case, Count, F, FilteredRelation, Max, Min, Q, Sum, UUIDField, When, Window
+from django.db.models.functions import RowNumber
+
+from .expressions import get_response_field_path
+from .lookups import PAGE_ATTRIBUTES, clean_condition_value
+from .models import DateFieldConfig, Field, Page
+from .schema import get_database_schema
+
+
+class ViewQuery:
+    """
+    Compile the `filter_by` and `sort_by` definitions of a view into a single query over its pages.
+
+    `filter_by` is a JSON encoded condition group:
+
+        {
+            "operator": "and" | "or",
+            "conditions": [
+                {"field": "<field id>", "lookup": "gt", "value": 10},
+                {"operator": "or", "conditions": [...]},
+            ],
+        }
+
+    A bare list of conditions is treated as an `and` group. `sort_by` is a list of
+    `[field, "asc" | "desc"]` pairs. Both accept a field ID or one of the page attributes
+    (`title`, `created_at`, `updated_at`).
+
+    Every referenced field is joined once to its `FieldResponse`, and the value expressions,
+    filters and sort expressions come from the field's config class.
+
+    Parameters:
+        - view (View): The view to compile.
+    """
+
+    PAGE_ATTRIBUTES = PAGE_ATTRIBUTES
+    OPERATORS = ["and", "or"]
+
+    def __init__(self, view):
+        self.view = view
+        self.fields = {str(field.pk): field for field in get_database_schema(view.database_id).fields.values()}
+        self._annotations = {}
+
+    def get_queryset(self):
+        condition = self._compile_filter(self.view.get_filter_definition())
+        ordering = self._compile_ordering(self.view.sort_by)
+
+        return self._build_queryset(condition).order_by(*ordering, "created_at", "id")
+
+    def _build_queryset(self, condition):
+        queryset = Page.objects.filter(database_id=self.view.database_id)
+
+        if len(self._annotations) > 0:
+            queryset = queryset.annotate(**self._annotations)
+
+        if condition is not None:
+            queryset = queryset.filter(condition)
+
+        return queryset
+
+    def _get_field(self, field_id, key="filter_by"):
+        field = self.fields.get(str(field_id))
+        if field is None:
+            raise ValidationError({key: f"Field '{field_id}' does not belong to the view's database"})
+
+        if field.config is None:
+            raise ValidationError({key: f"Field '{field_id}' is not configured"})
+
+        return field
+
+    def _get_response_path(self, field):
+        response_path = f"response_{field.pk.hex}"
+        if response_path not in self._annotations:
+            self._annotations[response_path] = FilteredRelation(
+                "fieldresponse",
+                condition=Q(fieldresponse__field=field),
+            )
+
+        return response_path
+
+    def _get_value_path(self, field):
+        value_path = f"value_{field.pk.hex}"
+        if value_path not in self._annotations:
+            response_path = self._get_response_path(field)
+            self._annotations[value_path] = field.config.get_value_expression(response_path)
+
+        return value_path
+
+    def _get_sort_path(self, field):
+        sort_path = f"sort_{field.pk.hex}"
+        if sort_path not in self._annotations:
+            response_path = self._get_response_path(field)
+            self._annotations[sort_path] = field.config.get_sort_expression(response_path)
+
+        return sort_path
+
+    def _compile_filter(self, definition):
+        if definition is None:
+            return None
+
+        if isinstance(definition, list):
+            definition = {"operator": "and", "conditions": definition}
+
+        if not isinstance(definition, dict):
+            raise ValidationError({"filter_by": "Filter must be a condition or a group of conditions"})
+
+        if "conditions" in definition:
+            return self._compile_group(definition)
+
+        return self._compile_condition(definition)
+
+    def _compile_group(self, group):
+        operator = group.get("operator", "and")
+        if operator not in self.OPERATORS:
+            raise ValidationError({"filter_by": f"Unsupported filter operator '{operator}'"})
+
+        conditions = [self._compile_filter(condition) for condition in group["conditions"]]
+        conditions = [condition for condition in conditions if condition is not None]
+        if len(conditions) == 0:
+            return None
+
+        combined = conditions[0]
+        for condition in conditions[1:]:
+            combined = combined & condition if operator == "and" else combined | condition
+
+        return combined
+
+    def _compile_condition(self, condition):
+        if "field" not in condition or "lookup" not in condition:
+            raise ValidationError({"filter_by": "Condition must have a 'field' and a 'lookup'"})
+
+        lookup = condition["lookup"]
+        value = clean_condition_value(condition)
+
+        if condition["field"] in self.PAGE_ATTRIBUTES:
+            return self._compile_page_attribute_condition(condition["field"], lookup, value)
+
+        field = self._get_field(condition["field"])
+        value_path = self._get_value_path(field)
+
+        try:
+            return field.config.get_filter(value_path, lookup, value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValidationError({"filter_by": f"Invalid value for field '{field.pk}'"})
+
+    def _compile_page_attribute_condition(self, attribute, lookup, value):
+        lookups = {
+            "eq": "iexact" if attribute == "title" else "exact",
+            "contains": "icontains",
+            "gt": "gt",
+            "gte": "gte",
+            "lt": "lt",
+            "lte": "lte",
+        }
+        if lookup not in lookups:
+            raise ValidationError({"filter_by": f"Unsupported filter lookup '{lookup}'"})
+
+        return Q(**{f"{attribute}__{lookups[lookup]}": value})
+
+    def _compile_ordering(self, sort_by):
+        ordering = []
+        for sort in sort_by:
+            if len(sort) != 2 or sort[1] not in ["asc", "desc"]:
+                raise ValidationError({"sort_by": "Sort must be a [field, 'asc' | 'desc'] pair"})
+
+            field_id, direction = sort
+            if field_id in self.PAGE_ATTRIBUTES:
+                expression = F(field_id)
+            else:
+                expression = F(self._get_sort_path(self._get_field(field_id)))
+
+            if direction == "desc":
+                ordering.append(expression.desc(nulls_last=True))
+            else:
+                ordering.append(expression.asc(nulls_last=True))
+
+        return ordering
+
+
+class ViewAggregateQuery(ViewQuery):
+    """
+    Aggregate the pages matching the `filter_by` of a view in a single query over the typed columns
+    of their responses.
+
+    `metrics` are `count` (pages), `count:<field>` (pages with a value), `sum:<field>`,
+    `avg:<field>` (number fields), `min:<field>` and `max:<field>` (number and date fields). Sums,
+    minimums and maximums follow the display format of number fields, eg. integers stay integers.
+
+    `group_by` is a choice or boolean field. Pages are grouped by the distinct values of the field in
+    SQL, then the groups are split by option in Python, so a page of a multi select is counted in
+    every option it has.
+
+    Parameters:
+        - view (View): The view to aggregate.
+        - metrics (list[str]): The metrics to compute.
+        - group_by (str | None): The ID of the field to group by.
+    """
+
+    AGGREGATES = ["count", "sum", "avg", "min", "max"]
+    NUMBER_AGGREGATES = ["sum", "avg"]
+    RANGE_AGGREGATES = ["min", "max"]
+    GROUP_FIELD_TYPES = [Field.FieldType.BOOLEAN, Field.FieldType.CHOICE]
+
+    def __init__(self, view, metrics, group_by=None):
+        super().__init__(view)
+        self.metrics = [self._parse_metric(metric) for metric in metrics]
+        self.group_field = self._get_group_field(group_by) if group_by else None
+
+    def get_results(self):
+        """
+        Returns:
+            - dict: The `metrics` of all matching pages, and when grouping, the `groups` as a list of
+              `{"value", "label", "metrics"}`, in the order of the choice options, pages without a
+              value last.
+        """
+        condition = self._compile_filter(self.view.get_filter_definition())
+        partials = self._get_partial_aggregates()
+
+        if self.group_field is None:
+            return {"metrics": self._get_metric_values(self._build_queryset(condition).aggregate(**partials))}
+
+        group_value = self.group_field.config.get_value_expression(self._get_response_path(self.group_field))
+        queryset = self._build_queryset(condition)
+        rows = list(queryset.values(group_value=group_value).annotate(**partials).order_by())
+
+        rows_by_group = {}
+        for row in rows:
+            for value in self._get_group_values(row.pop("group_value")):
+                rows_by_group.setdefault(value, []).append(row)
+
+        groups = [
+            {
+                "value": value,
+                "label": label,
+                "metrics": self._get_metric_values(self._merge(rows_by_group.get(value, []))),
+            }
+            for value, label in self._get_group_labels()
+        ]
+        if None in rows_by_group:
+            groups.append(
+                {"value": None, "label": None, "metrics": self._get_metric_values(self._merge(rows_by_group[None]))}
+            )
+
+        return {"metrics": self._get_metric_values(self._merge(rows)), "groups": groups}
+
+    def _parse_metric(self, metric):
+        aggregate, _, field_id = metric.partition(":")
+        if aggregate not in self.AGGREGATES:
+            raise ValidationError({"metrics": f"Unsupported aggregate '{aggregate}'"})
+
+        if not field_id:
+            if aggregate != "count":
+                raise ValidationError({"metrics": f"Aggregate '{aggregate}' requires a field"})
+
+            return metric, aggregate, None
+
+        field = self._get_field(field_id, key="metrics")
+        if aggregate in self.NUMBER_AGGREGATES and field.field_type != Field.FieldType.NUMBER:
+            raise ValidationError({"metrics": f"Aggregate '{aggregate}' requires a number field"})
+
+        if aggregate in self.RANGE_AGGREGATES and field.field_type not in [
+            Field.FieldType.NUMBER,
+            Field.FieldType.DATE,
+        ]:
+            raise ValidationError({"metrics": f"Aggregate '{aggregate}' requires a number or date field"})
+
+        return metric, aggregate, field
+
+    def _get_group_field(self, field_id):
+        field = self._get_field(field_id, key="group_by")
+        if field.field_type not in self.GROUP_FIELD_TYPES:
+            raise ValidationError({"group_by": "Pages can only be grouped by a choice or boolean field"})
+
+        return field
+
+    def _get_partial_aggregates(self):
+        # Averages are computed from sums and counts, so the partials of groups can be merged.
+        partials = {"pages": Count("pk")}
+        for _, aggregate, field in self.metrics:
+            if field is None:
+                continue
+
+            column = get_response_field_path(self._get_response_path(field), field.config.response_value_column)
+            partials[f"count_{field.pk.hex}"] = Count(column)
+            if aggregate in self.NUMBER_AGGREGATES:
+                partials[f"sum_{field.pk.hex}"] = Sum(column)
+            elif aggregate == "min":
+                partials[f"min_{field.pk.hex}"] = Min(column)
+            elif aggregate == "max":
+                partials[f"max_{field.pk.hex}"] = Max(column)
+
+        return partials
+
+    def _merge(self, rows):
+        merged = {"pages": 0}
+        for row in rows:
+            for key, value in row.items():
+                current = merged.get(key)
+                if value is None or current is None:
+                    merged[key] = current if value is None else value
+                elif key.startswith("min_"):
+                    merged[key] = min(current, value)
+                elif key.startswith("max_"):
+                    merged[key] = max(current, value)
+                else:
+                    merged[key] = current + value
+
+        return merged
+
+    def _get_metric_values(self, partials):
+        values = {}
+        for metric, aggregate, field in self.metrics:
+            if field is None:
+                values[metric] = partials.get("pages", 0)
+                continue
+
+            count = partials.get(f"count_{field.pk.hex}") or 0
+            if aggregate == "count":
+                values[metric] = count
+            elif aggregate == "avg":
+                values[metric] = partials[f"sum_{field.pk.hex}"] / count if count > 0 else None
+            else:
+                value = partials.get(f"{aggregate}_{field.pk.hex}")
+                if value is not None and field.field_type == Field.FieldType.NUMBER:
+                    value = field.config.deserialize_response_data(value)
+
+                values[metric] = value
+
+        return values
+
+    def _get_group_values(self, value):
+        if self.group_field.field_type == Field.FieldType.BOOLEAN:
+            return [value]
+
+        return value or [None]
+
+    def _get_group_labels(self):
+        if self.group_field.field_type == Field.FieldType.BOOLEAN:
+            return [(True, None), (False, None)]
+
+        options = sorted(self.group_field.config.options.all(), key=lambda option: option.created_at)
+        return [(option.pk, option.label) for option in options]
+
+
+class ViewBoardQuery(ViewQuery):
+    """
+    Fetch the pages matching the `filter_by` of a view as the columns of a board, one per option of a
+    choice field, sorted by the `sort_by` of the view within each column.
+
+    The first pages of every column and the size of the columns come from a single query, numbering
+    the pages of each column with `ROW_NUMBER() OVER (PARTITION BY <option>)`. Pages are placed in the
+    column of their first option, like choice fields are sorted. Pages whose first option has been
+    deleted are placed in the column of pages without an option.
+
+    Parameters:
+        - view (View): The view to fetch the pages of.
+        - group_by (str): The ID of the choice field to group pages by.
+    """
+
+    # Key of the column of pages without an option.
+    EMPTY_COLUMN = "empty"
+
+    def __init__(self, view, group_by):
+        super().__init__(view)
+        self.group_field = self._get_field(group_by, key="group_by")
+        if self.group_field.field_type != Field.FieldType.CHOICE:
+            raise ValidationError({"group_by": "Pages can only be grouped by a choice field"})
+
+    def get_columns(self, limit, column=None, offset=0):
+        """
+        Parameters:
+            - limit (int): The number of pages to fetch per column.
+            - column (UUID | str | None): Only fetch the pages of this option, or of `EMPTY_COLUMN`,
+              `offset` pages into the column.
+            - offset (int): The number of pages of the column to skip.
+
+        Returns:
+            - list[dict]: The columns as `{"value", "label", "count", "offset", "pages"}`, in the order of
+              the options of the field, then the column of pages without an option when not empty.
+              When fetching a single column, only that column.
+        """
+        condition = self._compile_filter(self.view.get_filter_definition())
+        ordering = self._compile_ordering(self.view.sort_by)
+        options = sorted(self.group_field.config.options.all(), key=lambda option: option.created_at)
+        response_path = self._get_response_path(self.group_field)
+        first_option_path = get_response_field_path(
+            response_path, f"{self.group_field.config.response_value_column}__0"
+        )
+        column_value = Case(
+            When(Q(**{f"{first_option_path}__in": [option.pk for option in options]}), then=F(first_option_path)),
+            default=None,
+            output_field=UUIDField(),
+        )
+
+        queryset = self._build_queryset(condition).annotate(board_column=column_value)
+        if column == self.EMPTY_COLUMN:
+            queryset = queryset.filter(board_column__isnull=True)
+        elif column is not None:
+            queryset = queryset.filter(board_column=column)
+
+        pages = list(
+            queryset.annotate(
+                board_position=Window(
+                    RowNumber(),
+                    partition_by=[F("board_column")],
+                    order_by=[*ordering, F("created_at").asc(), F("id").asc()],
+                ),
+                board_count=Window(Count("pk"), partition_by=[F("board_column")]),
+            )
+            .filter(board_position__gt=offset, board_position__lte=offset + limit)
+            .order_by("board_column", "board_position")
+        )
+
+        pages_by_column = {}
+        for page in pages:
+            pages_by_column.setdefault(page.board_column, []).append(page)
+
+        columns = [(option.pk, option.label) for option in options]
+        if column == self.EMPTY_COLUMN:
+            columns = [(None, None)]
+        elif column is not None:
+            columns = [(value, label) for value, label in columns if value == column]
+        elif None in pages_by_column:
+            columns.append((None, None))
+
+        return [
+            {
+                "value": value,
+                "label": label,
+                "count": pages_by_column[value][0].board_count if value in pages_by_column else 0,
+                "offset": offset,
+                "pages": pages_by_column.get(value, []),
+            }
+            for value, label in columns
+        ]
+
+
+class ViewCalendarQuery(ViewQuery):
+    """
+    Fetch the pages matching the `filter_by` of a view whose date falls in a window, by date.
+
+    The window is compared to the value expression of the date field, the expression its index is
+    built on (see `build_field_index`), so only the pages of the window are read:
+
+    - `DATE` values are calendar days, compared to the days from `start` to `end`.
+    - `DATE_TIME` values are instants, in the window from midnight of `start` to the end of `end`
+      in the given timezone.
+    - `TIME` values are times of day, `start` and `end` are times.
+
+    Parameters:
+        - view (View): The view to fetch the pages of.
+        - field_id (str | None): The ID of the date field, the `calendar_field` of the view by default.
+    """
+
+    def __init__(self, view, field_id=None):
+        super().__init__(view)
+        field_id = field_id or view.calendar_field_id
+        if field_id is None:
+            raise ValidationError({"field": "A date field is required"})
+
+        self.date_field = self._get_field(field_id, key="field")
+        if self.date_field.field_type != Field.FieldType.DATE:
+            raise ValidationError({"field": "Pages can only be placed on a calendar by a date field"})
+
+    def get_queryset(self, start, end, tz=datetime.timezone.utc):
+        """
+        Parameters:
+            - start (str): The first day, or time of day, of the window, in ISO format.
+            - end (str): The last day, or time of day, of the window, in ISO format.
+            - tz (tzinfo): The timezone of the days of `DATE_TIME` windows.
+
+        Returns:
+            - QuerySet[Page]: The pages in the window, by date, annotated with their `calendar_value`.
+        """
+        condition = self._compile_filter(self.view.get_filter_definition())
+        value_path = self._get_value_path(self.date_field)
+
+        return (
+            self._build_queryset(condition)
+            .filter(self._get_window_filter(value_path, start, end, tz))
+            .annotate(calendar_value=F(value_path))
+            .order_by(value_path, "created_at", "id")
+        )
+
+    def _get_window_filter(self, value_path, start, end, tz):
+        display_format = self.date_field.config.display_format
+        is_time = display_format == DateFieldConfig.DisplayFormat.TIME
+
+        bounds = {}
+        for key, value in [("start", start), ("end", end)]:
+            try:
+                bounds[key] = datetime.time.fromisoformat(value) if is_time else datetime.date.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValidationError({key: "Invalid time" if is_time else "Invalid date"})
+
+        if bounds["start"] > bounds["end"]:
+            raise ValidationError({"end": "End must not be before start"})
+
+        if display_format != DateFieldConfig.DisplayFormat.DATE_TIME:
+            return Q(**{f"{value_path}__gte": bounds["start"], f"{value_path}__lte": bounds["end"]})
+
+        window_start = datetime.datetime.combine(bounds["start"], datetime.time.min, tzinfo=tz)
+        window_end = datetime.datetime.combine(
+            bounds["end"] + datetime.timedelta(days=1), datetime.time.min, tzinfo=tz
+        )
+        return Q(**{f"{value_path}__gte": window_start, f"{value_path}__lt": window_end})
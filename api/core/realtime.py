@@ -0,0 +1,219 @@
+import datetime
+import logging
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.ably import get_ably_client
+
+from .models import Field, FieldResponse, Page, RealtimeChange, View
+
+logger = logging.getLogger(__name__)
+
+# Channels published to by a single batch request.
+MAX_BATCH_CHANNELS = 100
+# Larger bursts, eg. imports, are published as a single truncated message, telling clients to reload
+# the database instead of keeping messages under the size limit of Ably.
+MAX_MESSAGE_CHANGES = 100
+
+
+def get_database_channel(database_id):
+    return f"database:{database_id}"
+
+
+OBJECT_TYPES = {
+    Page: RealtimeChange.ObjectType.PAGE,
+    FieldResponse: RealtimeChange.ObjectType.FIELD_RESPONSE,
+    Field: RealtimeChange.ObjectType.FIELD,
+    View: RealtimeChange.ObjectType.VIEW,
+}
+
+
+def record_change(instance, database_id, action, **kwargs):
+    RealtimeChange.objects.create(
+        database_id=database_id,
+        object_type=OBJECT_TYPES[type(instance)],
+        object_id=instance.pk,
+        action=action,
+        **kwargs,
+    )
+
+
+def record_page_changes(page_ids, database_id, action=RealtimeChange.Action.CREATED):
+    """
+    Record the changes of pages written without signals, eg. by imports.
+
+    Parameters:
+        - page_ids (list[UUID]): The written pages.
+        - database_id (UUID): The database of the pages.
+        - action (RealtimeChange.Action): The action to record.
+    """
+    RealtimeChange.objects.bulk_create(
+        [
+            RealtimeChange(
+                database_id=database_id,
+                object_type=RealtimeChange.ObjectType.PAGE,
+                object_id=page_id,
+                action=action,
+            )
+            for page_id in page_ids
+        ]
+    )
+
+
+def record_response_changes(responses, database_id, action=RealtimeChange.Action.UPDATED):
+    """
+    Record the changes of responses written without signals, eg. by bulk writes.
+
+    Parameters:
+        - responses (list[FieldResponse]): The written responses.
+        - database_id (UUID): The database of the responses.
+        - action (RealtimeChange.Action): The action to record.
+    """
+    RealtimeChange.objects.bulk_create(
+        [
+            RealtimeChange(
+                database_id=database_id,
+                object_type=RealtimeChange.ObjectType.FIELD_RESPONSE,
+                object_id=response.pk,
+                action=action,
+                page_id=response.page_id,
+                field_id=response.field_id,
+            )
+            for response in responses
+        ]
+    )
+
+
+def coalesce_changes(changes):
+    """
+    Merge the changes of a burst into one message per database channel.
+
+    Every object is listed once. A deletion wins over the other actions of the object, and a creation
+    followed by updates is listed as a creation.
+
+    Parameters:
+        - changes (list[RealtimeChange]): The changes, in the order they were recorded.
+
+    Returns:
+        - dict[str, dict]: The message data of every channel.
+    """
+    objects_by_database = {}
+    for change in changes:
+        objects = objects_by_database.setdefault(change.database_id, {})
+        key = (change.object_type, change.object_id)
+        previous = objects.get(key)
+        action = change.action
+        if previous is not None and action == RealtimeChange.Action.UPDATED:
+            action = previous["action"]
+
+        objects[key] = {
+            "type": change.object_type,
+            "id": str(change.object_id),
+            "action": action,
+            **({"page": str(change.page_id)} if change.page_id is not None else {}),
+            **({"field": str(change.field_id)} if change.field_id is not None else {}),
+        }
+
+    messages = {}
+    for database_id, objects in objects_by_database.items():
+        if len(objects) > MAX_MESSAGE_CHANGES:
+            messages[get_database_channel(database_id)] = {"changes": [], "truncated": True}
+        else:
+            messages[get_database_channel(database_id)] = {"changes": list(objects.values()), "truncated": False}
+
+    return messages
+
+
+class ChangePublisher:
+    """
+    Publish recorded changes to the channels of their databases with batched Ably REST requests.
+
+    Changes are read every `interval` seconds, so a burst of writes, eg. cells edited in a row, is
+    published as a single message per database. A batch is claimed for `lease` seconds in a short
+    transaction, with `SKIP LOCKED`, so several publishers can run side by side without holding locks
+    or a transaction open during the Ably requests. Changes are only deleted once Ably accepted them,
+    a failed batch is released to be retried, and the changes of a publisher that died are claimed
+    again once their lease expired.
+
+    Parameters:
+        - interval (float): The seconds to wait for changes to accumulate between batches.
+        - batch_size (int): The maximum number of changes read per batch.
+        - retry_interval (float): The seconds to wait after a failed batch.
+        - client (AblyRestSync | None): The Ably client to publish with, the shared client by default.
+        - lease (float): The seconds a batch is claimed for.
+    """
+
+    MESSAGE_NAME = "changes"
+
+    def __init__(self, interval=0.1, batch_size=5000, retry_interval=5, client=None, lease=60):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.client = client or get_ably_client()
+        self.lease = lease
+
+    def claim(self):
+        """
+        Returns:
+            - list[RealtimeChange]: The oldest changes not claimed by another publisher, claimed for `lease`.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            changes = list(
+                RealtimeChange.objects.select_for_update(skip_locked=True)
+                .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+                .order_by("id")[: self.batch_size]
+            )
+            RealtimeChange.objects.filter(pk__in=[change.pk for change in changes]).update(
+                claimed_until=now + datetime.timedelta(seconds=self.lease)
+            )
+
+        return changes
+
+    def publish_pending(self):
+        """
+        Returns:
+            - int: The number of published changes.
+        """
+        changes = self.claim()
+        if len(changes) == 0:
+            return 0
+
+        claimed = RealtimeChange.objects.filter(pk__in=[change.pk for change in changes])
+        try:
+            messages = list(coalesce_changes(changes).items())
+            for start in range(0, len(messages), MAX_BATCH_CHANNELS):
+                self.publish_batch(messages[start : start + MAX_BATCH_CHANNELS])
+        except Exception:
+            claimed.update(claimed_until=None)
+            raise
+
+        claimed.delete()
+        return len(changes)
+
+    def publish_batch(self, messages):
+        body = [
+            {"channels": [channel], "messages": [{"name": self.MESSAGE_NAME, "data": data}]}
+            for channel, data in messages
+        ]
+        # The client refuses to send its key without TLS, which only local stand-ins of Ably accept.
+        self.client.http.post("/messages", body=body, skip_auth=not self.client.options.tls)
+
+    def run(self):
+        """
+        Publish changes until interrupted.
+        """
+        while True:
+            try:
+                published = self.publish_pending()
+            except Exception:
+                logger.exception("Failed to publish realtime changes")
+                time.sleep(self.retry_interval)
+                continue
+
+            # Full batches are followed right away, there are more changes waiting.
+            if published < self.batch_size:
+                time.sleep(self.interval)
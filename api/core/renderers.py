@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Selects `?format=csv` for export endpoints, which stream their own rows. Only error responses go
+    through `render`, written as `key,value` rows.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return ""
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        items = data.items() if isinstance(data, dict) else enumerate(data)
+        for key, value in items:
+            writer.writerow([key, value if isinstance(value, str) else json.dumps(value)])
+
+        return buffer.getvalue()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Selects `?format=ndjson` for export endpoints, which stream their own rows. Only error responses
+    go through `render`, written as a single JSON line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return ""
+
+        return json.dumps(data) + "\n"
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import uuid
+from collections.abc import Sequence
+
+from django.core.cache import cache
+
+from api.versions import bump_versions, get_versions
+
+from .queries import ViewQuery
+from .schema import get_database_schema_version
+
+RESULTS_CACHE_TIMEOUT = 60 * 60
+RESULTS_LOCK_TIMEOUT = 30
+
+# Larger result sets are queried a page at a time on every request, their cache entries would cost
+# more to transfer than the page of results they are read for.
+MAX_CACHED_RESULTS = 250_000
+
+
+class ViewResults(Sequence):
+    """
+    The ordered page IDs of a view, packed as 16 bytes per ID so a single page of results can be
+    read without decoding the rest.
+
+    Parameters:
+        - data (bytes): The concatenated bytes of the page IDs.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data) // 16
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("View result index out of range")
+
+        return uuid.UUID(bytes=self.data[index * 16 : (index + 1) * 16])
+
+
+def get_pages_version_key(database_id):
+    return f"core:view_results:{database_id}:pages"
+
+
+def get_field_version_key(field_id):
+    return f"core:view_results:field:{field_id}"
+
+
+def get_view_results_key(view):
+    """
+    Get the cache key of the results of a view.
+
+    The key covers the filter and sort of the view, the schema of its database, the version of the
+    pages of the database, and the version of every field the view filters or sorts on. Writes only
+    bump the versions of what they changed, so a response written to a field leaves the results of
+    the views that do not reference the field cached.
+
+    Parameters:
+        - view (View): The view.
+
+    Returns:
+        - str: The cache key.
+    """
+    field_ids = sorted(view.get_referenced_field_ids())
+    versions = get_versions(
+        [get_pages_version_key(view.database_id), *(get_field_version_key(field_id) for field_id in field_ids)]
+    )
+    definition = json.dumps(
+        [view.filter_by, view.sort_by, get_database_schema_version(view.database_id), field_ids, versions],
+        default=str,
+    )
+
+    return f"core:view_results:{view.pk}:{hashlib.sha256(definition.encode()).hexdigest()}"
+
+
+def get_view_results(view):
+    """
+    Get the ordered page IDs of a view from the cache, computing and caching them on a miss.
+
+    Only one request computes and caches a missing result set at a time. The others query the page
+    they need on their own meanwhile, rather than waiting for it. A lock left by a failed request
+    expires after `RESULTS_LOCK_TIMEOUT` seconds.
+
+    Parameters:
+        - view (View): The view.
+
+    Returns:
+        - Sequence[UUID]: The page IDs, in the order of the view. Result sets larger than
+          `MAX_CACHED_RESULTS` are returned as a lazy queryset of page IDs.
+
+    Raises:
+        - ValidationError: When the filter or sort of the view is invalid.
+    """
+    key = get_view_results_key(view)
+    page_ids = ViewQuery(view).get_queryset().values_list("pk", flat=True)
+
+    data = cache.get(key)
+    if data is None:
+        lock_key = f"{key}:lock"
+        if not cache.add(lock_key, True, timeout=RESULTS_LOCK_TIMEOUT):
+            return page_ids
+
+        try:
+            data = _cache_view_results(key, page_ids)
+        finally:
+            cache.delete(lock_key)
+
+    # Too large result sets are marked so they are queried a page at a time without taking the lock.
+    if data is False:
+        return page_ids
+
+    return ViewResults(data)
+
+
+def _cache_view_results(key, page_ids):
+    page_ids = list(page_ids[: MAX_CACHED_RESULTS + 1])
+    data = False if len(page_ids) > MAX_CACHED_RESULTS else b"".join(page_id.bytes for page_id in page_ids)
+    cache.set(key, data, timeout=RESULTS_CACHE_TIMEOUT)
+    return data
+
+
+def bump_pages_version(database_id):
+    bump_versions([get_pages_version_key(database_id)])
+
+
+def bump_field_versions(field_ids):
+    bump_versions([get_field_version_key(field_id) for field_id in field_ids])
@@ -0,0 +1,97 @@
+import uuid
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from api.versions import bump_versions, get_version
+
+from .models import Field, View
+
+SCHEMA_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+@dataclass(frozen=True)
+class DatabaseSchema:
+    """
+    A compiled, read-only snapshot of the structure of a database: its fields with their configs and
+    choice options, and the ordered fields of each of its views.
+
+    Schemas are shared through the cache, so the fields they hold must not be modified.
+
+    Parameters:
+        - database_id (UUID): The database the schema describes.
+        - fields (dict[UUID, Field]): The fields of the database, with their configs loaded.
+        - view_field_ids (dict[UUID, tuple[UUID]]): The ordered field IDs of every view.
+        - meta_page_view_id (UUID | None): The view that defines the fields displayed on pages.
+    """
+
+    database_id: uuid.UUID
+    fields: dict
+    view_field_ids: dict
+    meta_page_view_id: uuid.UUID | None
+
+    def get_field(self, field_id) -> Field | None:
+        return self.fields.get(field_id)
+
+    def get_view_fields(self, view_id) -> list[Field]:
+        return [self.fields[field_id] for field_id in self.view_field_ids.get(view_id, ())]
+
+    def get_page_fields(self) -> list[Field]:
+        return self.get_view_fields(self.meta_page_view_id)
+
+
+def build_database_schema(database_id):
+    fields = {field.pk: field for field in Field.objects.filter(database_id=database_id).with_configs()}
+
+    views = list(View.objects.filter(database_id=database_id).order_by("created_at"))
+    view_fields = {view.pk: [] for view in views}
+    view_field_links = View.fields.through.objects.filter(view__database_id=database_id)
+    for view_id, field_id in view_field_links.values_list("view_id", "field_id"):
+        if field_id in fields:
+            view_fields[view_id].append(fields[field_id])
+
+    view_field_ids = {
+        view.pk: tuple(field.pk for field in view.get_ordered_fields(view_fields[view.pk])) for view in views
+    }
+    meta_page_view_id = next((view.pk for view in views if view.view_type == View.ViewType.META_PAGE), None)
+
+    return DatabaseSchema(
+        database_id=database_id,
+        fields=fields,
+        view_field_ids=view_field_ids,
+        meta_page_view_id=meta_page_view_id,
+    )
+
+
+def get_schema_version_key(database_id):
+    return f"core:database_schema:{database_id}:version"
+
+
+def get_database_schema_version(database_id):
+    return get_version(get_schema_version_key(database_id))
+
+
+def get_database_schema(database_id):
+    """
+    Get the schema of a database from the cache, building and caching it on a miss.
+
+    Schemas are cached under the current version of their database, so bumping the version makes
+    every cached schema of the database unreachable at once.
+
+    Parameters:
+        - database_id (UUID): The database to get the schema of.
+
+    Returns:
+        - DatabaseSchema: The schema.
+    """
+    schema_key = f"core:database_schema:{database_id}:{get_database_schema_version(database_id)}"
+    schema = cache.get(schema_key)
+    if schema is None:
+        schema = build_database_schema(database_id)
+        cache.set(schema_key, schema, timeout=SCHEMA_CACHE_TIMEOUT)
+
+    return schema
+
+
+def bump_database_schema_version(database_id):
+    bump_versions([get_schema_version_key(database_id)])
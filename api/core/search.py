@@ -0,0 +1,113 @@
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+    TrigramWordSimilarity,
+)
+from django.db.models import CharField, F, Q, Value
+from django.db.models.functions import Concat, Greatest, Upper
+
+from organizations.memberships import get_workspace_ids
+
+from .models import PAGE_SEARCH_CONFIG, Database, Page, View, get_page_text_values
+
+HIGHLIGHT_OPTIONS = {"start_sel": "<mark>", "stop_sel": "</mark>", "config": PAGE_SEARCH_CONFIG}
+
+
+def search_pages(pages, text):
+    """
+    Full-text search pages by their title, content and text field responses.
+
+    Matching uses the GIN index over `Page.search_vector`. Headlines are computed by PostgreSQL once
+    the matches are ranked and limited, they are not HTML escaped.
+
+    Parameters:
+        - pages (QuerySet[Page]): The pages to search, eg. the pages of a workspace.
+        - text (str): The search, in web search syntax (`"quoted phrases"`, `or`, `-excluded`).
+
+    Returns:
+        - QuerySet[Page]: The matching pages, most relevant first, annotated with their `rank`, and
+          with a highlighted `title_highlight` and `snippet`.
+    """
+    query = SearchQuery(text, search_type="websearch", config=PAGE_SEARCH_CONFIG)
+    return (
+        pages.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            title_highlight=SearchHeadline("title", query, **HIGHLIGHT_OPTIONS),
+            snippet=SearchHeadline(
+                Concat("content", Value(" "), get_page_text_values()),
+                query,
+                max_fragments=2,
+                **HIGHLIGHT_OPTIONS,
+            ),
+        )
+        .order_by("-rank", "-created_at", "-id")
+    )
+
+
+def _quick_switch_matches(queryset, kind, label_field, database_field, text, limit):
+    # Every lookup is served by the trigram GIN index of the upper cased label, which `icontains`
+    # compares: word similarity matches the start of a name being typed, similarity matches typos
+    # across words, and substrings catch queries too short to share trigrams with the label.
+    # Matching all rows in a subquery keeps the planner from scanning a large workspace through its
+    # foreign key index and evaluating the trigram operators on every row.
+    matches = (
+        queryset.model.objects.alias(match_key=Upper(label_field))
+        .filter(
+            Q(**{f"{label_field}__icontains": text})
+            | Q(match_key__trigram_word_similar=text)
+            | Q(match_key__trigram_similar=text)
+        )
+        .values("pk")
+    )
+    return (
+        queryset.filter(pk__in=matches)
+        .annotate(
+            match_kind=Value(kind, output_field=CharField()),
+            match_label=F(label_field),
+            match_database=F(database_field),
+            match_score=Greatest(TrigramWordSimilarity(text, label_field), TrigramSimilarity(label_field, text)),
+        )
+        .order_by("-match_score", "pk")
+        .values_list("pk", "match_kind", "match_label", "match_database", "match_score")[:limit]
+    )
+
+
+def quick_switch(user, text, limit=10):
+    """
+    Fuzzy match the databases, views and pages of the workspaces of a user by name, label and title.
+
+    The best matches of each kind are found through trigram GIN indexes, and combined by a single
+    `UNION ALL` query, so it is cheap enough to run on every keystroke.
+
+    Parameters:
+        - user (User): The user, only their workspaces are searched.
+        - text (str): The partial name to match.
+        - limit (int): The number of matches to return.
+
+    Returns:
+        - list[dict]: The matches, best first, as `{"type", "id", "label", "database", "score"}`.
+    """
+    workspace_ids = get_workspace_ids(user)
+    databases = _quick_switch_matches(
+        Database.objects.filter(workspace_id__in=workspace_ids), "database", "name", "pk", text, limit
+    )
+    views = _quick_switch_matches(
+        View.objects.filter(database__workspace_id__in=workspace_ids).exclude(view_type=View.ViewType.META_PAGE),
+        "view",
+        "label",
+        "database_id",
+        text,
+        limit,
+    )
+    pages = _quick_switch_matches(
+        Page.objects.filter(database__workspace_id__in=workspace_ids), "page", "title", "database_id", text, limit
+    )
+
+    matches = databases.union(views, pages, all=True).order_by("-match_score")[:limit]
+    return [
+        {"type": kind, "id": pk, "label": label, "database": database_id, "score": score}
+        for pk, kind, label, database_id, score in matches
+    ]
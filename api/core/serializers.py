@@ -1,6 +1,14 @@
+import datetime
+import zoneinfo
+
+from django.db import models
 from rest_framework import serializers
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field, PolymorphicProxySerializer
 
+from .loaders import PageFieldsLoader
+from .pagination import BoardColumnPagination
+from .schema import get_database_schema
 from .models import (
     BooleanFieldConfig,
     ChecklistFieldConfig,
@@ -11,9 +19,11 @@ from .models import (
     FileFieldConfig,
     NumberFieldConfig,
     Page,
+    PageRelation,
     RelationFieldConfig,
     TextFieldConfig,
     Database,
+    DatabaseImport,
     View,
     Field,
 )
@@ -169,13 +179,40 @@ class FieldResponseMinimalSerializer(serializers.ModelSerializer):
         ]
 
 
+class FieldResponseCellSerializer(serializers.Serializer):
+    page = serializers.UUIDField()
+    field = serializers.UUIDField()
+    value = serializers.JSONField()
+
+
+class FieldResponseBulkSerializer(serializers.Serializer):
+    cells = FieldResponseCellSerializer(many=True, allow_empty=False, max_length=10000)
+
+
+class FieldResponseCellErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    page = serializers.UUIDField()
+    field = serializers.UUIDField()
+    errors = serializers.DictField(child=serializers.ListField(child=serializers.CharField()))
+
+
+class FieldResponseBulkResultSerializer(serializers.Serializer):
+    written = serializers.IntegerField()
+    errors = FieldResponseCellErrorSerializer(many=True)
+
+
 class FieldWithResponseSerializer(FieldSerializer):
     response = serializers.SerializerMethodField(method_name="get_field_response")
 
     @extend_schema_field(FieldResponseMinimalSerializer)
     def get_field_response(self, obj):
-        page = self.context.get("internal_meta", {}).get("page")
-        response = FieldResponse.objects.filter(page=page, field=obj).first()
+        internal_meta = self.context.get("internal_meta", {})
+        page = internal_meta.get("page")
+        loader = internal_meta.get("page_fields_loader")
+        if loader is not None:
+            response = loader.get_response(page, obj)
+        else:
+            response = FieldResponse.objects.filter(page=page, field=obj).first()
         return FieldResponseMinimalSerializer(response).data
 
     class Meta:
@@ -183,30 +220,45 @@ class FieldWithResponseSerializer(FieldSerializer):
         fields = FieldSerializer.Meta.fields + ["response"]
 
 
+class PageListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        pages = data.all() if isinstance(data, models.manager.BaseManager) else data
+        pages = list(pages)
+
+        # Reuse the loader of an enclosing serializer that already loaded these pages.
+        internal_meta = self.context.setdefault("internal_meta", {})
+        loader = internal_meta.get("page_fields_loader")
+        if loader is None or not loader.has_pages(pages):
+            internal_meta["page_fields_loader"] = PageFieldsLoader(pages)
+
+        return super().to_representation(pages)
+
+
 class PageSerializer(serializers.ModelSerializer):
     created_by = serializers.UUIDField(read_only=True)
     updated_by = serializers.UUIDField(read_only=True)
     fields = serializers.SerializerMethodField(method_name="get_page_fields")
-    attachments = serializers.ListField(child=serializers.UUIDField(), read_only=True)
+    attachments = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
     @extend_schema_field(FieldWithResponseSerializer(many=True))
     def get_page_fields(self, obj):
-        fields = obj.view.fields.all()
-        fields_order = obj.view.fields_order
-        if len(fields_order) > 0:
-            fields = sorted(fields, key=lambda x: fields_order.index(x["id"]))
+        loader = self.context.get("internal_meta", {}).get("page_fields_loader")
+        if loader is None:
+            loader = PageFieldsLoader([obj])
 
         context = {
             **self.context,
             "internal_meta": {
                 **self.context.get("internal_meta", {}),
                 "page": obj,
+                "page_fields_loader": loader,
             },
         }
-        return FieldWithResponseSerializer(fields, many=True, context=context).data
+        return FieldWithResponseSerializer(loader.get_fields(obj), many=True, context=context).data
 
     class Meta:
         model = Page
+        list_serializer_class = PageListSerializer
         fields = [
             "id",
             "created_at",
@@ -230,6 +282,146 @@ class PageSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class PageMinimalSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Page
+        fields = [
+            "id",
+            "database",
+            "title",
+        ]
+
+
+class ViewCalendarQuerySerializer(serializers.Serializer):
+    field = serializers.CharField(required=False)
+    start = serializers.CharField()
+    end = serializers.CharField()
+    timezone = serializers.CharField(default="UTC")
+
+    def validate_timezone(self, value):
+        try:
+            return zoneinfo.ZoneInfo(value)
+        except (ValueError, zoneinfo.ZoneInfoNotFoundError):
+            raise serializers.ValidationError("Unknown timezone")
+
+
+class CalendarPageSerializer(PageSerializer):
+    calendar_value = serializers.SerializerMethodField(
+        help_text="Date, date and time in the requested timezone, or time of day of the page"
+    )
+
+    @extend_schema_field(OpenApiTypes.STR)
+    def get_calendar_value(self, obj):
+        value = obj.calendar_value
+        if isinstance(value, datetime.datetime):
+            value = value.astimezone(self.context.get("timezone", datetime.timezone.utc))
+
+        return value.isoformat()
+
+    class Meta(PageSerializer.Meta):
+        fields = [*PageSerializer.Meta.fields, "calendar_value"]
+
+
+class ViewBoardQuerySerializer(serializers.Serializer):
+    group_by = serializers.CharField()
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    cursor = serializers.CharField(required=False)
+
+    def validate_cursor(self, value):
+        try:
+            return BoardColumnPagination().decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor")
+
+
+class ViewBoardColumnSerializer(serializers.Serializer):
+    value = serializers.UUIDField(allow_null=True, help_text="Choice option ID, null for pages without an option")
+    label = serializers.CharField(allow_null=True)
+    count = serializers.IntegerField()
+    next = serializers.URLField(allow_null=True, help_text="Link to the following pages of the column")
+    pages = PageSerializer(many=True)
+
+
+class ViewBoardSerializer(serializers.Serializer):
+    columns = ViewBoardColumnSerializer(many=True)
+
+    def to_representation(self, instance):
+        # Load the fields of the pages of every column at once.
+        pages = [page for column in instance["columns"] for page in column["pages"]]
+        self.context.setdefault("internal_meta", {})["page_fields_loader"] = PageFieldsLoader(pages)
+        return super().to_representation(instance)
+
+
+class PageSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+
+
+class PageSearchResultSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+    title_highlight = serializers.CharField(read_only=True, help_text="Title with matches in <mark> tags, unescaped")
+    snippet = serializers.CharField(read_only=True, help_text="Excerpts with matches in <mark> tags, unescaped")
+
+    class Meta:
+        model = Page
+        fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "database",
+            "title",
+            "rank",
+            "title_highlight",
+            "snippet",
+        ]
+
+
+class QuickSwitchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class QuickSwitchResultSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=["database", "view", "page"])
+    id = serializers.UUIDField()
+    label = serializers.CharField()
+    database = serializers.UUIDField()
+    score = serializers.FloatField()
+
+
+class ViewAggregateQuerySerializer(serializers.Serializer):
+    metrics = serializers.CharField(default="count")
+    group_by = serializers.CharField(required=False)
+
+    def validate_metrics(self, value):
+        metrics = [metric.strip() for metric in value.split(",") if metric.strip()]
+        if len(metrics) == 0:
+            raise serializers.ValidationError("At least one metric is required")
+
+        return metrics
+
+
+class ViewAggregateGroupSerializer(serializers.Serializer):
+    value = serializers.JSONField(help_text="Choice option ID or boolean, null for pages without a value")
+    label = serializers.CharField(allow_null=True)
+    metrics = serializers.DictField()
+
+
+class ViewAggregateResultSerializer(serializers.Serializer):
+    metrics = serializers.DictField()
+    groups = ViewAggregateGroupSerializer(many=True, required=False)
+
+
+class PageBacklinkSerializer(serializers.ModelSerializer):
+    source_page = PageMinimalSerializer()
+
+    class Meta:
+        model = PageRelation
+        fields = [
+            "source_page",
+            "field",
+        ]
+
+
 class ViewSerializer(serializers.ModelSerializer):
     created_by = serializers.UUIDField(read_only=True)
     updated_by = serializers.UUIDField(read_only=True)
@@ -237,11 +429,8 @@ class ViewSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(FieldSerializer(many=True))
     def get_view_fields(self, obj):
-        fields = obj.fields
-        if len(obj.fields_order) > 0:
-            fields = sorted(fields, key=lambda x: obj.fields_order.index(x["id"]))
-
-        return FieldSerializer(fields, many=True).data
+        fields = get_database_schema(obj.database_id).get_view_fields(obj.pk)
+        return FieldSerializer(fields, many=True, context=self.context).data
 
     class Meta:
         model = View
@@ -258,6 +447,7 @@ class ViewSerializer(serializers.ModelSerializer):
             "fields",
             "sort_by",
             "filter_by",
+            "calendar_field",
         ]
 
     def create(self, validated_data):
@@ -298,3 +488,42 @@ class DatabaseSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         validated_data["updated_by"] = self.context["request"].user
         return super().update(instance, validated_data)
+
+
+class DatabaseImportSerializer(serializers.ModelSerializer):
+    created_by = serializers.UUIDField(read_only=True)
+    updated_by = serializers.UUIDField(read_only=True)
+
+    class Meta:
+        model = DatabaseImport
+        fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "created_by",
+            "updated_by",
+            "database",
+            "format",
+            "status",
+            "pages_created",
+            "responses_created",
+            "ignored_columns",
+            "rejected_row_count",
+            "rejected_rows",
+            "error",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class DatabaseImportCreateSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=DatabaseImport.Format.choices, required=False)
+
+    def validate(self, attrs):
+        if "format" not in attrs:
+            is_ndjson = attrs["file"].name.lower().endswith((".ndjson", ".jsonl"))
+            attrs["format"] = DatabaseImport.Format.NDJSON if is_ndjson else DatabaseImport.Format.CSV
+
+        return attrs
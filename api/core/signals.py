@@ -0,0 +1,286 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from api.etags import bump_workspace_versions
+
+from .indexes import sync_field_indexes
+from .models import (
+    BooleanFieldConfig,
+    ChecklistFieldConfig,
+    ChoiceFieldConfig,
+    ChoiceFieldOption,
+    Database,
+    DatabaseImport,
+    DateFieldConfig,
+    Field,
+    FieldResponse,
+    FileFieldConfig,
+    NumberFieldConfig,
+    Page,
+    PageRelation,
+    RealtimeChange,
+    RelationFieldConfig,
+    TextFieldConfig,
+    View,
+)
+from .realtime import record_change
+from .results import bump_field_versions, bump_pages_version
+from .schema import bump_database_schema_version
+from .tasks import bump_database_workspace_version, get_database_workspace_key, refresh_typed_values
+
+FIELD_CONFIG_MODELS = [
+    BooleanFieldConfig,
+    ChecklistFieldConfig,
+    ChoiceFieldConfig,
+    DateFieldConfig,
+    FileFieldConfig,
+    NumberFieldConfig,
+    RelationFieldConfig,
+    TextFieldConfig,
+]
+
+
+CONFIG_FIELD_NAMES = {
+    Field._meta.get_field(config_field_name).related_model: config_field_name
+    for config_field_name in Field._config_field_map.values()
+}
+
+
+def schedule_typed_values_refresh(field_id, database_id):
+    # Queued in the transaction of the change, so it runs once the change is committed.
+    refresh_typed_values.enqueue(field_id, database_id)
+
+
+def schedule_field_index_sync(database_id):
+    sync_field_indexes.enqueue(database_id)
+
+
+@receiver(post_save, sender=View)
+@receiver(post_delete, sender=View)
+def sync_view_field_indexes(sender, instance, **kwargs):
+    schedule_field_index_sync(instance.database_id)
+
+
+@receiver(post_save, sender=FieldResponse)
+def sync_response_page_relations(sender, instance, **kwargs):
+    # Only relation responses have edges, the edges of a field that stops being a relation are deleted
+    # along with its type change.
+    if instance.field.field_type == Field.FieldType.RELATION:
+        PageRelation.objects.sync_responses([instance])
+
+
+@receiver(post_delete, sender=FieldResponse)
+def delete_response_page_relations(sender, instance, **kwargs):
+    PageRelation.objects.filter(source_page_id=instance.page_id, field_id=instance.field_id).delete()
+
+
+@receiver(post_save, sender=Page)
+def update_page_search_vector(sender, instance, **kwargs):
+    Page.objects.filter(pk=instance.pk).update_search_vectors()
+
+
+@receiver(post_save, sender=FieldResponse)
+def update_response_page_search_vector(sender, instance, **kwargs):
+    # Only text responses are part of the search vector of their page.
+    if instance.value_text is not None:
+        Page.objects.filter(pk=instance.page_id).update_search_vectors()
+
+
+@receiver(post_delete, sender=FieldResponse)
+def update_deleted_response_page_search_vector(sender, instance, origin=None, **kwargs):
+    # Responses deleted along with their page, database or workspace leave no page to update.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model in (FieldResponse, Field) and instance.value_text is not None:
+        Page.objects.filter(pk=instance.page_id).update_search_vectors()
+
+
+@receiver(pre_save, sender=Field)
+def track_field_type_change(sender, instance, **kwargs):
+    previous_field_type = Field.objects.filter(pk=instance.pk).values_list("field_type", flat=True).first()
+    instance._field_type_changed = previous_field_type is not None and previous_field_type != instance.field_type
+    instance._was_relation = previous_field_type == Field.FieldType.RELATION
+
+
+@receiver(post_save, sender=Field)
+def sync_field_field_indexes(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    if getattr(instance, "_field_type_changed", False):
+        schedule_typed_values_refresh(instance.pk, instance.database_id)
+
+        if instance._was_relation:
+            PageRelation.objects.filter(field_id=instance.pk).delete()
+
+    schedule_field_index_sync(instance.database_id)
+
+
+def sync_field_config_field_indexes(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    field = Field.objects.filter(**{CONFIG_FIELD_NAMES[sender]: instance}).first()
+    if field is not None:
+        schedule_typed_values_refresh(field.pk, field.database_id)
+        schedule_field_index_sync(field.database_id)
+
+
+for config_model in FIELD_CONFIG_MODELS:
+    post_save.connect(sync_field_config_field_indexes, sender=config_model)
+
+
+def schedule_schema_version_bump(database_id):
+    # Bumped right away so the rest of the transaction reads the new schema, and again on commit so
+    # a schema rebuilt by a concurrent request from the not yet committed state gets discarded.
+    bump_database_schema_version(database_id)
+    transaction.on_commit(lambda: bump_database_schema_version(database_id))
+    schedule_workspace_version_bump(database_id)
+
+
+@receiver(post_save, sender=Field)
+@receiver(post_delete, sender=Field)
+@receiver(post_save, sender=View)
+@receiver(post_delete, sender=View)
+def bump_schema_version(sender, instance, **kwargs):
+    schedule_schema_version_bump(instance.database_id)
+
+
+@receiver(m2m_changed, sender=View.fields.through)
+def bump_view_fields_schema_version(sender, instance, action, **kwargs):
+    if action in ["post_add", "post_remove", "post_clear"]:
+        schedule_schema_version_bump(instance.database_id)
+
+
+@receiver(post_save, sender=ChoiceFieldOption)
+@receiver(post_delete, sender=ChoiceFieldOption)
+def bump_choice_option_schema_version(sender, instance, **kwargs):
+    fields = Field.objects.filter(choice_config_id=instance.field_config_id)
+    for database_id in fields.values_list("database_id", flat=True):
+        schedule_schema_version_bump(database_id)
+
+
+def bump_field_config_schema_version(sender, instance, **kwargs):
+    fields = Field.objects.filter(**{CONFIG_FIELD_NAMES[sender]: instance})
+    for database_id in fields.values_list("database_id", flat=True):
+        schedule_schema_version_bump(database_id)
+
+
+for config_model in FIELD_CONFIG_MODELS:
+    post_save.connect(bump_field_config_schema_version, sender=config_model)
+    # The field's reference to a deleted config is already nulled by post_delete.
+    pre_delete.connect(bump_field_config_schema_version, sender=config_model)
+
+
+def schedule_view_results_invalidation(bump, *args):
+    # Bumped right away and again on commit, like the schema version, so results computed by a
+    # concurrent request from the not yet committed state are not reused.
+    bump(*args)
+    transaction.on_commit(lambda: bump(*args))
+
+
+@receiver(post_save, sender=FieldResponse)
+@receiver(post_delete, sender=FieldResponse)
+def invalidate_response_view_results(sender, instance, **kwargs):
+    schedule_view_results_invalidation(bump_field_versions, [instance.field_id])
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def invalidate_page_view_results(sender, instance, **kwargs):
+    schedule_view_results_invalidation(bump_pages_version, instance.database_id)
+
+
+def schedule_workspace_version_bump(database_id):
+    # Bumped once the change is visible: ETags are computed before the data they cover is read, so a
+    # request reading the previous state always sees the previous version.
+    transaction.on_commit(lambda: bump_database_workspace_version(database_id))
+
+
+@receiver(post_save, sender=Database)
+def bump_database_workspace_versions(sender, instance, **kwargs):
+    # The workspace of a database can be changed, its previous workspace is bumped along.
+    previous_workspace_id = cache.get(get_database_workspace_key(instance.pk))
+    cache.set(get_database_workspace_key(instance.pk), instance.workspace_id, timeout=None)
+    workspace_ids = {instance.workspace_id, previous_workspace_id}
+    transaction.on_commit(lambda: bump_workspace_versions(workspace_ids))
+
+
+@receiver(post_delete, sender=Database)
+def bump_deleted_database_workspace_version(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_workspace_versions([instance.workspace_id]))
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_save, sender=DatabaseImport)
+@receiver(post_delete, sender=DatabaseImport)
+def bump_database_object_workspace_version(sender, instance, **kwargs):
+    schedule_workspace_version_bump(instance.database_id)
+
+
+@receiver(post_delete, sender=Page)
+def bump_deleted_page_workspace_version(sender, instance, origin=None, **kwargs):
+    # Pages deleted along with their database or workspace are covered by the deletion of those.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is Page:
+        schedule_workspace_version_bump(instance.database_id)
+
+
+@receiver(m2m_changed, sender=Page.attachments.through)
+def bump_page_attachments_workspace_version(sender, instance, action, reverse, **kwargs):
+    if action in ["post_add", "post_remove", "post_clear"] and not reverse:
+        schedule_workspace_version_bump(instance.database_id)
+
+
+@receiver(post_save, sender=FieldResponse)
+def bump_response_workspace_version(sender, instance, **kwargs):
+    schedule_workspace_version_bump(instance.field.database_id)
+
+
+@receiver(post_delete, sender=FieldResponse)
+def bump_deleted_response_workspace_version(sender, instance, origin=None, **kwargs):
+    # Responses deleted along with their page, field, database or workspace are covered by the
+    # deletion of those.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is FieldResponse:
+        schedule_workspace_version_bump(instance.field.database_id)
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_save, sender=Field)
+@receiver(post_save, sender=View)
+def record_saved_change(sender, instance, created, **kwargs):
+    action = RealtimeChange.Action.CREATED if created else RealtimeChange.Action.UPDATED
+    record_change(instance, instance.database_id, action)
+
+
+@receiver(post_delete, sender=Page)
+@receiver(post_delete, sender=Field)
+@receiver(post_delete, sender=View)
+def record_deleted_change(sender, instance, origin=None, **kwargs):
+    # Objects deleted along with their database or workspace are not published one by one.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is sender:
+        record_change(instance, instance.database_id, RealtimeChange.Action.DELETED)
+
+
+@receiver(post_save, sender=FieldResponse)
+def record_saved_response_change(sender, instance, created, **kwargs):
+    action = RealtimeChange.Action.CREATED if created else RealtimeChange.Action.UPDATED
+    record_change(instance, instance.field.database_id, action, page_id=instance.page_id, field_id=instance.field_id)
+
+
+@receiver(post_delete, sender=FieldResponse)
+def record_deleted_response_change(sender, instance, origin=None, **kwargs):
+    # Responses deleted along with their page or field are covered by the change of those.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is FieldResponse:
+        record_change(
+            instance,
+            instance.field.database_id,
+            RealtimeChange.Action.DELETED,
+            page_id=instance.page_id,
+            field_id=instance.field_id,
+        )
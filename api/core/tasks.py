@@ -0,0 +1,40 @@
+from django.core.cache import cache
+
+from api.etags import bump_workspace_versions
+from jobs.decorators import job
+
+from .models import Database, FieldResponse
+from .results import bump_field_versions
+
+
+def get_database_workspace_key(database_id):
+    return f"core:database_workspace:{database_id}"
+
+
+def get_database_workspace_id(database_id):
+    key = get_database_workspace_key(database_id)
+    workspace_id = cache.get(key)
+    if workspace_id is None:
+        workspace_id = Database.objects.filter(pk=database_id).values_list("workspace_id", flat=True).first()
+        if workspace_id is not None:
+            cache.set(key, workspace_id, timeout=None)
+
+    return workspace_id
+
+
+def bump_database_workspace_version(database_id):
+    bump_workspace_versions([get_database_workspace_id(database_id)])
+
+
+@job(max_attempts=3, unique=True)
+def refresh_typed_values(field_id, database_id):
+    """
+    Rewrite the typed value columns of the responses of a field, after its type or config changed.
+
+    Parameters:
+        - field_id (UUID): The field whose responses are refreshed.
+        - database_id (UUID): The database of the field, whose workspace version is bumped.
+    """
+    FieldResponse.objects.filter(field_id=field_id).refresh_typed_values()
+    bump_field_versions([field_id])
+    bump_database_workspace_version(database_id)
@@ -1 +1,1210 @@
-# Create your tests here.
+import asyncio
+import csv
+import datetime
+import io
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import msgpack
+from ably.sync import AblyException, AblyRestSync
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.async_views import stream_content
+from authentication.models import User
+from jobs.models import Job
+from jobs.worker import Worker
+
+from .exports import DatabaseExport, get_qualified_column
+from .imports import DatabaseImporter
+from .indexes import build_field_index
+from .models import (
+    ChoiceFieldConfig,
+    Database,
+    DateFieldConfig,
+    Field,
+    FieldResponse,
+    NumberFieldConfig,
+    Page,
+    PageRelation,
+    RealtimeChange,
+    RelationFieldConfig,
+    View,
+)
+from .queries import ViewBoardQuery
+from .realtime import MAX_MESSAGE_CHANGES, ChangePublisher, get_database_channel, record_page_changes
+from .results import get_view_results, get_view_results_key
+from .schema import get_database_schema
+from .serializers import FieldSerializer
+from .tasks import refresh_typed_values
+from .validation import ResponseValidationContext
+from .writers import FieldResponseWriter
+
+
+class DatabaseTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="ada@example.com", email="ada@example.com", password="password")
+        self.workspace = self.user.default_workspace
+        self.database = Database.objects.create(workspace=self.workspace, name="Tasks")
+        self.page_view = self.database.views.get()
+
+    def create_field(self, label, field_type=Field.FieldType.TEXT):
+        field = Field.objects.create(database=self.database, label=label, field_type=field_type)
+        self.page_view.fields.add(field)
+        return field
+
+    def create_page(self, title, values=()):
+        page = Page.objects.create(database=self.database, title=title)
+        for field, value in values:
+            FieldResponse.objects.create(page=page, field=field, data={"value": value})
+
+        return page
+
+
+class PageRenderingTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.fields = [self.create_field(label) for label in ["Status", "Owner", "Notes"]]
+
+    def create_pages(self, count):
+        for index in range(count):
+            self.create_page(f"Page {index}", [(field, f"{field.label} {index}") for field in self.fields])
+
+    def test_pages_render_in_a_fixed_number_of_queries(self):
+        self.create_pages(2)
+        self.client.get("/api/pages/")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/pages/")
+
+        self.create_pages(20)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get("/api/pages/")
+
+        self.assertEqual(len(response.json()["results"]), 22)
+
+    def test_pages_render_their_fields_in_view_order(self):
+        self.create_pages(1)
+        self.page_view.fields_order = [self.fields[2].pk, self.fields[0].pk, self.fields[1].pk]
+        self.page_view.save()
+
+        response = self.client.get("/api/pages/")
+
+        fields = response.json()["results"][0]["fields"]
+        self.assertEqual(
+            [(field["label"], field["response"]["data"]) for field in fields],
+            [("Notes", {"value": "Notes 0"}), ("Status", {"value": "Status 0"}), ("Owner", {"value": "Owner 0"})],
+        )
+
+
+class FieldConfigLoadingTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_fields(self, count):
+        for index in range(count):
+            choice = self.create_field(f"Status {index}", Field.FieldType.CHOICE)
+            choice.config.options.create(label="Done", value="done")
+            self.create_field(f"Estimate {index}", Field.FieldType.NUMBER)
+
+    def test_configs_and_options_load_in_two_queries(self):
+        self.create_fields(5)
+
+        with self.assertNumQueries(2):
+            data = FieldSerializer(Field.objects.with_configs(), many=True).data
+
+        configs = [field["config"] for field in data if field["field_type"] == Field.FieldType.CHOICE]
+        self.assertEqual([[option["label"] for option in config["options"]] for config in configs], [["Done"]] * 5)
+
+    def test_listing_fields_takes_a_fixed_number_of_queries(self):
+        self.create_fields(1)
+        self.client.get("/api/fields/")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/fields/")
+
+        self.create_fields(10)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get("/api/fields/")
+
+        self.assertEqual(len(response.json()["results"]), 22)
+
+
+class DatabaseSchemaTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.status = self.create_field("Status", Field.FieldType.CHOICE)
+
+    def test_cached_schemas_are_read_without_queries(self):
+        get_database_schema(self.database.pk)
+
+        with self.assertNumQueries(0):
+            schema = get_database_schema(self.database.pk)
+
+        self.assertEqual([field.label for field in schema.get_page_fields()], ["Status"])
+
+    def test_field_changes_rebuild_the_schema(self):
+        get_database_schema(self.database.pk)
+
+        self.status.label = "State"
+        self.status.save()
+        estimate = self.create_field("Estimate", Field.FieldType.NUMBER)
+
+        schema = get_database_schema(self.database.pk)
+        self.assertEqual([field.label for field in schema.get_page_fields()], ["State", "Estimate"])
+
+        estimate.delete()
+        self.assertEqual([field.label for field in get_database_schema(self.database.pk).get_page_fields()], ["State"])
+
+    def test_config_and_option_changes_rebuild_the_schema(self):
+        get_database_schema(self.database.pk)
+
+        option = self.status.config.options.create(label="Done", value="done")
+        field = get_database_schema(self.database.pk).get_field(self.status.pk)
+        self.assertEqual(list(field.config.options.all()), [option])
+
+        self.status.config.display_format = ChoiceFieldConfig.DisplayFormat.TAGS
+        self.status.config.save()
+        field = get_database_schema(self.database.pk).get_field(self.status.pk)
+        self.assertEqual(field.config.display_format, ChoiceFieldConfig.DisplayFormat.TAGS)
+
+    def test_view_changes_rebuild_the_schema(self):
+        estimate = self.create_field("Estimate", Field.FieldType.NUMBER)
+        get_database_schema(self.database.pk)
+
+        self.page_view.fields_order = [estimate.pk, self.status.pk]
+        self.page_view.save()
+        self.assertEqual(get_database_schema(self.database.pk).get_page_fields(), [estimate, self.status])
+
+        self.page_view.fields.remove(self.status)
+        self.assertEqual(get_database_schema(self.database.pk).get_page_fields(), [estimate])
+
+
+class QuickSwitchTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.database.name = "Roadmaps"
+        self.database.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def quick_switch(self, q, **params):
+        response = self.client.get("/api/quick-switch/", {"q": q, **params})
+        return [(match["type"], match["label"]) for match in response.json()]
+
+    def test_databases_views_and_pages_are_matched_best_first(self):
+        View.objects.create(database=self.database, label="Roadmapping", view_type=View.ViewType.KANBAN)
+        self.create_page("Roadmap")
+        self.create_page("Hire a designer")
+
+        self.assertEqual(
+            self.quick_switch("roadmap"),
+            [("page", "Roadmap"), ("database", "Roadmaps"), ("view", "Roadmapping")],
+        )
+        self.assertEqual(self.quick_switch("roadmap", limit=1), [("page", "Roadmap")])
+
+    def test_partial_and_misspelled_names_are_matched(self):
+        self.create_page("Quarterly planning")
+
+        self.assertEqual(self.quick_switch("quart"), [("page", "Quarterly planning")])
+        self.assertEqual(self.quick_switch("quartrely planing"), [("page", "Quarterly planning")])
+
+    def test_only_workspaces_of_the_user_are_matched(self):
+        other = User.objects.create_user(username="grace@example.com", email="grace@example.com", password="password")
+        other_database = Database.objects.create(workspace=other.default_workspace, name="Roadmap")
+        Page.objects.create(database=other_database, title="Roadmap")
+
+        self.assertEqual(self.quick_switch("roadmap"), [("database", "Roadmaps")])
+
+
+class PageRelationSyncTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self.create_page("Write tests")
+        self.target = self.create_page("Review tests")
+        self.related = self.create_field("Related", Field.FieldType.RELATION)
+        self.related.relation_config = RelationFieldConfig.objects.create(
+            source_field=self.related, related_field=self.related
+        )
+        self.related.save()
+
+    def get_edges(self):
+        return list(PageRelation.objects.values_list("source_page_id", "target_page_id", "field_id"))
+
+    def test_relation_responses_sync_their_edges(self):
+        FieldResponse.objects.create(page=self.source, field=self.related, data={"value": [str(self.target.pk)]})
+
+        self.assertEqual(self.get_edges(), [(self.source.pk, self.target.pk, self.related.pk)])
+
+    def test_other_responses_do_not_touch_the_edges(self):
+        notes = self.create_field("Notes")
+
+        with CaptureQueriesContext(connection) as context:
+            FieldResponse.objects.create(page=self.source, field=notes, data={"value": "Soon"})
+
+        self.assertFalse(any(PageRelation._meta.db_table in query["sql"] for query in context.captured_queries))
+
+    def test_edges_are_deleted_when_the_field_stops_being_a_relation(self):
+        FieldResponse.objects.create(page=self.source, field=self.related, data={"value": [str(self.target.pk)]})
+
+        self.related.field_type = Field.FieldType.TEXT
+        self.related.save()
+
+        self.assertEqual(self.get_edges(), [])
+
+
+class FieldConfigCodecTests(DatabaseTestCase):
+    def get_samples(self):
+        page = self.create_page("Write tests")
+        choice = self.create_field("Status", Field.FieldType.CHOICE)
+        option = choice.config.options.create(label="Done", value="done")
+        related = self.create_field("Related", Field.FieldType.RELATION)
+        related.relation_config = RelationFieldConfig.objects.create(source_field=related, related_field=related)
+        related.save()
+
+        samples = {
+            Field.FieldType.BOOLEAN: True,
+            Field.FieldType.CHECKLIST: [{"value": "Write tests", "is_checked": True}],
+            Field.FieldType.CHOICE: [str(option.pk)],
+            Field.FieldType.DATE: "2026-10-18T09:30:00+00:00",
+            Field.FieldType.FILE: [],
+            Field.FieldType.NUMBER: 3,
+            Field.FieldType.RELATION: [str(page.pk)],
+            Field.FieldType.TEXT: "Soon",
+        }
+        fields = {choice.pk: choice, related.pk: related}
+        for field_type in samples.keys() - {Field.FieldType.CHOICE, Field.FieldType.RELATION}:
+            field = self.create_field(field_type.label, field_type)
+            fields[field.pk] = field
+
+        fields = Field.objects.with_configs().in_bulk(list(fields))
+        return [(field, samples[field.field_type]) for field in fields.values()]
+
+    def test_every_config_decodes_with_a_validation_context(self):
+        for field, value in self.get_samples():
+            with self.subTest(field_type=field.field_type):
+                context = ResponseValidationContext()
+                field.config.validate_response_data(value, context)
+
+                self.assertEqual(
+                    field.config.deserialize_many([value, value], context),
+                    [field.config.deserialize_response_data(value, context)] * 2,
+                )
+
+    def test_batches_serialize_like_single_values(self):
+        for field, value in self.get_samples():
+            with self.subTest(field_type=field.field_type):
+                self.assertEqual(
+                    field.config.serialize_many([value, value]), [field.config.serialize_response_data(value)] * 2
+                )
+
+
+class ReferenceValidationTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.related = self.create_field("Related", Field.FieldType.RELATION)
+        self.related.relation_config = RelationFieldConfig.objects.create(
+            source_field=self.related, related_field=self.related
+        )
+        self.related.save()
+        self.status = self.create_field("Status", Field.FieldType.CHOICE)
+        self.status.config.is_multi_select = True
+        self.options = [self.status.config.options.create(label=label, value=label) for label in ["Todo", "Done"]]
+
+    def test_relations_are_validated_in_one_query(self):
+        pages = Page.objects.bulk_create([Page(database=self.database, title=f"Page {index}") for index in range(200)])
+        config = RelationFieldConfig.objects.select_related("related_field").get(pk=self.related.relation_config.pk)
+
+        with self.assertNumQueries(1):
+            config.validate_response_data([str(page.pk) for page in pages])
+
+    def test_every_invalid_reference_is_reported(self):
+        page = self.create_page("Write tests")
+        missing_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+
+        with self.assertRaises(ValidationError) as raised:
+            self.related.config.validate_response_data([str(page.pk), *missing_ids])
+
+        self.assertEqual(
+            raised.exception.message_dict["data"],
+            [f"Items must be Page IDs of the related database: {', '.join(missing_ids)}"],
+        )
+
+    def test_choice_options_are_loaded_once_per_context(self):
+        context = ResponseValidationContext()
+        values = [[str(option.pk)] for option in self.options] * 10
+
+        with self.assertNumQueries(1):
+            for value in values:
+                self.status.config.validate_response_data(value, context)
+            decoded = self.status.config.deserialize_many(values, context)
+
+        self.assertEqual(decoded[:2], [[option] for option in self.options])
+
+    def test_batches_resolve_unseen_references_once(self):
+        pages = [self.create_page(f"Page {index}") for index in range(3)]
+        context = ResponseValidationContext()
+        config = RelationFieldConfig.objects.select_related("related_field").get(pk=self.related.relation_config.pk)
+
+        with self.assertNumQueries(1):
+            decoded = config.deserialize_many([[str(page.pk)] for page in pages], context)
+        with self.assertNumQueries(0):
+            config.validate_response_data([str(page.pk) for page in pages], context)
+
+        self.assertEqual(decoded, [[page] for page in pages])
+
+
+class TypedValuesRefreshTests(DatabaseTestCase):
+    def test_field_type_changes_refresh_the_typed_values(self):
+        field = self.create_field("Estimate")
+        page = self.create_page("Write tests", [(field, "3")])
+        Job.objects.all().delete()
+
+        field.field_type = Field.FieldType.NUMBER
+        field.save()
+        job = Job.objects.get(name=refresh_typed_values.name)
+        worker = Worker([job.queue])
+        worker.perform(worker.claim(job.queue))
+
+        self.assertEqual(job.name, "core.tasks.refresh_typed_values")
+        self.assertEqual(FieldResponse.objects.get(page=page).value_number, 3)
+        self.assertFalse(Job.objects.filter(name=refresh_typed_values.name).exists())
+
+
+class DatabaseExportTests(DatabaseTestCase):
+    def test_header_names_fields_by_label(self):
+        self.create_field("Status")
+
+        header = DatabaseExport(self.database).get_header()
+
+        self.assertEqual(header, ["id", "title", "created_at", "updated_at", "Status"])
+
+    def test_header_qualifies_shared_and_page_column_labels(self):
+        first = self.create_field("Notes")
+        second = self.create_field("Notes")
+        title = self.create_field("title")
+
+        header = DatabaseExport(self.database).get_header()
+
+        self.assertEqual(
+            header[4:], [get_qualified_column(first), get_qualified_column(second), get_qualified_column(title)]
+        )
+        self.assertEqual(len(set(header)), len(header))
+
+    def test_ndjson_keeps_values_of_fields_sharing_a_label(self):
+        first = self.create_field("Notes")
+        second = self.create_field("Notes")
+        self.create_page("Write tests", [(first, "one"), (second, "two")])
+
+        (line,) = DatabaseExport(self.database).iter_ndjson()
+        record = json.loads(line)
+
+        self.assertEqual(record[get_qualified_column(first)], "one")
+        self.assertEqual(record[get_qualified_column(second)], "two")
+
+    def test_export_is_imported_back_into_the_same_fields(self):
+        first = self.create_field("Notes")
+        second = self.create_field("Notes")
+        title = self.create_field("title")
+        page = self.create_page("Write tests", [(first, "one"), (second, "two"), (title, "three")])
+
+        content = "".join(DatabaseExport(self.database).iter_csv())
+        result = DatabaseImporter(self.database, self.user, workers=1).run(io.StringIO(content), "csv")
+
+        self.assertEqual(result["ignored_columns"], [])
+        self.assertEqual(result["rejected_rows"], [])
+        imported = Page.objects.filter(database=self.database).exclude(pk=page.pk).get()
+        values = dict(FieldResponse.objects.filter(page=imported).values_list("field_id", "data__value"))
+        self.assertEqual(values, {first.pk: "one", second.pk: "two", title.pk: "three"})
+
+    def test_csv_rows_follow_the_header(self):
+        status = self.create_field("Status")
+        self.create_page("Write tests", [(status, "Done")])
+
+        rows = list(csv.reader(io.StringIO("".join(DatabaseExport(self.database).iter_csv()))))
+
+        self.assertEqual(rows[0][-1], "Status")
+        self.assertEqual(rows[1][1:2] + rows[1][-1:], ["Write tests", "Done"])
+
+
+class DatabaseImporterTests(DatabaseTestCase):
+    def run_import(self, content, file_format="csv"):
+        return DatabaseImporter(self.database, self.user, workers=1).run(io.StringIO(content), file_format)
+
+    def get_imported_values(self, title):
+        page = Page.objects.get(database=self.database, title=title)
+        return dict(FieldResponse.objects.filter(page=page).values_list("field__label", "data__value"))
+
+    def test_rows_are_copied_with_their_typed_values(self):
+        self.create_field("Notes")
+        self.create_field("Estimate", Field.FieldType.NUMBER)
+
+        result = self.run_import("title,Notes,Estimate\nWrite tests,Soon,3\n")
+
+        self.assertEqual((result["pages_created"], result["responses_created"]), (1, 2))
+        responses = FieldResponse.objects.filter(page__title="Write tests")
+        self.assertEqual(
+            {response.field.label: (response.value_text, response.value_number) for response in responses},
+            {"Notes": ("Soon", None), "Estimate": (None, 3)},
+        )
+
+    def test_rows_with_an_invalid_cell_are_rejected_as_a_whole(self):
+        self.create_field("Notes")
+        self.create_field("Estimate", Field.FieldType.NUMBER)
+
+        result = self.run_import("title,Notes,Estimate\nWrite tests,Soon,many\n,Later,2\nReview tests,Later,2\n")
+
+        self.assertEqual([rejected["row"] for rejected in result["rejected_rows"]], [1, 2])
+        self.assertIn("Estimate", result["rejected_rows"][0]["errors"])
+        self.assertIn("title", result["rejected_rows"][1]["errors"])
+        self.assertEqual(
+            list(Page.objects.filter(database=self.database).values_list("title", flat=True)), ["Review tests"]
+        )
+        self.assertEqual(self.get_imported_values("Review tests"), {"Notes": "Later", "Estimate": 2})
+
+    def test_labels_shared_by_several_fields_are_reported_with_their_qualified_columns(self):
+        first = self.create_field("Notes")
+        second = self.create_field("Notes")
+
+        result = self.run_import(f"title,Notes,{get_qualified_column(second)}\nWrite tests,one,two\n")
+
+        (ignored,) = result["ignored_columns"]
+        self.assertEqual(ignored["column"], "Notes")
+        self.assertIn(get_qualified_column(first), ignored["reason"])
+        self.assertIn(get_qualified_column(second), ignored["reason"])
+        page = Page.objects.get(database=self.database)
+        self.assertEqual(list(FieldResponse.objects.filter(page=page).values_list("field_id", flat=True)), [second.pk])
+
+    def test_labels_of_page_columns_are_reported_with_their_qualified_column(self):
+        field = self.create_field("title")
+
+        result = self.run_import('{"title": "Write tests", "id": "1", "Unknown": 2}\n', "ndjson")
+
+        self.assertEqual([ignored["column"] for ignored in result["ignored_columns"]], ["Unknown", "title"])
+        self.assertIn(get_qualified_column(field), result["ignored_columns"][1]["reason"])
+        self.assertEqual(Page.objects.get(database=self.database).title, "Write tests")
+        self.assertFalse(FieldResponse.objects.filter(field=field).exists())
+
+
+class FieldResponseWriterTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.status = self.create_field("Status")
+        self.page = self.create_page("Write tests")
+        RealtimeChange.objects.all().delete()
+
+    def write(self, cells):
+        return FieldResponseWriter(self.database, self.user).write(cells)
+
+    def get_response_changes(self):
+        return {
+            change.object_id: change.action
+            for change in RealtimeChange.objects.filter(object_type=RealtimeChange.ObjectType.FIELD_RESPONSE)
+        }
+
+    def test_created_responses_are_recorded_as_created(self):
+        written, errors = self.write([{"page": self.page.pk, "field": self.status.pk, "value": "Todo"}])
+
+        response = FieldResponse.objects.get(page=self.page, field=self.status)
+        self.assertEqual((written, errors), (1, []))
+        self.assertEqual(response.value_text, "Todo")
+        self.assertEqual(self.get_response_changes(), {response.pk: RealtimeChange.Action.CREATED})
+
+    def test_updated_responses_keep_their_id_and_are_recorded_as_updated(self):
+        response = FieldResponse.objects.create(page=self.page, field=self.status, data={"value": "Todo"})
+        RealtimeChange.objects.all().delete()
+
+        self.write([{"page": self.page.pk, "field": self.status.pk, "value": "Done"}])
+
+        self.assertEqual(FieldResponse.objects.get(page=self.page, field=self.status).pk, response.pk)
+        self.assertEqual(FieldResponse.objects.get(pk=response.pk).data, {"value": "Done"})
+        self.assertEqual(self.get_response_changes(), {response.pk: RealtimeChange.Action.UPDATED})
+
+    def test_mixed_batches_record_every_change_with_a_stored_id(self):
+        other_page = self.create_page("Review tests")
+        existing = FieldResponse.objects.create(page=self.page, field=self.status, data={"value": "Todo"})
+        RealtimeChange.objects.all().delete()
+
+        self.write(
+            [
+                {"page": self.page.pk, "field": self.status.pk, "value": "Done"},
+                {"page": other_page.pk, "field": self.status.pk, "value": "Todo"},
+            ]
+        )
+
+        created = FieldResponse.objects.get(page=other_page, field=self.status)
+        self.assertEqual(
+            self.get_response_changes(),
+            {existing.pk: RealtimeChange.Action.UPDATED, created.pk: RealtimeChange.Action.CREATED},
+        )
+
+    def test_invalid_cells_are_reported_and_skipped(self):
+        other = Database.objects.create(workspace=self.workspace, name="Other")
+        foreign_page = Page.objects.create(database=other, title="Elsewhere")
+
+        written, errors = self.write(
+            [
+                {"page": foreign_page.pk, "field": self.status.pk, "value": "Todo"},
+                {"page": self.page.pk, "field": self.status.pk, "value": 3},
+                {"page": self.page.pk, "field": self.status.pk, "value": "Done"},
+            ]
+        )
+
+        self.assertEqual(written, 1)
+        self.assertEqual([error["index"] for error in errors], [0])
+        self.assertEqual(FieldResponse.objects.get(page=self.page, field=self.status).data, {"value": "Done"})
+
+
+class FieldIndexTests(DatabaseTestCase):
+    def add_index(self, field):
+        field = Field.objects.with_configs().get(pk=field.pk)
+        with connection.schema_editor() as schema_editor:
+            schema_editor.add_index(FieldResponse, build_field_index(field))
+
+    def test_long_texts_fit_in_the_text_index(self):
+        notes = self.create_field("Notes")
+        self.add_index(notes)
+
+        text = "".join(uuid.uuid4().hex for _ in range(300))
+        page = self.create_page("Write tests", [(notes, text)])
+
+        self.assertEqual(FieldResponse.objects.get(page=page).value_text, text)
+
+    def test_date_indexes_do_not_depend_on_the_active_timezone(self):
+        due = self.create_field("Due", Field.FieldType.DATE)
+        due = Field.objects.with_configs().get(pk=due.pk)
+
+        with timezone.override("Asia/Tokyo"):
+            tokyo_index = build_field_index(due)
+        with timezone.override("America/New_York"):
+            new_york_index = build_field_index(due)
+
+        self.assertEqual(tokyo_index.name, new_york_index.name)
+
+
+class ViewFilterTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.estimate = self.create_field("Estimate", Field.FieldType.NUMBER)
+        self.notes = self.create_field("Notes")
+        self.status = self.create_field("Status", Field.FieldType.CHOICE)
+        self.due = self.create_field("Due", Field.FieldType.DATE)
+        self.view = View.objects.create(database=self.database, label="Filtered")
+        self.create_page("Write tests", [(self.notes, "None")])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def set_stored_filter(self, condition):
+        # Stored before filters were validated, so saved without `View.clean`.
+        View.objects.filter(pk=self.view.pk).update(filter_by=json.dumps(condition))
+
+    def get_responses(self):
+        url = f"/api/views/{self.view.pk}"
+        return [
+            self.client.get(f"{url}/pages/"),
+            self.client.get(f"{url}/aggregate/"),
+            self.client.get(f"{url}/board/", {"group_by": str(self.status.pk)}),
+            self.client.get(
+                f"{url}/calendar/", {"field": str(self.due.pk), "start": "2026-01-01", "end": "2026-01-31"}
+            ),
+        ]
+
+    def assert_rejected(self, condition):
+        self.set_stored_filter(condition)
+
+        for response in self.get_responses():
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.request["PATH_INFO"])
+            self.assertIn("filter_by", response.json())
+
+        self.view.filter_by = json.dumps(condition)
+        with self.assertRaises(ValidationError) as context:
+            self.view.full_clean()
+        self.assertIn("filter_by", context.exception.message_dict)
+
+    def test_comparisons_without_a_value_are_rejected(self):
+        self.assert_rejected({"field": str(self.estimate.pk), "lookup": "gt"})
+        self.assert_rejected({"field": str(self.estimate.pk), "lookup": "lte", "value": None})
+
+    def test_text_comparisons_without_a_value_are_rejected(self):
+        self.assert_rejected({"field": str(self.notes.pk), "lookup": "eq", "value": None})
+
+    def test_page_attribute_comparisons_with_an_invalid_value_are_rejected(self):
+        self.assert_rejected({"field": "created_at", "lookup": "gt", "value": "abc"})
+        self.assert_rejected({"field": "updated_at", "lookup": "lt"})
+
+    def test_valueless_lookups_are_accepted(self):
+        self.view.filter_by = json.dumps({"field": str(self.estimate.pk), "lookup": "is_empty"})
+        self.view.save()
+
+        response = self.client.get(f"/api/views/{self.view.pk}/pages/")
+
+        self.assertEqual([page["title"] for page in response.json()["results"]], ["Write tests"])
+
+
+class ViewResultsTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.status = self.create_field("Status")
+        self.notes = self.create_field("Notes")
+        self.view = View.objects.create(
+            database=self.database,
+            label="Done",
+            filter_by=json.dumps({"field": str(self.status.pk), "lookup": "eq", "value": "Done"}),
+            sort_by=[["title", "asc"]],
+        )
+        self.page = self.create_page("Write tests", [(self.status, "Done")])
+
+    def get_page_ids(self):
+        return list(get_view_results(self.view))
+
+    def test_results_are_cached(self):
+        self.assertEqual(self.get_page_ids(), [self.page.pk])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_page_ids(), [self.page.pk])
+
+    def test_results_are_queried_while_another_request_caches_them(self):
+        key = get_view_results_key(self.view)
+        cache.add(f"{key}:lock", True)
+
+        self.assertEqual(self.get_page_ids(), [self.page.pk])
+        self.assertIsNone(cache.get(key))
+
+    def test_writes_to_referenced_fields_invalidate_the_results(self):
+        other = self.create_page("Review tests", [(self.status, "Todo")])
+        self.assertEqual(self.get_page_ids(), [self.page.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FieldResponseWriter(self.database, self.user).write(
+                [{"page": other.pk, "field": self.status.pk, "value": "Done"}]
+            )
+
+        self.assertEqual(self.get_page_ids(), [other.pk, self.page.pk])
+
+    def test_writes_to_other_fields_keep_the_results(self):
+        key = get_view_results_key(self.view)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FieldResponse.objects.create(page=self.page, field=self.notes, data={"value": "Soon"})
+
+        self.assertEqual(get_view_results_key(self.view), key)
+
+    def test_created_and_deleted_pages_invalidate_the_results(self):
+        self.assertEqual(self.get_page_ids(), [self.page.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.delete()
+
+        self.assertEqual(self.get_page_ids(), [])
+
+    def test_imported_pages_invalidate_the_results(self):
+        self.assertEqual(self.get_page_ids(), [self.page.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DatabaseImporter(self.database, self.user, workers=1).run(
+                io.StringIO("title,Status\nAlso done,Done\n"), "csv"
+            )
+
+        imported = Page.objects.get(title="Also done")
+        self.assertEqual(self.get_page_ids(), [imported.pk, self.page.pk])
+
+
+class ViewAggregateTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.estimate = self.create_field("Estimate", Field.FieldType.NUMBER)
+        self.estimate.config.display_format = NumberFieldConfig.DisplayFormat.INTEGER
+        self.estimate.config.save()
+        self.status = self.create_field("Status", Field.FieldType.CHOICE)
+        self.todo, self.done = [
+            self.status.config.options.create(label=label, value=label) for label in ["Todo", "Done"]
+        ]
+        self.is_urgent = self.create_field("Urgent", Field.FieldType.BOOLEAN)
+        self.create_page(
+            "Write tests", [(self.estimate, 3), (self.status, [str(self.todo.pk)]), (self.is_urgent, True)]
+        )
+        self.create_page(
+            "Review tests", [(self.estimate, 5), (self.status, [str(self.done.pk)]), (self.is_urgent, False)]
+        )
+        self.create_page("Ship", [(self.estimate, 7), (self.is_urgent, True)])
+        self.create_page("Plan", [(self.status, [str(self.todo.pk)])])
+        self.view = View.objects.create(database=self.database, label="Estimates")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def aggregate(self, metrics, **params):
+        estimate = self.estimate.pk
+        metrics = metrics.format(estimate=estimate)
+        return self.client.get(f"/api/views/{self.view.pk}/aggregate/", {"metrics": metrics, **params})
+
+    def get_metrics(self, data):
+        return {key.replace(str(self.estimate.pk), "estimate"): value for key, value in data["metrics"].items()}
+
+    def test_metrics_follow_the_display_format(self):
+        response = self.aggregate("count,count:{estimate},sum:{estimate},avg:{estimate},min:{estimate},max:{estimate}")
+
+        self.assertEqual(
+            self.get_metrics(response.json()),
+            {
+                "count": 4,
+                "count:estimate": 3,
+                "sum:estimate": 15,
+                "avg:estimate": 5.0,
+                "min:estimate": 3,
+                "max:estimate": 7,
+            },
+        )
+        self.assertIsInstance(response.json()["metrics"][f"sum:{self.estimate.pk}"], int)
+
+    def test_metrics_respect_the_filter_of_the_view(self):
+        self.view.filter_by = json.dumps({"field": str(self.estimate.pk), "lookup": "gt", "value": 3})
+        self.view.save()
+
+        response = self.aggregate("count,sum:{estimate}")
+
+        self.assertEqual(self.get_metrics(response.json()), {"count": 2, "sum:estimate": 12})
+
+    def test_pages_are_grouped_by_choice_option(self):
+        response = self.aggregate("count,sum:{estimate}", group_by=str(self.status.pk))
+
+        self.assertEqual(
+            [(group["value"], group["label"], self.get_metrics(group)) for group in response.json()["groups"]],
+            [
+                (str(self.todo.pk), "Todo", {"count": 2, "sum:estimate": 3}),
+                (str(self.done.pk), "Done", {"count": 1, "sum:estimate": 5}),
+                (None, None, {"count": 1, "sum:estimate": 7}),
+            ],
+        )
+        self.assertEqual(self.get_metrics(response.json()), {"count": 4, "sum:estimate": 15})
+
+    def test_pages_are_grouped_by_boolean_value_unset_as_false(self):
+        response = self.aggregate("count,sum:{estimate}", group_by=str(self.is_urgent.pk))
+
+        self.assertEqual(
+            [(group["value"], self.get_metrics(group)) for group in response.json()["groups"]],
+            [
+                (True, {"count": 2, "sum:estimate": 10}),
+                (False, {"count": 2, "sum:estimate": 5}),
+            ],
+        )
+
+    def test_unsupported_metrics_are_rejected(self):
+        response = self.aggregate(f"sum:{self.status.pk}")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"metrics": ["Aggregate 'sum' requires a number field"]})
+
+
+class ViewCalendarTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.due = self.create_field("Due", Field.FieldType.DATE)
+        self.view = View.objects.create(
+            database=self.database, label="Calendar", view_type=View.ViewType.CALENDAR, calendar_field=self.due
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def set_display_format(self, display_format):
+        self.due.config.display_format = display_format
+        self.due.config.save()
+
+    def get_calendar(self, start, end, **params):
+        response = self.client.get(f"/api/views/{self.view.pk}/calendar/", {"start": start, "end": end, **params})
+        return [(page["title"], page["calendar_value"]) for page in response.json()["results"]]
+
+    def test_dates_are_matched_by_day(self):
+        self.create_page("Review", [(self.due, "2026-03-15T18:00:00+00:00")])
+        self.create_page("Plan", [(self.due, "2026-03-01T00:00:00+00:00")])
+        self.create_page("Ship", [(self.due, "2026-04-01T00:00:00+00:00")])
+        self.create_page("Someday")
+
+        self.assertEqual(
+            self.get_calendar("2026-03-01", "2026-03-31"), [("Plan", "2026-03-01"), ("Review", "2026-03-15")]
+        )
+
+    def test_date_times_are_matched_by_day_of_the_timezone(self):
+        self.set_display_format(DateFieldConfig.DisplayFormat.DATE_TIME)
+        self.create_page("Plan", [(self.due, "2026-02-28T23:30:00+00:00")])
+        self.create_page("Ship", [(self.due, "2026-03-31T23:30:00+00:00")])
+
+        self.assertEqual(
+            self.get_calendar("2026-03-01", "2026-03-31", timezone="Europe/Paris"),
+            [("Plan", "2026-03-01T00:30:00+01:00")],
+        )
+        self.assertEqual(self.get_calendar("2026-03-01", "2026-03-31"), [("Ship", "2026-03-31T23:30:00+00:00")])
+
+    def test_times_are_matched_by_time_of_day(self):
+        self.set_display_format(DateFieldConfig.DisplayFormat.TIME)
+        self.create_page("Standup", [(self.due, "2026-03-01T09:30:00+00:00")])
+        self.create_page("Review", [(self.due, "2026-03-02T18:00:00+00:00")])
+
+        self.assertEqual(self.get_calendar("09:00", "12:00"), [("Standup", "09:30:00")])
+
+    def test_invalid_windows_and_fields_are_rejected(self):
+        notes = self.create_field("Notes")
+        url = f"/api/views/{self.view.pk}/calendar/"
+
+        response = self.client.get(url, {"start": "2026-03-31", "end": "2026-03-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"end": ["End must not be before start"]})
+
+        response = self.client.get(url, {"start": "2026-03-01", "end": "2026-03-31", "field": str(notes.pk)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"field": ["Pages can only be placed on a calendar by a date field"]})
+
+
+class ViewBoardQueryTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        status = self.create_field("Status", Field.FieldType.CHOICE)
+        self.todo = status.config.options.create(label="Todo", value="todo")
+        self.done = status.config.options.create(label="Done", value="done")
+        self.status = Field.objects.with_configs().get(pk=status.pk)
+
+    def get_columns(self, column=None):
+        columns = ViewBoardQuery(self.page_view, str(self.status.pk)).get_columns(10, column)
+        return {column["label"]: [page.title for page in column["pages"]] for column in columns}
+
+    def test_pages_are_placed_in_the_column_of_their_first_option(self):
+        self.create_page("Write tests", [(self.status, [str(self.todo.pk)])])
+        self.create_page("Review tests", [(self.status, [str(self.done.pk)])])
+        self.create_page("Ship")
+
+        self.assertEqual(self.get_columns(), {"Todo": ["Write tests"], "Done": ["Review tests"], None: ["Ship"]})
+
+    def test_pages_of_deleted_options_are_placed_in_the_empty_column(self):
+        self.create_page("Write tests", [(self.status, [str(self.todo.pk)])])
+        self.create_page("Review tests", [(self.status, [str(self.done.pk)])])
+        self.done.delete()
+        self.status = Field.objects.with_configs().get(pk=self.status.pk)
+
+        self.assertEqual(self.get_columns(), {"Todo": ["Write tests"], None: ["Review tests"]})
+        self.assertEqual(self.get_columns(ViewBoardQuery.EMPTY_COLUMN), {None: ["Review tests"]})
+
+
+class AblyStandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers["Content-Type"].startswith("application/x-msgpack"):
+            body = msgpack.unpackb(body)
+        else:
+            body = json.loads(body)
+
+        self.server.requests.append({"path": self.path, "body": body, "unlocked": self.server.count_unlocked()})
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+class AblyStandIn(ThreadingHTTPServer):
+    """
+    A local stand-in of the REST API of Ably, recording the requests it receives, and the number of
+    changes other publishers could lock while it received them.
+    """
+
+    def __init__(self):
+        super().__init__(("localhost", 0), AblyStandInHandler)
+        self.requests = []
+        self.status = 201
+
+    def count_unlocked(self):
+        try:
+            with transaction.atomic():
+                return RealtimeChange.objects.select_for_update(skip_locked=True).count()
+        finally:
+            connection.close()
+
+    def get_client(self):
+        return AblyRestSync(key="app.key:secret", rest_host="localhost", tls=False, port=self.server_address[1])
+
+
+class ChangePublisherTests(TransactionTestCase):
+    def setUp(self):
+        self.stand_in = AblyStandIn()
+        threading.Thread(target=self.stand_in.serve_forever, daemon=True).start()
+        self.addCleanup(self.stand_in.server_close)
+        self.addCleanup(self.stand_in.shutdown)
+        self.publisher = ChangePublisher(client=self.stand_in.get_client())
+
+        user = User.objects.create_user(username="ada@example.com", email="ada@example.com", password="password")
+        self.database = Database.objects.create(workspace=user.default_workspace, name="Tasks")
+        RealtimeChange.objects.all().delete()
+
+    def get_messages(self):
+        messages = {}
+        for request in self.stand_in.requests:
+            for item in request["body"]:
+                (channel,) = item["channels"]
+                (message,) = item["messages"]
+                self.assertEqual(message["name"], ChangePublisher.MESSAGE_NAME)
+                messages[channel] = message["data"]
+
+        return messages
+
+    def test_bursts_are_posted_as_one_message_per_database(self):
+        page = Page.objects.create(database=self.database, title="Write tests")
+        page.title = "Write more tests"
+        page.save()
+        other = Page.objects.create(database=self.database, title="Review tests")
+        other_id = other.pk
+        other.delete()
+
+        self.assertEqual(self.publisher.publish_pending(), 4)
+
+        (request,) = self.stand_in.requests
+        self.assertEqual(request["path"], "/messages")
+        changes = self.get_messages()[get_database_channel(self.database.pk)]["changes"]
+        self.assertEqual(
+            [(change["id"], change["action"]) for change in changes],
+            [(str(page.pk), RealtimeChange.Action.CREATED), (str(other_id), RealtimeChange.Action.DELETED)],
+        )
+        self.assertFalse(RealtimeChange.objects.exists())
+
+    def test_changes_are_not_locked_while_they_are_posted(self):
+        record_page_changes([uuid.uuid4() for _ in range(3)], self.database.pk)
+
+        self.publisher.publish_pending()
+
+        self.assertEqual([request["unlocked"] for request in self.stand_in.requests], [3])
+
+    def test_databases_are_posted_in_batches_of_channels(self):
+        database_ids = [uuid.uuid4() for _ in range(3)]
+        for database_id in database_ids:
+            record_page_changes([uuid.uuid4()], database_id)
+
+        with mock.patch("core.realtime.MAX_BATCH_CHANNELS", 2):
+            self.publisher.publish_pending()
+
+        self.assertEqual([len(request["body"]) for request in self.stand_in.requests], [2, 1])
+        self.assertEqual(set(self.get_messages()), {get_database_channel(database_id) for database_id in database_ids})
+
+    def test_large_bursts_are_truncated(self):
+        record_page_changes([uuid.uuid4() for _ in range(MAX_MESSAGE_CHANGES + 1)], self.database.pk)
+
+        self.publisher.publish_pending()
+
+        message = self.get_messages()[get_database_channel(self.database.pk)]
+        self.assertEqual(message, {"changes": [], "truncated": True})
+
+    def test_changes_are_released_when_posting_fails(self):
+        record_page_changes([uuid.uuid4()], self.database.pk)
+        self.stand_in.status = 500
+
+        with self.assertRaises(AblyException):
+            self.publisher.publish_pending()
+
+        change = RealtimeChange.objects.get()
+        self.assertIsNone(change.claimed_until)
+
+    def test_changes_claimed_by_another_publisher_wait_for_their_lease(self):
+        record_page_changes([uuid.uuid4()], self.database.pk)
+        ChangePublisher(client=self.stand_in.get_client()).claim()
+
+        self.assertEqual(self.publisher.publish_pending(), 0)
+
+        RealtimeChange.objects.update(claimed_until=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertEqual(self.publisher.publish_pending(), 1)
+
+
+class ConditionalGetTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, etag=None):
+        headers = {"If-None-Match": etag} if etag is not None else {}
+        return self.client.get(url, headers=headers)
+
+    def test_unchanged_lists_are_answered_with_304_without_queries(self):
+        etag = self.get("/api/databases/")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.get("/api/databases/", etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_writes_change_the_etag(self):
+        etag = self.get("/api/pages/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_page("Write tests")
+        response = self.get("/api/pages/", etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_deletions_change_the_etag(self):
+        page = self.create_page("Write tests")
+        etag = self.get(f"/api/pages/{page.pk}/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            page.delete()
+
+        self.assertEqual(self.get(f"/api/pages/{page.pk}/", etag).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_written_responses_change_the_etag(self):
+        status_field = self.create_field("Status")
+        page = self.create_page("Write tests")
+        etag = self.get(f"/api/pages/{page.pk}/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FieldResponseWriter(self.database, self.user).write(
+                [{"page": page.pk, "field": status_field.pk, "value": "Done"}]
+            )
+
+        self.assertEqual(self.get(f"/api/pages/{page.pk}/", etag).status_code, status.HTTP_200_OK)
+
+    def test_imported_pages_change_the_etag(self):
+        self.create_field("Status")
+        etag = self.get("/api/pages/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DatabaseImporter(self.database, self.user, workers=1).run(
+                io.StringIO("title,Status\nWrite tests,Done\n"), "csv"
+            )
+        response = self.get("/api/pages/", etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([page["title"] for page in response.json()["results"]], ["Write tests"])
+
+    def test_etags_depend_on_the_url(self):
+        page = self.create_page("Write tests")
+        etag = self.get("/api/pages/")["ETag"]
+
+        self.assertEqual(self.get(f"/api/pages/{page.pk}/", etag).status_code, status.HTTP_200_OK)
+
+
+class CursorPaginationTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_all_pages(self, url, on_page=None):
+        titles = []
+        while url is not None:
+            data = self.client.get(url).json()
+            titles.extend(page["title"] for page in data["results"])
+            if on_page is not None:
+                on_page()
+            url = data["next"]
+
+        return titles
+
+    def test_pages_sharing_their_creation_time_are_listed_once(self):
+        pages = [self.create_page(f"Page {index}") for index in range(5)]
+        # Pages copied by an import share their creation time.
+        Page.objects.update(created_at=timezone.now())
+
+        titles = self.get_all_pages("/api/pages/?page_size=2")
+
+        expected = sorted(pages, key=lambda page: page.pk, reverse=True)
+        self.assertEqual(titles, [page.title for page in expected])
+
+    def test_pages_created_while_paginating_do_not_shift_the_next_pages(self):
+        for index in range(4):
+            page = self.create_page(f"Page {index}")
+            Page.objects.filter(pk=page.pk).update(created_at=timezone.now() - datetime.timedelta(minutes=index))
+
+        titles = self.get_all_pages("/api/pages/?page_size=2", on_page=lambda: self.create_page("New"))
+
+        self.assertEqual(titles, ["Page 0", "Page 1", "Page 2", "Page 3"])
+
+
+def guard_blocking_cache_calls(local_store):
+    """
+    Fail the calls of the shared cache made from a running event loop, the local cache is in-process.
+    """
+
+    def guard(method):
+        def call(cache, *args, **kwargs):
+            if cache._cache is not local_store:
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    pass
+                else:
+                    raise AssertionError(f"Blocking cache.{method.__name__}() on the event loop")
+
+            return method(cache, *args, **kwargs)
+
+        return call
+
+    methods = ["get", "set", "add", "get_many", "set_many"]
+    return [mock.patch.object(LocMemCache, name, guard(getattr(LocMemCache, name))) for name in methods]
+
+
+class AsyncReadTests(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        caches["local"].clear()
+        get_access_token_model().objects.create(
+            user=self.user,
+            token="token",
+            scope="read write",
+            expires=timezone.now() + datetime.timedelta(hours=1),
+        )
+        self.headers = {"Authorization": "Bearer token"}
+        # The first request authenticates from the token table in the sync view, and caches the token.
+        self.client.get("/api/databases/", headers=self.headers)
+
+    async def test_cached_tokens_are_served_without_blocking_cache_calls(self):
+        patches = guard_blocking_cache_calls(caches["local"]._cache)
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        response = await self.async_client.get("/api/databases/", headers=self.headers)
+        not_modified = await self.async_client.get(
+            "/api/databases/", headers={**self.headers, "If-None-Match": response["ETag"]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([database["id"] for database in response.json()["results"]], [str(self.database.pk)])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class StreamContentTests(TestCase):
+    def test_wsgi_requests_stream_the_lines_as_is(self):
+        lines = iter(["a\n", "b\n"])
+
+        self.assertIs(stream_content(RequestFactory().get("/"), lines), lines)
+
+    def test_asgi_requests_pull_the_lines_in_chunks(self):
+        pulled = []
+
+        def lines():
+            for index in range(5):
+                pulled.append(index)
+                yield f"{index}\n"
+
+        content = stream_content(AsyncRequestFactory().get("/"), lines(), chunk_size=2)
+
+        async def read_first_chunk():
+            return await content.__anext__()
+
+        self.assertEqual(asyncio.run(read_first_chunk()), "0\n1\n")
+        self.assertEqual(pulled, [0, 1])
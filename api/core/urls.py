@@ -1,14 +1,16 @@
 from django.urls import include, re_path
 from rest_framework import routers
 
-from .views import DatabaseViewSet, ViewViewSet, PageViewSet, FieldViewSet
+from .views import DatabaseImportViewSet, DatabaseViewSet, ViewViewSet, PageViewSet, FieldViewSet, QuickSwitchViewSet
 
 router = routers.SimpleRouter()
 
 router.register(r"databases", DatabaseViewSet, basename="databases")
+router.register(r"database-imports", DatabaseImportViewSet, basename="database-imports")
 router.register(r"views", ViewViewSet, basename="views")
 router.register(r"pages", PageViewSet, basename="pages")
 router.register(r"fields", FieldViewSet, basename="fields")
+router.register(r"quick-switch", QuickSwitchViewSet, basename="quick-switch")
 
 
 urlpatterns = [
@@ -0,0 +1,92 @@
+import uuid
+
+
+def to_reference_id(item):
+    try:
+        return uuid.UUID(str(item))
+    except ValueError:
+        return None
+
+
+def get_reference_ids(data):
+    """
+    Parameters:
+        - data (any): A response value holding a list of referenced IDs.
+
+    Returns:
+        - set[UUID]: The well formed IDs of the list, malformed items are left out.
+    """
+    if not isinstance(data, list):
+        return set()
+
+    ids = {to_reference_id(item) for item in data}
+    ids.discard(None)
+    return ids
+
+
+class ResponseValidationContext:
+    """
+    Resolve the IDs referenced by response values (choice options, attachments and pages) in bulk,
+    and cache them for the lifetime of the context, eg. a request or a batch of writes.
+
+    Choice options are loaded once per `ChoiceFieldConfig`. Other references are looked up with one
+    `pk__in` query per batch of unseen IDs, so validating and deserializing many values that point to
+    the same objects does not query them again.
+    """
+
+    def __init__(self):
+        self._choice_options = {}
+        self._objects = {}
+        self._checked_ids = {}
+
+    def get_choice_options(self, config):
+        """
+        Parameters:
+            - config (ChoiceFieldConfig): The config to load the options of.
+
+        Returns:
+            - dict[UUID, ChoiceFieldOption]: The options of the config by ID.
+        """
+        if config.pk not in self._choice_options:
+            self._choice_options[config.pk] = {option.pk: option for option in config.options.all()}
+
+        return self._choice_options[config.pk]
+
+    def get_objects(self, key, queryset, ids):
+        """
+        Parameters:
+            - key (hashable): The cache key of the queryset, eg. `("page", database_id)`.
+            - queryset (QuerySet): The objects the IDs may reference.
+            - ids (set[UUID]): The referenced IDs.
+
+        Returns:
+            - dict[UUID, Model]: The referenced objects that exist, by ID.
+        """
+        objects = self._objects.setdefault(key, {})
+        checked_ids = self._checked_ids.setdefault(key, set())
+
+        unchecked_ids = ids - checked_ids
+        if len(unchecked_ids) > 0:
+            objects.update(queryset.in_bulk(unchecked_ids))
+            checked_ids.update(unchecked_ids)
+
+        return {pk: objects[pk] for pk in ids if pk in objects}
+
+    def prefetch(self, config, values):
+        """
+        Resolve the references of a batch of values of the same field at once, so validating each
+        value afterwards is served from the cache.
+
+        Parameters:
+            - config (BaseModel): The field config the values belong to.
+            - values (list[any]): The response values.
+        """
+        resolve_fn = getattr(config, "resolve_response_references", None)
+        if resolve_fn is None:
+            return
+
+        ids = set()
+        for value in values:
+            ids.update(get_reference_ids(value))
+
+        resolve_fn(ids, self)
@@ -1,13 +1,55 @@
 # Create your views here.
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import mixins, permissions, viewsets
+from django.core.exceptions import ValidationError
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.utils.text import slugify
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
+from api.async_views import AsyncReadMixin, stream_content
+from api.etags import ConditionalGetMixin
 from docs.tags import SchemaTags
+from organizations.memberships import get_workspace_ids
 
+from .exports import DatabaseExport
 from .filters import DatabaseFilter
-from .models import Database, Page, View, Field
-from .serializers import DatabaseSerializer, PageSerializer, ViewSerializer, FieldSerializer
+from .imports import start_database_import
+from .models import Database, DatabaseImport, Page, PageRelation, View, Field
+from .pagination import BoardColumnPagination, ViewPagesPagination
+from .queries import ViewAggregateQuery, ViewBoardQuery, ViewCalendarQuery
+from .renderers import CSVRenderer, NDJSONRenderer
+from .results import get_view_results
+from .search import quick_switch
+from .serializers import (
+    CalendarPageSerializer,
+    DatabaseImportCreateSerializer,
+    DatabaseImportSerializer,
+    DatabaseSerializer,
+    FieldResponseBulkResultSerializer,
+    FieldResponseBulkSerializer,
+    PageBacklinkSerializer,
+    PageSerializer,
+    QuickSwitchQuerySerializer,
+    QuickSwitchResultSerializer,
+    ViewAggregateQuerySerializer,
+    ViewAggregateResultSerializer,
+    ViewBoardQuerySerializer,
+    ViewBoardSerializer,
+    ViewCalendarQuerySerializer,
+    ViewSerializer,
+    FieldSerializer,
+)
+from .writers import FieldResponseWriter
+
+
+def get_error_data(e):
+    # Errors raised by Django while building a query are not keyed by field.
+    return e.message_dict if hasattr(e, "error_dict") else {"filter": e.messages}
 
 
 @extend_schema(tags=[SchemaTags.CORE__DATABASE.value])
@@ -18,8 +60,30 @@ from .serializers import DatabaseSerializer, PageSerializer, ViewSerializer, Fie
     update=extend_schema(summary="Update Database"),
     partial_update=extend_schema(summary="Partial Update Database"),
     destroy=extend_schema(summary="Delete Database"),
+    bulk_responses=extend_schema(
+        summary="Bulk Write Field Responses",
+        request=FieldResponseBulkSerializer,
+        responses=FieldResponseBulkResultSerializer,
+    ),
+    export=extend_schema(
+        summary="Export Database Pages",
+        parameters=[
+            OpenApiParameter("format", str, enum=["csv", "ndjson"], description="Format of the exported rows"),
+        ],
+        responses={
+            (200, CSVRenderer.media_type): OpenApiTypes.STR,
+            (200, NDJSONRenderer.media_type): OpenApiTypes.STR,
+        },
+    ),
+    import_pages=extend_schema(
+        summary="Import Database Pages",
+        request={"multipart/form-data": DatabaseImportCreateSerializer},
+        responses={202: DatabaseImportSerializer},
+    ),
 )
 class DatabaseViewSet(
+    AsyncReadMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -27,15 +91,84 @@ class DatabaseViewSet(
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
-    queryset = Database.objects.all()
+    # Loads everything the serializer reads, so it can run on the event loop.
+    queryset = Database.objects.select_related("created_by", "updated_by").prefetch_related("views")
     serializer_class = DatabaseSerializer
     permission_classes = [permissions.IsAuthenticated]
+    async_serialization = True
 
     filter_backends = [DjangoFilterBackend]
     filterset_class = DatabaseFilter
 
     def get_queryset(self):
-        return self.queryset.filter(workspace__members=self.request.user)
+        return self.queryset.filter(workspace_id__in=self.get_workspace_ids())
+
+    @action(detail=True, methods=["post"], url_path="responses:bulk")
+    def bulk_responses(self, request, pk=None):
+        database = self.get_object()
+
+        serializer = FieldResponseBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        writer = FieldResponseWriter(database, request.user)
+        written, errors = writer.write(serializer.validated_data["cells"])
+
+        return Response(FieldResponseBulkResultSerializer({"written": written, "errors": errors}).data)
+
+    @action(detail=True, methods=["get"], url_path="export", renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, pk=None):
+        database = self.get_object()
+
+        export = DatabaseExport(database)
+        renderer = request.accepted_renderer
+        rows = export.iter_ndjson() if renderer.format == NDJSONRenderer.format else export.iter_csv()
+
+        response = StreamingHttpResponse(
+            stream_content(request._request, rows), content_type=f"{renderer.media_type}; charset={renderer.charset}"
+        )
+        filename = f"{slugify(database.name) or database.pk}.{renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=True, methods=["post"], url_path="import", parser_classes=[MultiPartParser])
+    def import_pages(self, request, pk=None):
+        database = self.get_object()
+
+        serializer = DatabaseImportCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        database_import = DatabaseImport.objects.create(
+            database=database,
+            file=serializer.validated_data["file"],
+            format=serializer.validated_data["format"],
+            created_by=request.user,
+            updated_by=request.user,
+        )
+        start_database_import(database_import)
+
+        return Response(DatabaseImportSerializer(database_import).data, status=status.HTTP_202_ACCEPTED)
+
+
+@extend_schema(tags=[SchemaTags.CORE__DATABASE.value])
+@extend_schema_view(
+    list=extend_schema(summary="List Database Imports"),
+    retrieve=extend_schema(summary="Retrieve Database Import"),
+)
+class DatabaseImportViewSet(
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = DatabaseImport.objects.all()
+    serializer_class = DatabaseImportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["database", "status"]
+
+    def get_queryset(self):
+        return self.queryset.filter(database__workspace_id__in=get_workspace_ids(self.request.user))
 
 
 @extend_schema(tags=[SchemaTags.CORE__VIEW.value])
@@ -46,8 +179,54 @@ class DatabaseViewSet(
     update=extend_schema(summary="Update View"),
     partial_update=extend_schema(summary="Partial Update View"),
     destroy=extend_schema(summary="Delete View"),
+    pages=extend_schema(
+        summary="List View Pages",
+        parameters=[
+            OpenApiParameter("limit", int, description="Number of pages to return"),
+            OpenApiParameter("offset", int, description="Index of the first page to return"),
+        ],
+        responses=PageSerializer(many=True),
+    ),
+    aggregate=extend_schema(
+        summary="Aggregate View Pages",
+        parameters=[
+            OpenApiParameter(
+                "metrics",
+                str,
+                description="Comma separated `count`, or `count`, `sum`, `avg`, `min` or `max` and a field ID, "
+                "eg. `count,sum:<field>`",
+            ),
+            OpenApiParameter("group_by", str, description="ID of a choice or boolean field to group pages by"),
+        ],
+        responses=ViewAggregateResultSerializer,
+    ),
+    board=extend_schema(
+        summary="List View Pages By Column",
+        parameters=[
+            OpenApiParameter("group_by", str, required=True, description="ID of the choice field to group pages by"),
+            OpenApiParameter("limit", int, description="Number of pages to return per column"),
+            OpenApiParameter("cursor", str, description="Cursor of a column, to load its following pages"),
+        ],
+        responses=ViewBoardSerializer,
+    ),
+    calendar=extend_schema(
+        summary="List View Pages By Date",
+        parameters=[
+            OpenApiParameter(
+                "field", str, description="ID of the date field, the calendar field of the view by default"
+            ),
+            OpenApiParameter("start", str, required=True, description="First day of the window, or time of day"),
+            OpenApiParameter("end", str, required=True, description="Last day of the window, or time of day"),
+            OpenApiParameter("timezone", str, description="Timezone of the days of the window, UTC by default"),
+            OpenApiParameter("limit", int, description="Number of pages to return"),
+            OpenApiParameter("offset", int, description="Index of the first page to return"),
+        ],
+        responses=CalendarPageSerializer(many=True),
+    ),
 )
 class ViewViewSet(
+    AsyncReadMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -60,7 +239,80 @@ class ViewViewSet(
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(database__workspace__members=self.request.user)
+        return self.queryset.filter(database__workspace_id__in=self.get_workspace_ids())
+
+    @action(detail=True, methods=["get"], url_path="pages", pagination_class=ViewPagesPagination)
+    def pages(self, request, pk=None):
+        view = self.get_object()
+
+        try:
+            results = get_view_results(view)
+        except ValidationError as e:
+            return Response(get_error_data(e), status=status.HTTP_400_BAD_REQUEST)
+
+        page_ids = self.paginate_queryset(results)
+        pages = Page.objects.prefetch_related("attachments").in_bulk(page_ids)
+        # Pages deleted since their view results were cached are skipped.
+        pages = [pages[page_id] for page_id in page_ids if page_id in pages]
+        serializer = PageSerializer(pages, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"], url_path="aggregate")
+    def aggregate(self, request, pk=None):
+        view = self.get_object()
+
+        serializer = ViewAggregateQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            query = ViewAggregateQuery(
+                view, serializer.validated_data["metrics"], serializer.validated_data.get("group_by")
+            )
+            results = query.get_results()
+        except ValidationError as e:
+            return Response(get_error_data(e), status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(ViewAggregateResultSerializer(results).data)
+
+    @action(detail=True, methods=["get"], url_path="calendar", pagination_class=ViewPagesPagination)
+    def calendar(self, request, pk=None):
+        view = self.get_object()
+
+        serializer = ViewCalendarQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        tz = serializer.validated_data["timezone"]
+
+        try:
+            query = ViewCalendarQuery(view, serializer.validated_data.get("field"))
+            queryset = query.get_queryset(serializer.validated_data["start"], serializer.validated_data["end"], tz)
+        except ValidationError as e:
+            return Response(get_error_data(e), status=status.HTTP_400_BAD_REQUEST)
+
+        pages = self.paginate_queryset(queryset.prefetch_related("attachments"))
+        context = {**self.get_serializer_context(), "timezone": tz}
+        return self.get_paginated_response(CalendarPageSerializer(pages, many=True, context=context).data)
+
+    @action(detail=True, methods=["get"], url_path="board")
+    def board(self, request, pk=None):
+        view = self.get_object()
+
+        serializer = ViewBoardQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        column, offset = serializer.validated_data.get("cursor", (None, 0))
+
+        try:
+            query = ViewBoardQuery(view, serializer.validated_data["group_by"])
+            columns = query.get_columns(serializer.validated_data["limit"], column, offset)
+        except ValidationError as e:
+            return Response(get_error_data(e), status=status.HTTP_400_BAD_REQUEST)
+
+        prefetch_related_objects([page for column in columns for page in column["pages"]], "attachments")
+        pagination = BoardColumnPagination()
+        for column in columns:
+            column["next"] = pagination.get_next_link(request, column)
+
+        serializer = ViewBoardSerializer({"columns": columns}, context=self.get_serializer_context())
+        return Response(serializer.data)
 
 
 @extend_schema(tags=[SchemaTags.CORE__PAGE.value])
@@ -71,8 +323,11 @@ class ViewViewSet(
     update=extend_schema(summary="Update Page"),
     partial_update=extend_schema(summary="Partial Update Page"),
     destroy=extend_schema(summary="Delete Page"),
+    backlinks=extend_schema(summary="List Page Backlinks", responses=PageBacklinkSerializer(many=True)),
 )
 class PageViewSet(
+    AsyncReadMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -80,12 +335,27 @@ class PageViewSet(
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
-    queryset = Page.objects.all()
+    queryset = Page.objects.prefetch_related("attachments")
     serializer_class = PageSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(database__workspace__members=self.request.user)
+        return self.queryset.filter(database__workspace_id__in=self.get_workspace_ids())
+
+    @action(detail=True, methods=["get"], url_path="backlinks")
+    def backlinks(self, request, pk=None):
+        page = self.get_object()
+
+        relations = (
+            PageRelation.objects.filter(
+                target_page=page,
+                source_page__database__workspace_id__in=self.get_workspace_ids(),
+            )
+            .select_related("source_page")
+            .order_by("field_id", "source_page__created_at", "source_page_id")
+        )
+        serializer = PageBacklinkSerializer(relations, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
 
 
 @extend_schema(tags=[SchemaTags.CORE__FIELD.value])
@@ -98,6 +368,8 @@ class PageViewSet(
     destroy=extend_schema(summary="Delete Field"),
 )
 class FieldViewSet(
+    AsyncReadMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -105,9 +377,32 @@ class FieldViewSet(
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
-    queryset = Field.objects.all()
+    queryset = Field.objects.with_configs().select_related("created_by", "updated_by")
     serializer_class = FieldSerializer
     permission_classes = [permissions.IsAuthenticated]
+    async_serialization = True
 
     def get_queryset(self):
-        return self.queryset.filter(database__workspace__members=self.request.user)
+        return self.queryset.filter(database__workspace_id__in=self.get_workspace_ids())
+
+
+@extend_schema(tags=[SchemaTags.CORE__SEARCH.value])
+@extend_schema_view(
+    list=extend_schema(
+        summary="Quick Switch",
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Partial name of a database, view or page"),
+            OpenApiParameter("limit", int, description="Number of matches to return, at most 50"),
+        ],
+        responses=QuickSwitchResultSerializer(many=True),
+    ),
+)
+class QuickSwitchViewSet(ConditionalGetMixin, viewsets.ViewSet):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        serializer = QuickSwitchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        matches = quick_switch(request.user, serializer.validated_data["q"], serializer.validated_data["limit"])
+        return Response(QuickSwitchResultSerializer(matches, many=True).data)
@@ -0,0 +1,177 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from api.etags import bump_workspace_versions
+
+from .models import FieldResponse, Page, PageRelation, RealtimeChange
+from .realtime import record_response_changes
+from .results import bump_field_versions
+from .schema import get_database_schema
+from .validation import ResponseValidationContext
+
+
+class FieldResponseWriter:
+    """
+    Validate and upsert a batch of field response cells for the pages of a database.
+
+    Pages are resolved with one query, fields come from the cached database schema, and the IDs
+    referenced by the values of each field (choice options, attachments and pages) are resolved with
+    one query per field config. Every cell is then validated against the config of its field, and the
+    valid cells are written with one `INSERT ... ON CONFLICT (page_id, field_id) DO UPDATE` statement
+    per batch, using the `unique_field_response` constraint. Invalid cells are skipped and reported,
+    so the rest of the batch is still written.
+
+    Conflicting rows keep their ID, which `bulk_create` does not return for objects with a primary key,
+    so the IDs of the written responses are read back afterwards to tell created and updated ones apart.
+
+    When the same page and field appear more than once, the last cell wins.
+
+    Parameters:
+        - database (Database): The database the pages and fields must belong to.
+        - user (User): The user writing the responses.
+        - batch_size (int): The number of rows per `INSERT` statement.
+    """
+
+    UPDATE_FIELDS = ["data", *FieldResponse.TYPED_VALUE_COLUMNS, "updated_at", "updated_by"]
+
+    def __init__(self, database, user, batch_size=1000):
+        self.database = database
+        self.user = user
+        self.batch_size = batch_size
+
+    def write(self, cells):
+        """
+        Parameters:
+            - cells (list[dict]): The cells to write, as `{"page": UUID, "field": UUID, "value": any}`.
+
+        Returns:
+            - tuple[int, list[dict]]: The number of written responses and the errors of the invalid
+              cells, as `{"index": int, "page": UUID, "field": UUID, "errors": dict}`.
+        """
+        pages = self._load_page_ids(cells)
+        fields = get_database_schema(self.database.pk).fields
+
+        # Only the last cell of a page and field pair is written, a single statement cannot update
+        # the same row twice.
+        latest_cells = {}
+        for index, cell in enumerate(cells):
+            latest_cells[(cell["page"], cell["field"])] = index
+
+        indexes = sorted(latest_cells.values())
+        context = self._prefetch_references([cells[index] for index in indexes], fields)
+
+        responses = []
+        errors = []
+        for index in indexes:
+            cell = cells[index]
+            try:
+                responses.append(self._build_response(cell, pages, fields, context))
+            except ValidationError as e:
+                errors.append(
+                    {
+                        "index": index,
+                        "page": cell["page"],
+                        "field": cell["field"],
+                        "errors": e.message_dict,
+                    }
+                )
+
+        with transaction.atomic():
+            FieldResponse.objects.bulk_create(
+                responses,
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=["page", "field"],
+                update_fields=self.UPDATE_FIELDS,
+            )
+            created, updated = self._load_response_ids(responses)
+            PageRelation.objects.sync_responses(responses)
+
+            text_page_ids = {response.page_id for response in responses if response.value_text is not None}
+            if len(text_page_ids) > 0:
+                Page.objects.filter(pk__in=text_page_ids).update_search_vectors()
+
+            # Bulk writes send no signals, the results of the views referencing the fields and the
+            # ETags of the workspace are invalidated, and the realtime changes recorded, here.
+            field_ids = {response.field_id for response in responses}
+            bump_field_versions(field_ids)
+            transaction.on_commit(lambda: bump_field_versions(field_ids))
+            transaction.on_commit(lambda: bump_workspace_versions([self.database.workspace_id]))
+            record_response_changes(created, self.database.pk, RealtimeChange.Action.CREATED)
+            record_response_changes(updated, self.database.pk, RealtimeChange.Action.UPDATED)
+
+        return len(responses), errors
+
+    def _load_response_ids(self, responses):
+        """
+        Set the stored IDs of upserted responses.
+
+        Returns:
+            - tuple[list[FieldResponse], list[FieldResponse]]: The created and the updated responses.
+        """
+        if len(responses) == 0:
+            return [], []
+
+        stored_ids = FieldResponse.objects.filter(
+            page_id__in={response.page_id for response in responses},
+            field_id__in={response.field_id for response in responses},
+        ).values_list("page_id", "field_id", "pk")
+        ids = {(page_id, field_id): pk for page_id, field_id, pk in stored_ids}
+
+        created = []
+        updated = []
+        for response in responses:
+            stored_id = ids[(response.page_id, response.field_id)]
+            if stored_id == response.pk:
+                created.append(response)
+            else:
+                response.pk = stored_id
+                updated.append(response)
+
+        return created, updated
+
+    def _load_page_ids(self, cells):
+        page_ids = {cell["page"] for cell in cells}
+        return set(Page.objects.filter(database=self.database, pk__in=page_ids).values_list("pk", flat=True))
+
+    def _prefetch_references(self, cells, fields):
+        values_by_field = {}
+        for cell in cells:
+            if cell["field"] in fields:
+                values_by_field.setdefault(cell["field"], []).append(cell["value"])
+
+        context = ResponseValidationContext()
+        for field_id, values in values_by_field.items():
+            config = fields[field_id].config
+            if config is not None:
+                context.prefetch(config, values)
+
+        return context
+
+    def _build_response(self, cell, pages, fields, context):
+        if cell["page"] not in pages:
+            raise ValidationError({"page": "Page must belong to the database"})
+
+        field = fields.get(cell["field"])
+        if field is None:
+            raise ValidationError({"field": "Field must belong to the database"})
+
+        if field.config is None:
+            raise ValidationError({"field": "Field is not configured"})
+
+        validate_fn = getattr(field.config, "validate_response_data", None)
+        if validate_fn is not None:
+            try:
+                validate_fn(cell["value"], context)
+            except ValidationError as e:
+                raise ValidationError({"value": e.messages})
+
+        response = FieldResponse(
+            page_id=cell["page"],
+            field=field,
+            data={"value": cell["value"]},
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        response.update_typed_values()
+        return response
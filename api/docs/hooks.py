@@ -14,3 +14,13 @@ def assign_schema_name_to_title(result, generator, **_kwargs):
             schema["title"] = name
 
     return result
+
+
+def get_lib_doc_excludes():
+    # The docstrings of the mixins of the API describe their implementation, not the endpoints.
+    from drf_spectacular.plumbing import get_lib_doc_excludes
+
+    from api.async_views import AsyncReadMixin
+    from api.etags import ConditionalGetMixin
+
+    return [AsyncReadMixin, ConditionalGetMixin, *get_lib_doc_excludes()]
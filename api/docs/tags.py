@@ -7,5 +7,6 @@ class SchemaTags(Enum):
     CORE__VIEW = "Views"
     CORE__PAGE = "Pages"
     CORE__FIELD = "Fields"
+    CORE__SEARCH = "Search"
     ORGANIZATIONS__WORKSPACE = "Workspaces"
     ORGANIZATIONS__WORKSPACEINVITATION = "Workspace Invitations"
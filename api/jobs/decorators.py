@@ -0,0 +1,99 @@
+import datetime
+import functools
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+
+class JobFunction:
+    """
+    A function that can be queued with `enqueue()`, and still be called directly.
+
+    Parameters:
+        - func (Callable): The function, at the top level of its module so workers can import it.
+        - queue (str): The queue the calls are queued on, see `JOB_QUEUE_CONCURRENCY`.
+        - max_attempts (int): The number of times a failing call is tried.
+        - retry_delay (int): The seconds to wait before the first retry, doubled after every attempt.
+        - timeout (int): The seconds after which a running call is interrupted with `JobTimeout`, see
+          `Worker.perform`.
+        - unique (bool): Skip queuing a call when the same call is already pending.
+    """
+
+    def __init__(self, func, queue, max_attempts, retry_delay, timeout, unique):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.unique = unique
+
+    @property
+    def name(self):
+        return f"{self.func.__module__}.{self.func.__qualname__}"
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, delay=0, **kwargs):
+        """
+        Queue a call. The job is written in the current transaction, so it only runs once the
+        transaction is committed, and not at all when it is rolled back.
+
+        Parameters:
+            - *args, **kwargs: The JSON serializable arguments of the call.
+            - delay (int): The seconds to wait before running the call.
+
+        Returns:
+            - Job | None: The queued job, or None when a pending `unique` job already covers the call.
+        """
+        job = Job(
+            queue=self.queue,
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs,
+            max_attempts=self.max_attempts,
+            is_unique=self.unique,
+            run_at=timezone.now() + datetime.timedelta(seconds=delay),
+        )
+
+        if not self.unique:
+            job.save()
+            return job
+
+        # The `unique_pending_job` constraint rejects the call when it is already pending, including
+        # when it was queued by a concurrent transaction.
+        try:
+            with transaction.atomic():
+                job.save()
+        except IntegrityError:
+            return None
+
+        return job
+
+    def get_retry_delay(self, attempts):
+        return self.retry_delay * 2 ** (attempts - 1)
+
+
+def job(func=None, *, queue="default", max_attempts=1, retry_delay=10, timeout=60 * 60, unique=False):
+    """
+    Turn a function into a `JobFunction`, to run its calls in `runworker` processes.
+
+        @job(queue="indexes", max_attempts=3, unique=True)
+        def sync_indexes(database_id):
+            ...
+
+        sync_indexes.enqueue(database.pk)
+
+    See `JobFunction` for the parameters.
+    """
+
+    def decorator(func):
+        return JobFunction(func, queue, max_attempts, retry_delay, timeout, unique)
+
+    if func is not None:
+        return decorator(func)
+
+    return decorator
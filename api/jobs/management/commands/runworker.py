@@ -0,0 +1,52 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.processes import run_worker
+
+
+class Command(BaseCommand):
+    help = "Run queued jobs in worker processes until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.JOB_WORKER_PROCESSES,
+            help="Number of worker processes, each running one job at a time.",
+        )
+        parser.add_argument(
+            "--queue",
+            action="append",
+            help="Only run the jobs of the given queue(s), every queue of JOB_QUEUE_CONCURRENCY and `default` by default.",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1, help="Seconds to wait when no job is ready.")
+
+    def handle(self, *args, **options):
+        queues = options["queue"] or [
+            "default",
+            *(queue for queue in settings.JOB_QUEUE_CONCURRENCY if queue != "default"),
+        ]
+
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=run_worker, args=(queues, options["poll_interval"]))
+            for _ in range(options["processes"])
+        ]
+
+        def stop(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Running {len(processes)} worker process(es) on queues {', '.join(queues)}")
+
+        for process in processes:
+            process.join()
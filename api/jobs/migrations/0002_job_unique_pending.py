@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='is_unique',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_unique', True), ('status', 'pending')), fields=('queue', 'name', 'args', 'kwargs'), name='unique_pending_job'),
+        ),
+    ]
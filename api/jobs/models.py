@@ -0,0 +1,60 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    A call of a `@job` function queued to run in a `runworker` process.
+
+    Jobs are claimed with `SELECT ... FOR UPDATE SKIP LOCKED`, so workers never wait on each other, and
+    are deleted once they succeed. Workers extend the `locked_until` of their running job, so a job
+    still running after it belongs to a worker that died, and is claimed again while it has attempts
+    left.
+
+    Only one pending job of a `unique` call can exist, see `unique_pending_job`.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    queue = models.CharField(max_length=255, default="default")
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+
+    status = models.CharField(max_length=255, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    is_unique = models.BooleanField(default=False)
+    run_at = models.DateTimeField()
+    locked_until = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["queue", "name", "args", "kwargs"],
+                name="unique_pending_job",
+                condition=models.Q(status="pending", is_unique=True),
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["queue", "run_at", "id"],
+                name="jobs_job_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+            models.Index(
+                fields=["queue", "locked_until"],
+                name="jobs_job_running_idx",
+                condition=models.Q(status="running"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
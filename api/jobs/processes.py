@@ -0,0 +1,24 @@
+"""
+Entry point of the worker processes of `runworker`.
+
+Workers are spawned rather than forked, so they never share the database connection of the parent,
+and can start processes of their own, eg. the workers of `DatabaseImporter`. This module is imported
+by them before Django is set up, so it must not import models at the top.
+"""
+
+import signal
+
+
+def run_worker(queues, poll_interval):
+    import django
+
+    django.setup()
+
+    from .worker import Worker
+
+    worker = Worker(queues, poll_interval=poll_interval)
+
+    # The running job is finished before stopping.
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: worker.stop())
+    worker.run()
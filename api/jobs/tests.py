@@ -0,0 +1,177 @@
+import datetime
+import time
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .decorators import job
+from .models import Job
+from .worker import Heartbeat, Worker
+
+calls = []
+
+
+@job(queue="tests", max_attempts=2, retry_delay=0)
+def record_call(value):
+    calls.append(value)
+
+
+@job(queue="tests", max_attempts=2, retry_delay=30)
+def fail_call():
+    raise ValueError("Failed")
+
+
+@job(queue="tests", unique=True)
+def unique_call(value):
+    calls.append(value)
+
+
+@job(queue="tests", max_attempts=2, unique=True)
+def unique_retried_call(value):
+    calls.append(value)
+
+
+@job(queue="tests", timeout=0.1)
+def slow_call():
+    time.sleep(5)
+
+
+class JobFunctionTests(TestCase):
+    def test_calls_are_queued_as_pending_jobs(self):
+        record_call.enqueue(1)
+        record_call.enqueue(1)
+
+        jobs = Job.objects.filter(name=record_call.name)
+        self.assertEqual(jobs.count(), 2)
+        self.assertEqual(jobs.first().args, [1])
+
+    def test_unique_calls_are_queued_once_while_pending(self):
+        first = unique_call.enqueue(1)
+        second = unique_call.enqueue(1)
+        other = unique_call.enqueue(2)
+
+        self.assertIsNotNone(first)
+        self.assertIsNone(second)
+        self.assertIsNotNone(other)
+        self.assertEqual(Job.objects.filter(name=unique_call.name).count(), 2)
+
+    def test_unique_calls_are_queued_again_once_running(self):
+        unique_call.enqueue(1)
+        Job.objects.update(status=Job.Status.RUNNING)
+
+        self.assertIsNotNone(unique_call.enqueue(1))
+
+    def test_pending_unique_jobs_are_enforced_by_the_database(self):
+        unique_call.enqueue(1)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Job.objects.create(queue="tests", name=unique_call.name, args=[1], is_unique=True, run_at=timezone.now())
+
+
+class WorkerTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.worker = Worker(["tests"])
+
+    def run_next(self):
+        job = self.worker.claim("tests")
+        if job is not None:
+            self.worker.perform(job)
+
+        return job
+
+    def test_succeeded_jobs_are_deleted(self):
+        record_call.enqueue(1)
+
+        self.run_next()
+
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+
+    def test_delayed_jobs_wait_for_their_run_at(self):
+        record_call.enqueue(1, delay=60)
+
+        self.assertIsNone(self.worker.claim("tests"))
+
+    def test_failed_jobs_are_retried_until_their_last_attempt(self):
+        fail_call.enqueue()
+
+        with self.assertLogs("jobs.worker", "ERROR"):
+            self.run_next()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts, job.error), (Job.Status.PENDING, 1, "Failed"))
+        self.assertGreater(job.run_at, timezone.now())
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs("jobs.worker", "ERROR"):
+            self.run_next()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 2))
+
+    def test_jobs_of_dead_workers_are_claimed_again_while_they_have_attempts(self):
+        record_call.enqueue(1)
+        job = self.worker.claim("tests")
+        self.assertIsNone(self.worker.claim("tests"))
+
+        Job.objects.update(locked_until=timezone.now() - datetime.timedelta(seconds=1))
+        reclaimed = self.worker.claim("tests")
+
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_jobs_of_dead_workers_fail_on_their_last_attempt(self):
+        unique_call.enqueue(1)
+        self.worker.claim("tests")
+        Job.objects.update(locked_until=timezone.now() - datetime.timedelta(seconds=1))
+
+        with self.assertLogs("jobs.worker", "ERROR"):
+            self.assertIsNone(self.worker.claim("tests"))
+
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 1))
+        self.assertEqual(calls, [])
+
+    def test_running_jobs_are_locked_for_a_lease(self):
+        record_call.enqueue(1)
+
+        job = Worker(["tests"], lease=120).claim("tests")
+
+        self.assertGreater(job.locked_until, timezone.now() + datetime.timedelta(seconds=60))
+
+    def test_jobs_running_past_their_timeout_are_interrupted(self):
+        slow_call.enqueue()
+
+        started_at = time.monotonic()
+        with self.assertLogs("jobs.worker", "ERROR"):
+            self.run_next()
+
+        self.assertLess(time.monotonic() - started_at, 5)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("more than", job.error)
+
+    def test_retries_of_unique_jobs_queued_again_are_dropped(self):
+        unique_retried_call.enqueue(1)
+        job = self.worker.claim("tests")
+        unique_retried_call.enqueue(1)
+
+        self.worker.fail(job, ValueError("Failed"), retry_delay=0)
+
+        self.assertEqual(Job.objects.filter(name=unique_retried_call.name).count(), 1)
+        self.assertEqual(Job.objects.get().status, Job.Status.PENDING)
+
+
+class HeartbeatTests(TransactionTestCase):
+    def test_running_jobs_are_locked_until_their_worker_stops(self):
+        record_call.enqueue(1)
+        job = Worker(["tests"], lease=0.3).claim("tests")
+        locked_until = job.locked_until
+
+        heartbeat = Heartbeat(job, lease=0.3)
+        heartbeat.start()
+        time.sleep(0.5)
+        heartbeat.stop()
+
+        job.refresh_from_db()
+        self.assertGreater(job.locked_until, locked_until)
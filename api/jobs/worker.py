@@ -0,0 +1,242 @@
+import datetime
+import logging
+import signal
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def get_queue_lock_id(queue):
+    # Advisory lock keys are signed 32-bit integers.
+    return zlib.crc32(queue.encode()) - 2**31
+
+
+class JobTimeout(Exception):
+    """
+    Raised in a job that runs longer than the `timeout` of its function.
+    """
+
+
+class Heartbeat(threading.Thread):
+    """
+    Extend the `locked_until` of a running job every third of `lease` seconds, from its own database
+    connection, so the job is only claimed again once its worker stopped extending it, ie. died.
+
+    Parameters:
+        - job (Job): The running job.
+        - lease (float): The seconds the job stays locked after every beat.
+    """
+
+    def __init__(self, job, lease):
+        super().__init__(name=f"job-heartbeat-{job.pk}", daemon=True)
+        self.job = job
+        self.lease = lease
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.lease / 3):
+                try:
+                    Job.objects.filter(pk=self.job.pk, status=Job.Status.RUNNING).update(
+                        locked_until=timezone.now() + datetime.timedelta(seconds=self.lease)
+                    )
+                except Exception:
+                    logger.exception("Failed to extend the lock of job %s", self.job.pk)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Worker:
+    """
+    Claim and run the jobs of some queues, one at a time, until stopped.
+
+    The number of jobs of a queue running at once, across every worker process, is limited by
+    `JOB_QUEUE_CONCURRENCY`. Every running job holds one of the slots of its queue as a Postgres
+    advisory lock of its worker's session, so the slots of a worker that dies are freed with its
+    connection.
+
+    Running jobs stay locked for `lease` seconds at a time, extended by a `Heartbeat` until they end.
+    A job whose worker died is claimed again once its lock expires, or marked as failed when it has no
+    attempts left, so a job killed eg. for running out of memory is not run forever.
+
+    Parameters:
+        - queues (list[str]): The queues to run the jobs of, in turn.
+        - poll_interval (float): The seconds to wait when no job is ready.
+        - lease (float): The seconds a running job stays locked without a heartbeat.
+    """
+
+    def __init__(self, queues, poll_interval=1, lease=60):
+        self.queues = list(queues)
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.stopped = False
+
+    def run(self):
+        while not self.stopped:
+            try:
+                ran = self.run_next()
+            except Exception:
+                # Eg. a lost database connection, which is replaced on the next iteration.
+                logger.exception("Worker failed to run the next job")
+                ran = False
+
+            if not ran:
+                time.sleep(self.poll_interval)
+
+    def stop(self):
+        self.stopped = True
+
+    def run_next(self):
+        """
+        Returns:
+            - bool: Whether a job was run.
+        """
+        # Connections are only closed here, while no slot is held, as closing them frees the slots.
+        close_old_connections()
+
+        # Queues are rotated so a busy queue does not starve the others.
+        self.queues.append(self.queues.pop(0))
+        for queue in self.queues:
+            slot = self.acquire_slot(queue)
+            if slot is False:
+                continue
+
+            try:
+                job = self.claim(queue)
+                if job is not None:
+                    self.perform(job)
+                    return True
+            finally:
+                self.release_slot(queue, slot)
+
+        return False
+
+    def acquire_slot(self, queue):
+        """
+        Returns:
+            - int | None | False: The slot acquired, None for queues without a limit, or False when
+              every slot of the queue is taken.
+        """
+        concurrency = settings.JOB_QUEUE_CONCURRENCY.get(queue)
+        if concurrency is None:
+            return None
+
+        with connection.cursor() as cursor:
+            for slot in range(concurrency):
+                cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", [get_queue_lock_id(queue), slot])
+                if cursor.fetchone()[0]:
+                    return slot
+
+        return False
+
+    def release_slot(self, queue, slot):
+        if slot is None:
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [get_queue_lock_id(queue), slot])
+
+    def claim(self, queue):
+        while True:
+            now = timezone.now()
+            with transaction.atomic():
+                job = (
+                    Job.objects.select_for_update(skip_locked=True)
+                    .filter(
+                        Q(status=Job.Status.PENDING, run_at__lte=now)
+                        | Q(status=Job.Status.RUNNING, locked_until__lt=now),
+                        queue=queue,
+                    )
+                    .order_by("run_at", "id")
+                    .first()
+                )
+                if job is None:
+                    return None
+
+                if job.status == Job.Status.RUNNING and job.attempts >= job.max_attempts:
+                    logger.error("Job %s %s failed, its worker stopped on the last attempt", job.pk, job.name)
+                    job.status = Job.Status.FAILED
+                    job.locked_until = None
+                    job.error = "The worker running the job stopped before it finished"
+                    job.save(update_fields=["status", "locked_until", "error", "updated_at"])
+                    continue
+
+                job.status = Job.Status.RUNNING
+                job.attempts += 1
+                job.locked_until = now + datetime.timedelta(seconds=self.lease)
+                job.save(update_fields=["status", "attempts", "locked_until", "updated_at"])
+
+            return job
+
+    def perform(self, job):
+        try:
+            func = import_string(job.name)
+        except ImportError as e:
+            logger.error("Job %s %s failed, its function does not exist", job.pk, job.name)
+            self.fail(job, e, retry_delay=None)
+            return
+
+        heartbeat = Heartbeat(job, self.lease)
+        heartbeat.start()
+        try:
+            try:
+                self.call(func, job)
+            finally:
+                heartbeat.stop()
+        except Exception as e:
+            logger.exception("Job %s %s failed, attempt %s of %s", job.pk, job.name, job.attempts, job.max_attempts)
+            self.fail(job, e, retry_delay=func.get_retry_delay(job.attempts))
+        else:
+            job.delete()
+
+    def call(self, func, job):
+        """
+        Call the function of a job, interrupting it with `JobTimeout` after the `timeout` of the function.
+
+        Timeouts rely on `SIGALRM`, so they are only enforced in the main thread, as in `runworker`
+        processes. Elsewhere the call runs until it returns.
+        """
+        timeout = getattr(func, "timeout", None)
+        if not timeout or threading.current_thread() is not threading.main_thread():
+            return func(*job.args, **job.kwargs)
+
+        def interrupt(signum, frame):
+            raise JobTimeout(f"Job ran for more than {timeout} seconds")
+
+        previous_handler = signal.signal(signal.SIGALRM, interrupt)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return func(*job.args, **job.kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+    def fail(self, job, error, retry_delay):
+        job.error = str(error)
+        job.locked_until = None
+        if retry_delay is not None and job.attempts < job.max_attempts:
+            job.status = Job.Status.PENDING
+            job.run_at = timezone.now() + datetime.timedelta(seconds=retry_delay)
+        else:
+            job.status = Job.Status.FAILED
+
+        try:
+            with transaction.atomic():
+                job.save(update_fields=["status", "run_at", "locked_until", "error", "updated_at"])
+        except IntegrityError:
+            # The same `unique` call was queued again while it ran, the pending job retries it.
+            job.delete()
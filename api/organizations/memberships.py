@@ -0,0 +1,60 @@
+from django.core.cache import cache
+
+from .models import WorkspaceMembership
+
+# Bounds how long a cached set may outlive a membership change that raced with its computation.
+WORKSPACE_IDS_CACHE_TIMEOUT = 60 * 15
+
+
+def get_workspace_ids_key(user_id):
+    return f"organizations:workspace_ids:{user_id}"
+
+
+def get_invitee_version_key(email):
+    # Invitations are listed by email as well, including those of workspaces the user is not a member of.
+    return f"organizations:invitee_version:{email}"
+
+
+def get_workspace_ids(user):
+    """
+    Get the IDs of the workspaces a user is a member of, to scope querysets with `workspace_id__in`
+    instead of joining through the memberships of every workspace.
+
+    The IDs are cached until the memberships of the user change, so requests usually resolve them
+    with a single cache lookup.
+
+    Parameters:
+        - user (User): The user.
+
+    Returns:
+        - tuple[UUID]: The workspace IDs.
+    """
+    key = get_workspace_ids_key(user.pk)
+    workspace_ids = cache.get(key)
+    if workspace_ids is None:
+        workspace_ids = tuple(
+            WorkspaceMembership.objects.filter(user=user)
+            .order_by("workspace_id")
+            .values_list("workspace_id", flat=True)
+        )
+        cache.set(key, workspace_ids, timeout=WORKSPACE_IDS_CACHE_TIMEOUT)
+
+    return workspace_ids
+
+
+async def aget_workspace_ids(user):
+    """
+    Async version of `get_workspace_ids`.
+    """
+    key = get_workspace_ids_key(user.pk)
+    workspace_ids = await cache.aget(key)
+    if workspace_ids is None:
+        memberships = WorkspaceMembership.objects.filter(user=user).order_by("workspace_id")
+        workspace_ids = tuple([pk async for pk in memberships.values_list("workspace_id", flat=True)])
+        await cache.aset(key, workspace_ids, timeout=WORKSPACE_IDS_CACHE_TIMEOUT)
+
+    return workspace_ids
+
+
+def invalidate_workspace_ids(user_ids):
+    cache.delete_many([get_workspace_ids_key(user_id) for user_id in user_ids])
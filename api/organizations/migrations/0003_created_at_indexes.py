@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_workspaceinvitation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workspace',
+            index=models.Index(fields=['created_at', 'id'], name='workspace_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspaceinvitation',
+            index=models.Index(fields=['created_at', 'id'], name='workspace_invite_created_idx'),
+        ),
+    ]
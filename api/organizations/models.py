@@ -14,6 +14,11 @@ class Workspace(BaseModel):
         through_fields=("workspace", "user"),
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="workspace_created_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -49,6 +54,11 @@ class WorkspaceInvitation(BaseModel):
     token = models.CharField(max_length=255)
     status = models.CharField(max_length=10, choices=InvitationStatus.choices, default=InvitationStatus.PENDING)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="workspace_invite_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.email} invited to {self.workspace}"
 
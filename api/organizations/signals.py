@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.etags import bump_workspace_versions
+from api.versions import bump_versions
+
+from .memberships import get_invitee_version_key, invalidate_workspace_ids
+from .models import Workspace, WorkspaceInvitation, WorkspaceMembership
+
+
+def schedule_workspace_ids_invalidation(user_ids):
+    # Invalidate once the change is visible, so a concurrent request cannot cache the previous memberships.
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_workspace_ids(user_ids))
+
+
+@receiver(post_save, sender=WorkspaceMembership)
+@receiver(post_delete, sender=WorkspaceMembership)
+def invalidate_membership_workspace_ids(sender, instance, **kwargs):
+    schedule_workspace_ids_invalidation([instance.user_id])
+
+
+@receiver(m2m_changed, sender=Workspace.members.through)
+def invalidate_members_workspace_ids(sender, instance, action, reverse, pk_set, **kwargs):
+    # `workspace.members.add()` and friends bulk create and delete memberships without sending their
+    # save and delete signals.
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if reverse:
+        schedule_workspace_ids_invalidation([instance.pk])
+    elif action == "pre_clear":
+        schedule_workspace_ids_invalidation(instance.memberships.values_list("user_id", flat=True))
+    else:
+        schedule_workspace_ids_invalidation(pk_set or ())
+
+
+def schedule_workspace_version_bump(workspace_ids):
+    workspace_ids = list(workspace_ids)
+    if workspace_ids:
+        transaction.on_commit(lambda: bump_workspace_versions(workspace_ids))
+
+
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def bump_workspace_version(sender, instance, **kwargs):
+    schedule_workspace_version_bump([instance.pk])
+
+
+@receiver(post_save, sender=WorkspaceMembership)
+@receiver(post_delete, sender=WorkspaceMembership)
+@receiver(post_save, sender=WorkspaceInvitation)
+@receiver(post_delete, sender=WorkspaceInvitation)
+def bump_workspace_object_version(sender, instance, **kwargs):
+    schedule_workspace_version_bump([instance.workspace_id])
+
+
+@receiver(post_save, sender=WorkspaceInvitation)
+@receiver(post_delete, sender=WorkspaceInvitation)
+def bump_invitee_version(sender, instance, **kwargs):
+    key = get_invitee_version_key(instance.email)
+    transaction.on_commit(lambda: bump_versions([key]))
+
+
+@receiver(m2m_changed, sender=Workspace.members.through)
+def bump_members_workspace_version(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        schedule_workspace_version_bump([instance.pk])
+    elif action == "pre_clear":
+        schedule_workspace_version_bump(instance.workspace_memberships.values_list("workspace_id", flat=True))
+    else:
+        schedule_workspace_version_bump(pk_set or ())
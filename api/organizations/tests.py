@@ -1 +1,144 @@
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from core.models import Database, Field, FieldResponse, Page
+
+from .memberships import get_workspace_ids
+from .models import WorkspaceInvitation, WorkspaceMembership
+
+
+def create_user(email):
+    return User.objects.create_user(username=email, email=email, password="password")
+
+
+class WorkspaceMembershipTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("ada@example.com")
+        self.other = create_user("grace@example.com")
+
+    def test_workspace_ids_follow_membership_changes(self):
+        self.assertEqual(get_workspace_ids(self.user), (self.user.default_workspace_id,))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.default_workspace.members.add(self.user)
+
+        self.assertEqual(
+            set(get_workspace_ids(self.user)), {self.user.default_workspace_id, self.other.default_workspace_id}
+        )
+
+    def test_cached_workspace_ids_are_read_without_queries(self):
+        get_workspace_ids(self.user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_workspace_ids(self.user), (self.user.default_workspace_id,))
+
+    def test_deleted_memberships_drop_their_workspace(self):
+        get_workspace_ids(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            membership = WorkspaceMembership.objects.create(workspace=self.other.default_workspace, user=self.user)
+        self.assertEqual(len(get_workspace_ids(self.user)), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            membership.delete()
+
+        self.assertEqual(get_workspace_ids(self.user), (self.user.default_workspace_id,))
+
+    def test_listings_are_scoped_to_the_workspaces_of_the_user_without_duplicates(self):
+        shared = Database.objects.create(workspace=self.other.default_workspace, name="Shared")
+        Database.objects.create(workspace=self.other.default_workspace, name="Private")
+        own = Database.objects.create(workspace=self.user.default_workspace, name="Own")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.default_workspace.members.add(self.user, create_user("alan@example.com"))
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        self.assertEqual(
+            sorted(database["name"] for database in client.get("/api/databases/").json()["results"]),
+            sorted([own.name, shared.name, "Private"]),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.default_workspace.members.remove(self.user)
+
+        self.assertEqual([database["name"] for database in client.get("/api/databases/").json()["results"]], ["Own"])
+
+
+class WorkspaceInvitationConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("ada@example.com")
+        self.other = create_user("grace@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_invitations_from_other_workspaces_change_the_etag(self):
+        etag = self.client.get("/api/workspace-invitations/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkspaceInvitation.objects.create(workspace=self.other.default_workspace, email=self.user.email)
+        response = self.client.get("/api/workspace-invitations/", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_unchanged_invitations_are_answered_with_304(self):
+        etag = self.client.get("/api/workspace-invitations/")["ETag"]
+
+        response = self.client.get("/api/workspace-invitations/", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class WorkspaceSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("ada@example.com")
+        self.other = create_user("grace@example.com")
+        self.workspace = self.user.default_workspace
+        self.database = Database.objects.create(workspace=self.workspace, name="Tasks")
+        self.notes = Field.objects.create(database=self.database, label="Notes", field_type=Field.FieldType.TEXT)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, q, workspace=None):
+        workspace = workspace or self.workspace
+        return self.client.get(f"/api/workspaces/{workspace.pk}/search/", {"q": q})
+
+    def test_titles_content_and_text_responses_are_searched_by_relevance(self):
+        response_page = Page.objects.create(database=self.database, title="Plan the launch")
+        FieldResponse.objects.create(page=response_page, field=self.notes, data={"value": "Invoices are overdue"})
+        content_page = Page.objects.create(database=self.database, title="Budget", content="Send the invoices")
+        title_page = Page.objects.create(database=self.database, title="Invoices")
+        Page.objects.create(database=self.database, title="Hire a designer")
+
+        results = self.search("invoice").json()["results"]
+
+        self.assertEqual(
+            [result["id"] for result in results], [str(page.pk) for page in [title_page, content_page, response_page]]
+        )
+        self.assertEqual(results[0]["title_highlight"], "<mark>Invoices</mark>")
+        self.assertEqual(results[1]["snippet"], "Send the <mark>invoices</mark>")
+
+    def test_changed_responses_are_searchable(self):
+        page = Page.objects.create(database=self.database, title="Plan the launch")
+        response = FieldResponse.objects.create(page=page, field=self.notes, data={"value": "Draft"})
+
+        response.data = {"value": "Review the contract"}
+        response.save()
+
+        self.assertEqual([result["id"] for result in self.search("contract").json()["results"]], [str(page.pk)])
+        self.assertEqual(self.search("draft").json()["results"], [])
+
+        response.delete()
+        self.assertEqual(self.search("contract").json()["results"], [])
+
+    def test_only_workspaces_of_the_user_are_searched(self):
+        other_database = Database.objects.create(workspace=self.other.default_workspace, name="Private")
+        Page.objects.create(database=other_database, title="Invoices")
+
+        self.assertEqual(self.search("invoices").json()["results"], [])
+        self.assertEqual(self.search("invoices", self.other.default_workspace).status_code, status.HTTP_404_NOT_FOUND)
@@ -1,14 +1,20 @@
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from api.etags import ConditionalGetMixin
+from core.models import Page
+from core.pagination import PageSearchPagination
+from core.search import search_pages
+from core.serializers import PageSearchQuerySerializer, PageSearchResultSerializer
 from docs.tags import SchemaTags
 from organizations.filters import WorkspaceInvitationFilter
 
+from .memberships import get_invitee_version_key, get_workspace_ids
 from .models import Workspace, WorkspaceInvitation
 from .serializers import WorkspaceInvitationSerializer, WorkspaceSerializer
 
@@ -21,8 +27,18 @@ from .serializers import WorkspaceInvitationSerializer, WorkspaceSerializer
     update=extend_schema(summary="Update Workspace"),
     partial_update=extend_schema(summary="Partial Update Workspace"),
     destroy=extend_schema(summary="Delete Workspace"),
+    search=extend_schema(
+        summary="Search Workspace Pages",
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Words or quoted phrases to search for"),
+            OpenApiParameter("limit", int, description="Number of results to return"),
+            OpenApiParameter("offset", int, description="Index of the first result to return"),
+        ],
+        responses=PageSearchResultSerializer(many=True),
+    ),
 )
 class WorkspaceViewSet(
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -35,7 +51,18 @@ class WorkspaceViewSet(
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(members=self.request.user)
+        return self.queryset.filter(pk__in=get_workspace_ids(self.request.user))
+
+    @action(detail=True, methods=["get"], url_path="search", pagination_class=PageSearchPagination)
+    def search(self, request, pk=None):
+        workspace = self.get_object()
+
+        serializer = PageSearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        pages = search_pages(Page.objects.filter(database__workspace=workspace), serializer.validated_data["q"])
+        results = self.paginate_queryset(pages)
+        return self.get_paginated_response(PageSearchResultSerializer(results, many=True).data)
 
 
 @extend_schema(tags=[SchemaTags.ORGANIZATIONS__WORKSPACEINVITATION.value])
@@ -48,6 +75,7 @@ class WorkspaceViewSet(
     destroy=extend_schema(summary="Delete Workspace Invitation"),
 )
 class WorkspaceInvitationViewSet(
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -64,8 +92,11 @@ class WorkspaceInvitationViewSet(
 
     def get_queryset(self):
         return self.queryset.filter(
-            Q(workspace__members=self.request.user) | Q(email=self.request.user.email)
-        ).distinct()
+            Q(workspace_id__in=get_workspace_ids(self.request.user)) | Q(email=self.request.user.email)
+        )
+
+    def get_etag_version_keys(self, workspace_ids):
+        return [*super().get_etag_version_keys(workspace_ids), get_invitee_version_key(self.request.user.email)]
 
     @action(detail=True, methods=["post"], url_path="accept")
     def accept(self, request, pk=None):
@@ -1,8 +1,14 @@
 import client from '../clients'
+import { fetchAllPages } from '../pagination'
 import type { IDatabase, IDatabaseRequestFilters } from '@/types/databases'
+import type { IPaginatedResponse, IPaginationParams } from '@/types/pagination'
 
-export function list(params: IDatabaseRequestFilters = {}) {
-  return client.get<IDatabase[]>('/databases/', { params })
+export function list(params: IDatabaseRequestFilters & IPaginationParams = {}) {
+  return client.get<IPaginatedResponse<IDatabase>>('/databases/', { params })
+}
+
+export function listAll(params: IDatabaseRequestFilters = {}) {
+  return fetchAllPages((cursor) => list({ ...params, cursor }))
 }
 
 export function retrieve(id: string) {
@@ -11,5 +17,6 @@ export function retrieve(id: string) {
 
 export default {
   list,
+  listAll,
   retrieve
 }
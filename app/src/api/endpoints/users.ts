@@ -1,4 +1,6 @@
 import client from '../clients'
+import { fetchAllPages } from '../pagination'
+import type { IPaginatedResponse, IPaginationParams } from '@/types/pagination'
 import type { IMyUser, IUser } from '@/types/users'
 
 export function retrieve(id: string) {
@@ -9,12 +11,17 @@ export function retrieveMe() {
   return client.get<IMyUser>('/users/me/')
 }
 
-export function list(params: { workspace?: string } = {}) {
-  return client.get<IUser[]>('/users/', { params })
+export function list(params: { workspace?: string } & IPaginationParams = {}) {
+  return client.get<IPaginatedResponse<IUser>>('/users/', { params })
+}
+
+export function listAll(params: { workspace?: string } = {}) {
+  return fetchAllPages((cursor) => list({ ...params, cursor }))
 }
 
 export default {
   retrieve,
   retrieveMe,
-  list
+  list,
+  listAll
 }
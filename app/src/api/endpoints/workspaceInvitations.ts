@@ -1,13 +1,21 @@
 import type { AxiosResponse } from 'axios'
 import client from '../clients'
+import { fetchAllPages } from '../pagination'
+import type { IPaginatedResponse, IPaginationParams } from '@/types/pagination'
 import type {
   IWorkspaceInvitation,
   IWorkspaceInvitationCreateRequest,
   IWorkspaceInvitationUpdateRequest
 } from '@/types/workspaceInvitations'
 
-export function list(params: { workspace?: string; email?: string }) {
-  return client.get<IWorkspaceInvitation[]>('/workspace-invitations/', { params })
+export function list(params: { workspace?: string; email?: string } & IPaginationParams) {
+  return client.get<IPaginatedResponse<IWorkspaceInvitation>>('/workspace-invitations/', {
+    params
+  })
+}
+
+export function listAll(params: { workspace?: string; email?: string }) {
+  return fetchAllPages((cursor) => list({ ...params, cursor }))
 }
 
 export function retrieve(id: string) {
@@ -46,6 +54,7 @@ export function destroy(id: string) {
 
 export default {
   list,
+  listAll,
   retrieve,
   create,
   update,
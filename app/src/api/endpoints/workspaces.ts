@@ -1,13 +1,19 @@
 import type { AxiosResponse } from 'axios'
 import client from '../clients'
+import { fetchAllPages } from '../pagination'
+import type { IPaginatedResponse, IPaginationParams } from '@/types/pagination'
 import type {
   IWorkspace,
   IWorkspaceCreateRequest,
   IWorkspaceUpdateRequest
 } from '@/types/workspaces'
 
-export function list() {
-  return client.get<IWorkspace[]>('/workspaces/')
+export function list(params: IPaginationParams = {}) {
+  return client.get<IPaginatedResponse<IWorkspace>>('/workspaces/', { params })
+}
+
+export function listAll() {
+  return fetchAllPages((cursor) => list({ cursor }))
 }
 
 export function retrieve(id: string) {
@@ -31,6 +37,7 @@ export function destroy(id: string) {
 
 export default {
   list,
+  listAll,
   retrieve,
   create,
   update,
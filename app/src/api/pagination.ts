@@ -0,0 +1,25 @@
+import type { AxiosResponse } from 'axios'
+import type { IPaginatedResponse } from '@/types/pagination'
+
+export function getCursor(url: string | null) {
+  if (url === null) {
+    return undefined
+  }
+
+  return new URL(url).searchParams.get('cursor') ?? undefined
+}
+
+export async function fetchAllPages<T>(
+  fetchPage: (cursor?: string) => Promise<AxiosResponse<IPaginatedResponse<T>>>
+) {
+  const items: T[] = []
+  let cursor: string | undefined
+
+  do {
+    const { data } = await fetchPage(cursor)
+    items.push(...data.results)
+    cursor = getCursor(data.next)
+  } while (cursor !== undefined)
+
+  return items
+}
@@ -44,7 +44,7 @@ export const useDatabasesStore = defineStore('databases', () => {
   }
 
   async function fetchAll(params: IDatabaseRequestFilters = {}) {
-    const { data: databases } = await api.databases.list(params)
+    const databases = await api.databases.listAll(params)
     addOrUpdateItems(databases)
   }
 
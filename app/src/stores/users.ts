@@ -69,8 +69,8 @@ export const useUsersStore = defineStore('users', () => {
   }
 
   async function fetchAll(params: { workspace?: string } = {}) {
-    const res = await api.users.list(params)
-    addOrUpdateItems(res.data)
+    const fetchedUsers = await api.users.listAll(params)
+    addOrUpdateItems(fetchedUsers)
   }
 
   function addOrUpdateItem(user: IUser | IMyUser, isMe: boolean = false) {
@@ -31,8 +31,8 @@ export const useWorkspaceInvitationsStore = defineStore('workspaceInvitations',
   }
 
   async function fetchAll(params: { workspace?: string; email?: string } = {}) {
-    const { data } = await api.workspaceInvitations.list(params)
-    addOrUpdateItems(data)
+    const workspaceInvitations = await api.workspaceInvitations.listAll(params)
+    addOrUpdateItems(workspaceInvitations)
   }
 
   async function create(inputData: IWorkspaceInvitationCreateRequest) {
@@ -131,7 +131,7 @@ export const useWorkspacesStore = defineStore('workspaces', () => {
   }
 
   async function fetchAll() {
-    const { data: workspaces } = await api.workspaces.list()
+    const workspaces = await api.workspaces.listAll()
     addOrUpdateItems(workspaces)
   }
 
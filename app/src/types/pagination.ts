@@ -0,0 +1,10 @@
+export interface IPaginatedResponse<T> {
+  next: string | null
+  previous: string | null
+  results: T[]
+}
+
+export interface IPaginationParams {
+  cursor?: string
+  page_size?: number
+}